@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark extract, transform and load per source on synthetic data against SQLite
+
+Each source and scale runs in a fresh process, so the peak RSS of a stage is
+the high-water mark of that case up to the end of the stage. Results are
+compared with a stored baseline; a stage regresses when its rows/sec drops or
+its peak memory grows by more than the threshold.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sqlalchemy as sa
+
+from generators import generate_delimited, generate_tps
+from src.extractors import (AccessExtractor, ConsignorExtractor, ContainerExtractor, EUMRVExtractor,
+                            ExtractionCache)
+from src.loaders import BatchLoader, EUMRVLoader
+from src.logging import Span, frame_bytes, measure
+from src.transformers import (ColumnMapper, ConsignorTransformer, ContainerTransformer, EUMRVTransformer,
+                              clean_string_columns)
+
+SOURCES = {
+    'container': (ContainerExtractor, ContainerTransformer, BatchLoader, 'raw_container'),
+    'consignor': (ConsignorExtractor, ConsignorTransformer, BatchLoader, 'raw_consignor'),
+    'eu_mrv': (EUMRVExtractor, EUMRVTransformer, EUMRVLoader, 'raw_eu_mrv'),
+    'tps': (AccessExtractor, None, BatchLoader, 'raw_access'),
+}
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+
+def run_delimited(source: str, factor: int, work_dir: Path, engine: sa.Engine, seed: int) -> List[Span]:
+    """Extract, transform and load one synthetic delimited file"""
+    extractor_cls, transformer_cls, loader_cls, table_name = SOURCES[source]
+    path = generate_delimited(source, factor, work_dir, seed)
+    extractor = extractor_cls(str(path))
+    extractor.cache = ExtractionCache(enabled=False)
+
+    with measure('extract', source) as extract_span:
+        df = extractor.extract(str(path))
+        extract_span.rows, extract_span.bytes = len(df), os.path.getsize(path)
+
+    with measure('transform', source) as transform_span:
+        df = transformer_cls().transform(df)
+        transform_span.rows, transform_span.bytes = len(df), frame_bytes(df)
+
+    with measure('load', source, table_name) as load_span:
+        load_span.rows, load_span.bytes = loader_cls(engine=engine).load(df, table_name), frame_bytes(df)
+    return [extract_span, transform_span, load_span]
+
+
+def run_tps(factor: int, engine: sa.Engine, seed: int) -> List[Span]:
+    """Transform and load synthetic TPS tables; extraction is measured on the sample database only"""
+    spans = []
+    if factor == 1:
+        extractor = AccessExtractor(str(Path(__file__).resolve().parent.parent / 'Data' / 'KramseTPS v7.mdb'))
+        extractor.cache = ExtractionCache(enabled=False)
+        with measure('extract', 'tps') as extract_span:
+            extract_span.rows = sum(len(df) for _, df in extractor.iter_tables())
+        spans.append(extract_span)
+
+    tables = generate_tps(factor, seed)
+    mapper = ColumnMapper('access')
+    with measure('transform', 'tps') as transform_span:
+        # The cleaning the Access extractor applies to every table
+        for table_name, df in tables.items():
+            tables[table_name] = mapper.rename(clean_string_columns(df, copy=False))
+            transform_span.rows += len(df)
+            transform_span.bytes += frame_bytes(df)
+    spans.append(transform_span)
+
+    loader = BatchLoader(engine=engine)
+    with measure('load', 'tps') as load_span:
+        for table_name, df in tables.items():
+            load_span.rows += loader.load(df, f"raw_access_{table_name}")
+            load_span.bytes += frame_bytes(df)
+    spans.append(load_span)
+    return spans
+
+
+def run_case(source: str, factor: int, seed: int) -> List[Dict[str, Any]]:
+    """Run one source at one scale in a scratch directory"""
+    with tempfile.TemporaryDirectory(prefix='etl-benchmark-') as tmp:
+        work_dir = Path(tmp)
+        engine = sa.create_engine(f"sqlite:///{work_dir / 'benchmark.db'}")
+        try:
+            if source == 'tps':
+                spans = run_tps(factor, engine, seed)
+            else:
+                spans = run_delimited(source, factor, work_dir, engine, seed)
+        finally:
+            engine.dispose()
+    return [span.to_dict() for span in spans]
+
+
+def run_benchmarks(sources: List[str], scales: List[int], seed: int) -> Dict[str, Dict[str, Any]]:
+    """Results keyed by 'source@scale/stage'"""
+    results = {}
+    for source in sources:
+        for factor in scales:
+            # A fresh process per case keeps peak RSS from leaking between cases
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                spans = pool.submit(run_case, source, factor, seed).result()
+            for span in spans:
+                key = f"{source}@{factor}x/{span['stage']}"
+                results[key] = {
+                    'rows': span['rows'],
+                    'wall_seconds': span['wall_seconds'],
+                    'rows_per_second': span['rows_per_second'],
+                    'peak_rss_mb': round((span['peak_rss_bytes'] or 0) / 2**20, 1),
+                }
+                print(f"{key:<28} {span['rows']:>10} rows {span['wall_seconds']:>9.3f}s "
+                      f"{span['rows_per_second']:>12.1f} rows/sec {results[key]['peak_rss_mb']:>8.1f} MiB")
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float, min_seconds: float = 0.05) -> List[str]:
+    """Descriptions of stages that are slower or use more memory than the baseline allows"""
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if not expected:
+            continue
+        # Throughput of stages that take a few milliseconds is mostly noise
+        timed = expected['wall_seconds'] >= min_seconds
+        if timed and result['rows_per_second'] < expected['rows_per_second'] * (1 - threshold):
+            regressions.append(f"{key}: {result['rows_per_second']:.1f} rows/sec, "
+                               f"baseline {expected['rows_per_second']:.1f}")
+        if expected['peak_rss_mb'] and result['peak_rss_mb'] > expected['peak_rss_mb'] * (1 + threshold):
+            regressions.append(f"{key}: peak {result['peak_rss_mb']:.1f} MiB, "
+                               f"baseline {expected['peak_rss_mb']:.1f} MiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sources', nargs='+', choices=list(SOURCES), default=list(SOURCES))
+    parser.add_argument('--scales', nargs='+', type=int, default=[1, 10],
+                        help='multiples of the sample sizes in Data/, e.g. 1 10 100')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed relative drop in rows/sec or growth in peak memory')
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help='only compare rows/sec of stages that took at least this long in the baseline')
+    parser.add_argument('--update-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sources, args.scales, args.seed)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8')) if baseline_path.exists() else {}
+        baseline.update(results)
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+        print(f"Baseline updated: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, json.loads(baseline_path.read_text(encoding='utf-8')),
+                          args.threshold, args.min_seconds)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regressions (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Synthetic source datasets at a multiple of the sample sizes in Data/
+"""
+import csv
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'Data'
+
+# Layout of the delimited sample files; key columns get unique values in synthetic data
+DELIMITED_SOURCES = {
+    'container': {'file': 'Container v3.txt', 'sep': '\t', 'keys': ['Id']},
+    'consignor': {'file': 'Consignor.csv', 'sep': ',', 'keys': ['Id']},
+    'eu_mrv': {'file': '2016-EU MRV Publication of information v5.csv', 'sep': ',', 'keys': ['IMO Number']},
+}
+
+TPS_FILE = 'KramseTPS v7.mdb'
+
+ENCODING = 'latin-1'
+
+
+def imo_numbers(count: int, start: int = 100000) -> np.ndarray:
+    """Distinct 7-digit IMO numbers with a valid check digit"""
+    base = np.arange(start, start + count, dtype=np.int64)
+    digits = [(base // 10 ** (5 - i)) % 10 for i in range(6)]
+    check = sum(digit * (7 - i) for i, digit in enumerate(digits)) % 10
+    return base * 10 + check
+
+
+def bootstrap(df: pd.DataFrame, rows: int, seed: int, keys: List[str] = ()) -> pd.DataFrame:
+    """Sample rows with replacement and give key columns unique values
+
+    Sampling whole rows keeps the value distributions, cardinality and skew
+    of the sample, including sentinels and malformed values.
+    """
+    rng = np.random.default_rng(seed)
+    synthetic = df.iloc[rng.integers(0, len(df), size=rows)].reset_index(drop=True)
+    for key in keys:
+        if key == 'IMO Number':
+            synthetic[key] = imo_numbers(rows).astype(str)
+        else:
+            synthetic[key] = np.arange(1, rows + 1).astype(str)
+    return synthetic
+
+
+def read_sample(source: str) -> pd.DataFrame:
+    """Read a delimited sample file with every value kept as its source text"""
+    spec = DELIMITED_SOURCES[source]
+    return pd.read_csv(DATA_DIR / spec['file'], sep=spec['sep'], encoding=ENCODING,
+                       dtype=str, keep_default_na=False)
+
+
+def generate_delimited(source: str, factor: int, out_dir: Path, seed: int = 0) -> Path:
+    """Write a synthetic file with factor times the sample rows in the sample's format"""
+    spec = DELIMITED_SOURCES[source]
+    sample = read_sample(source)
+    synthetic = bootstrap(sample, len(sample) * factor, seed, spec['keys'])
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"{factor}x-{spec['file']}"
+    synthetic.to_csv(path, sep=spec['sep'], encoding=ENCODING, index=False, quoting=csv.QUOTE_MINIMAL)
+    return path
+
+
+def generate_tps(factor: int, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """Synthetic TPS tables with factor times the rows of each table in the sample database
+
+    Writing Jet files is not supported, so the tables are returned as frames
+    read with the native reader.
+    """
+    from src.extractors.mdb import JetDatabase
+
+    tables = {}
+    with JetDatabase(str(DATA_DIR / TPS_FILE)) as db:
+        for i, table_name in enumerate(db.list_tables()):
+            df = db.read_table(table_name)
+            tables[table_name] = bootstrap(df, len(df) * factor, seed + i) if len(df) else df
+    return tables
@@ -2,12 +2,24 @@
 """
 Script to check if MS Access ODBC drivers are available
 """
-import pyodbc
+import sys
+import time
+
+try:
+    import pyodbc
+except ImportError as e:
+    pyodbc = None
+    PYODBC_ERROR = e
 
 def check_access_drivers():
     """Check for available MS Access drivers"""
     print("Checking for MS Access ODBC drivers...")
     
+    if pyodbc is None:
+        print(f"❌ pyodbc not available: {PYODBC_ERROR}")
+        print("The native .mdb reader (ACCESS_BACKEND=native) works without it.")
+        return False
+    
     # List all available drivers
     drivers = pyodbc.drivers()
     print(f"\nAll available ODBC drivers ({len(drivers)}):")
@@ -34,7 +46,7 @@ def test_access_connection():
     """Test connection to the Access database"""
     from pathlib import Path
     
-    access_file = "data/KramseTPS v7.mdb"
+    access_file = "Data/KramseTPS v7.mdb"
     
     if not Path(access_file).exists():
         print(f"\n❌ Access database file not found: {access_file}")
@@ -68,6 +80,35 @@ def test_access_connection():
         print(f"❌ Connection failed: {e}")
         return False
 
+def benchmark_access_backends(access_file: str = "Data/KramseTPS v7.mdb", repeat: int = 3):
+    """Compare extraction time of the native .mdb reader and the ODBC driver"""
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).parent))
+    from src.extractors import AccessExtractor
+    from src.extractors.access import odbc_driver_available
+    from src.extractors.cache import ExtractionCache
+    
+    if not Path(access_file).exists():
+        print(f"\n❌ Access database file not found: {access_file}")
+        return
+    
+    backends = ['native'] + (['odbc'] if odbc_driver_available() else [])
+    print(f"\nBenchmarking Access backends ({repeat} runs each)...")
+    for backend in backends:
+        extractor = AccessExtractor(access_file, backend=backend)
+        # Time the reader itself, not reads from the extraction cache
+        extractor.cache = ExtractionCache(enabled=False)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tables = extractor.extract()
+            timings.append(time.perf_counter() - start)
+        records = sum(len(df) for df in tables.values())
+        print(f"  {backend:6}: best {min(timings) * 1000:8.1f} ms - {len(tables)} tables, {records} records")
+    
+    if 'odbc' not in backends:
+        print("  odbc  : skipped (MS Access ODBC driver not installed)")
+
 if __name__ == "__main__":
     print("=== MS Access Driver Check ===")
     
@@ -76,4 +117,7 @@ if __name__ == "__main__":
     if drivers_ok:
         test_access_connection()
     
+    if "--benchmark" in sys.argv:
+        benchmark_access_backends()
+    
     print("\n=== Check Complete ===")
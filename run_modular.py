@@ -1,6 +1,7 @@
 """
 Run the modular ETL pipeline
 """
+import argparse
 import sys
 from pathlib import Path
 
@@ -8,13 +9,37 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-def run_modular_pipeline():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Run the modular Kramse ETL pipeline")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Parse all sources again without reading or writing the extraction cache")
+    parser.add_argument('--clear-cache', action='store_true',
+                        help="Remove all cached extracts before running")
+    parser.add_argument('--staging', action='store_true',
+                        help="Promote the RAW tables to Kramse_STAGING after loading (STAGING_MODE=swap|merge)")
+    parser.add_argument('--warehouse', action='store_true',
+                        help="Build the Kramse_DWH star schema from Kramse_STAGING after loading")
+    parser.add_argument('--async', dest='asynchronous', action='store_true',
+                        help="Run the sources on an asyncio event loop, loading chunks while the next are read")
+    return parser.parse_args(argv)
+
+def run_modular_pipeline(no_cache: bool = False, clear_cache: bool = False, staging: bool = False,
+                         warehouse: bool = False, asynchronous: bool = False):
     """Run the full modular ETL pipeline"""
     try:
         from src.pipeline import ETLPipeline
+        from src.extractors import extraction_cache
         
         print("=== Modular Kramse ETL Pipeline ===\n")
         
+        if clear_cache:
+            extraction_cache.clear()
+            print("🧹 Extraction cache cleared")
+        if no_cache:
+            extraction_cache.enabled = False
+            print("Extraction cache disabled for this run")
+        
         # Initialize pipeline
         pipeline = ETLPipeline()
         
@@ -27,7 +52,7 @@ def run_modular_pipeline():
         
         # Run full pipeline
         print("Starting full ETL pipeline...")
-        results = pipeline.run_full_pipeline()
+        results = pipeline.run_full_pipeline(staging=staging, warehouse=warehouse, asynchronous=asynchronous)
         
         # Display results
         print("\n=== Pipeline Results ===")
@@ -45,6 +70,9 @@ def run_modular_pipeline():
                         else:
                             error = table_result.get('error', 'Unknown error')
                             print(f"   - {table_name}: ❌ {error}")
+                elif result.get('skipped'):
+                    table = result.get('table_name', 'unknown')
+                    print(f"⏭️  {source_name}: source unchanged, {table} not reloaded")
                 else:
                     # Single table source
                     loaded = result.get('loaded_records', 0)
@@ -64,4 +92,6 @@ def run_modular_pipeline():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(run_modular_pipeline())
+    args = parse_args()
+    sys.exit(run_modular_pipeline(no_cache=args.no_cache, clear_cache=args.clear_cache, staging=args.staging,
+                                  warehouse=args.warehouse, asynchronous=args.asynchronous))
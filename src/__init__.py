@@ -4,18 +4,20 @@ Modern Python ETL voor containervervoer data
 """
 
 # Modularized Python package imports
+from .config import Settings, SourceConfig, load_config
 from .database import DatabaseManager
 from .extractors import BaseExtractor, ContainerExtractor, ConsignorExtractor, EUMRVExtractor, AccessExtractor
 from .transformers import BaseTransformer, ContainerTransformer, ConsignorTransformer, EUMRVTransformer
-from .loaders import BaseLoader, BatchLoader, EUMRVLoader
+from .loaders import BaseLoader, BatchLoader, BulkLoader, EUMRVLoader, IncrementalLoader
 from .pipeline import ETLPipeline
 
 __version__ = "1.0.0"
 __author__ = "Luc Joosten"
 __all__ = [
+    'Settings', 'SourceConfig', 'load_config',
     'DatabaseManager',
     'BaseExtractor', 'ContainerExtractor', 'ConsignorExtractor', 'EUMRVExtractor', 'AccessExtractor',
     'BaseTransformer', 'ContainerTransformer', 'ConsignorTransformer', 'EUMRVTransformer', 
-    'BaseLoader', 'BatchLoader', 'EUMRVLoader',
+    'BaseLoader', 'BatchLoader', 'BulkLoader', 'EUMRVLoader', 'IncrementalLoader',
     'ETLPipeline'
 ]
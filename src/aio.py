@@ -0,0 +1,68 @@
+"""
+Asyncio helpers that run blocking reads and database writes in executors
+"""
+import asyncio
+import os
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Chunks read ahead and waiting for the writer; one more is being read and one written
+DEFAULT_QUEUE_SIZE = int(os.getenv('ASYNC_QUEUE_SIZE', '2'))
+
+_END = object()
+
+
+class _Failed:
+    """Carries an exception of the reader to the writer"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def pipelined(items: Iterable[T], write: Callable[[T, int], int], queue_size: int = DEFAULT_QUEUE_SIZE,
+                    executor: Optional[Executor] = None) -> int:
+    """Write items while the next ones are read and return the sum of what write returned
+
+    Reading (``next`` on ``items``) and writing (``write(item, index)``) are
+    blocking calls run in the executor, so reading the next chunk overlaps
+    writing the current one and the total time approaches max(read, write)
+    instead of their sum. Items are written one at a time in order. The
+    bounded queue makes the reader wait when the writer falls behind.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+    iterator = iter(items)
+
+    async def produce():
+        try:
+            while True:
+                item = await loop.run_in_executor(executor, next, iterator, _END)
+                await queue.put(item)
+                if item is _END:
+                    return
+        except Exception as e:
+            await queue.put(_Failed(e))
+
+    producer = asyncio.ensure_future(produce())
+    total, index = 0, 0
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, _Failed):
+                raise item.error
+            total += await loop.run_in_executor(executor, write, item, index)
+            index += 1
+    finally:
+        if not producer.done():
+            producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+    return total
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, executor: Optional[Executor] = None) -> Any:
+    """Run a blocking call (e.g. a pyodbc round trip) without blocking the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
@@ -0,0 +1,160 @@
+"""
+Pipeline configuration from config/database.yaml, validated with pydantic and loaded once
+
+Environment variables override the YAML: the upper-cased name of a pipeline
+setting (BATCH_SIZE, LOAD_MODE, WRITE_MODE, ...) and the file variable of a
+source (CONTAINER_FILE, EU_MRV_FILE, ...).
+"""
+import glob
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional
+
+import yaml
+from pydantic import BaseModel, ConfigDict, Field, NonNegativeInt, PositiveFloat, PositiveInt, model_validator
+
+DEFAULT_CONFIG_PATH = "config/database.yaml"
+
+# Source kinds: each has an extractor and, for delimited files, a transformer
+SOURCE_KINDS = ('container', 'consignor', 'eu_mrv', 'access')
+
+DELIMITERS = {'csv': ',', 'tsv': '\t'}
+
+
+class PipelineConfig(BaseModel):
+    """Load settings shared by all sources"""
+    model_config = ConfigDict(extra='forbid')
+
+    batch_size: PositiveInt = 1000
+    load_mode: Literal['full', 'incremental'] = 'full'
+    load_strategy: Literal['auto', 'fast_executemany', 'bulk_copy', 'executemany'] = 'auto'
+    write_mode: Literal['replace', 'swap'] = 'replace'
+    checkpoints: bool = True
+    retry_attempts: NonNegativeInt = 3
+    timeout_seconds: PositiveFloat = 300
+
+
+class PoolConfig(BaseModel):
+    """Connection pool of the shared engine per database"""
+    model_config = ConfigDict(extra='forbid')
+
+    pool_size: PositiveInt = 5
+    max_overflow: NonNegativeInt = 10
+    pool_pre_ping: bool = True
+    pool_recycle: int = 1800
+    pool_timeout: PositiveFloat = 30
+
+
+class SourceConfig(BaseModel):
+    """One data source: which files, how they are parsed and how they are loaded"""
+    model_config = ConfigDict(extra='forbid')
+
+    path: str  # file or glob pattern; all matching files load into one table, in name order
+    kind: Optional[Literal['container', 'consignor', 'eu_mrv', 'access']] = None  # defaults to the source name
+    format: Literal['csv', 'tsv', 'access'] = 'csv'
+    parse_schema: Optional[str] = None  # name in extractors.parsing.PARSE_SCHEMAS, defaults to the kind's
+    table_name: Optional[str] = None  # Access sources load raw_access_<table> per table
+    loader: Literal['batch', 'eu_mrv', 'incremental'] = 'batch'
+    chunksize: Optional[PositiveInt] = None  # stream in chunks of this many rows
+    parallelism: PositiveInt = 1  # workers extracting the source
+    partition_mb: Optional[PositiveFloat] = None  # eu_mrv: files above this size are parsed in parallel partitions
+    business_keys: List[str] = Field(default_factory=list)
+    depends_on: List[str] = Field(default_factory=list)
+    env: Optional[str] = None  # environment variable that overrides path
+
+    @model_validator(mode='after')
+    def _check_format(self) -> 'SourceConfig':
+        if (self.format == 'access') != (self.kind == 'access'):
+            raise ValueError("format 'access' goes with kind 'access' only")
+        if self.kind != 'access' and not self.table_name:
+            raise ValueError("table_name is required for file sources")
+        if self.kind == 'access' and self.chunksize:
+            raise ValueError("Access sources load table by table and cannot be streamed in chunks")
+        return self
+
+    @property
+    def delimiter(self) -> Optional[str]:
+        return DELIMITERS.get(self.format)
+
+    def files(self) -> List[str]:
+        """Files matching the path, sorted by name"""
+        return source_files(self.path)
+
+
+class Settings(BaseModel):
+    """The validated YAML configuration; database and logging sections are read elsewhere"""
+    model_config = ConfigDict(extra='ignore')
+
+    pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
+    pool: PoolConfig = Field(default_factory=PoolConfig)
+    data_sources: Dict[str, SourceConfig] = Field(default_factory=dict)
+
+    @model_validator(mode='before')
+    @classmethod
+    def _default_kinds(cls, values: Any) -> Any:
+        """A source is of the kind it is named after unless it says otherwise"""
+        if not isinstance(values, dict):
+            return values
+        for name, source in (values.get('data_sources') or {}).items():
+            if isinstance(source, dict) and name in SOURCE_KINDS:
+                source.setdefault('kind', name)
+        return values
+
+    @model_validator(mode='after')
+    def _check_sources(self) -> 'Settings':
+        for name, source in self.data_sources.items():
+            if source.kind is None:
+                raise ValueError(f"data_sources.{name}: kind is required, one of {', '.join(SOURCE_KINDS)}")
+            if source.kind == 'access' and name != 'access':
+                raise ValueError(f"data_sources.{name}: the Access database is the source named 'access'")
+            unknown = [dependency for dependency in source.depends_on if dependency not in self.data_sources]
+            if unknown:
+                raise ValueError(f"data_sources.{name} depends on unknown sources {unknown}")
+        return self
+
+    def file_sources(self) -> Dict[str, SourceConfig]:
+        return {name: source for name, source in self.data_sources.items() if source.kind != 'access'}
+
+    def access_source(self) -> Optional[SourceConfig]:
+        return next((source for source in self.data_sources.values() if source.kind == 'access'), None)
+
+
+def _apply_environment(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Let set environment variables override the YAML values"""
+    pipeline = dict(config.get('pipeline') or {})
+    for name in PipelineConfig.model_fields:
+        value = os.getenv(name.upper())
+        if value:
+            pipeline[name] = value
+    config['pipeline'] = pipeline
+    for source in (config.get('data_sources') or {}).values():
+        if isinstance(source, dict) and source.get('env') and os.getenv(source['env']):
+            source['path'] = os.getenv(source['env'])
+    return config
+
+
+@lru_cache(maxsize=None)
+def load_config(config_path: str = DEFAULT_CONFIG_PATH) -> Settings:
+    """Read, override and validate the configuration once per path
+
+    A missing file gives the defaults; an invalid one raises pydantic's ValidationError.
+    """
+    config: Dict[str, Any] = {}
+    path = Path(config_path)
+    if path.exists():
+        with open(path, encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    return Settings.model_validate(_apply_environment(config))
+
+
+def source_files(path: str) -> List[str]:
+    """Files matching a path or glob pattern, sorted by name"""
+    if not glob.has_magic(path):
+        return [path] if os.path.isfile(path) else []
+    return sorted(match for match in glob.glob(path) if os.path.isfile(match))
+
+
+def source_size(path: str) -> int:
+    """Total bytes of the files of a source"""
+    return sum(os.path.getsize(file_path) for file_path in source_files(path))
@@ -0,0 +1,272 @@
+"""
+Declarative data quality rules evaluated as vectorized masks, with quarantine of failing rows
+"""
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
+
+from .transformers.schema import to_number
+
+logger = logging.getLogger(__name__)
+
+# A check returns one bool per row (True = pass), or None when it cannot run on the frame
+Check = Callable[[pd.DataFrame, 'DataQualityEngine'], Optional[np.ndarray]]
+
+
+@dataclass
+class Rule:
+    """A named row-level check; 'reject' rules quarantine failing rows, 'warn' rules only count them"""
+    name: str
+    check: Check
+    severity: str = 'reject'
+    description: str = ''
+    reference: Optional[Tuple[str, str]] = None  # (table, key) a referential integrity rule needs
+
+
+def imo_checksum_valid(values: pd.Series) -> np.ndarray:
+    """IMO ship numbers: 7 digits whose last digit is the weighted sum of the first six modulo 10"""
+    numbers = to_number(values).to_numpy()
+    valid = np.isfinite(numbers) & (numbers >= 1000000) & (numbers <= 9999999) & (numbers % 1 == 0)
+    digits = np.where(valid, numbers, 0).astype(np.int64)
+    weighted = sum(((digits // 10 ** (6 - i)) % 10) * (7 - i) for i in range(6))
+    return valid & (weighted % 10 == digits % 10)
+
+
+def imo_number(column: str) -> Rule:
+    """Rows whose column is a valid IMO number"""
+    def check(df, engine):
+        if column not in df.columns:
+            return None
+        return imo_checksum_valid(df[column])
+    return Rule(f"imo_checksum:{column}", check, description=f"{column} has a valid IMO check digit")
+
+
+def in_range(column: str, minimum: float = None, maximum: float = None, severity: str = 'reject') -> Rule:
+    """Rows whose numeric value lies within bounds; missing and non-numeric values pass"""
+    def check(df, engine):
+        if column not in df.columns:
+            return None
+        values = to_number(df[column]).to_numpy()
+        ok = np.ones(len(values), dtype=bool)
+        with np.errstate(invalid='ignore'):
+            if minimum is not None:
+                ok &= ~(values < minimum)
+            if maximum is not None:
+                ok &= ~(values > maximum)
+        return ok
+    bounds = f"[{'' if minimum is None else minimum}, {'' if maximum is None else maximum}]"
+    return Rule(f"range:{column}", check, severity, f"{column} within {bounds}")
+
+
+def non_negative(pattern: str, severity: str = 'reject') -> Rule:
+    """Rows where every column whose name matches the pattern is zero or more; missing values pass"""
+    regex = re.compile(pattern, re.IGNORECASE)
+
+    def check(df, engine):
+        columns = [col for col in df.columns if regex.search(str(col))]
+        if not columns:
+            return None
+        ok = np.ones(len(df), dtype=bool)
+        with np.errstate(invalid='ignore'):
+            for col in columns:
+                ok &= ~(to_number(df[col]).to_numpy() < 0)
+        return ok
+    return Rule(f"non_negative:{pattern}", check, severity, f"columns matching {pattern!r} are >= 0")
+
+
+def references(column: str, table: str, key: str, severity: str = 'reject') -> Rule:
+    """Rows whose column value exists as key in another table of the same source; missing values pass"""
+    def check(df, engine):
+        keys = engine.reference_keys(table, key)
+        if column not in df.columns or keys is None:
+            return None
+        values = df[column]
+        return (values.isna() | values.isin(keys)).to_numpy()
+    return Rule(f"references:{column}->{table}.{key}", check, severity, f"{column} exists in {table}.{key}",
+                reference=(table, key))
+
+
+# Rules per source; Access rules are per table, keyed by the Access table name
+DEFAULT_RULES: Dict[str, Any] = {
+    'eu_mrv': [
+        imo_number('IMO_Number'),
+        non_negative(r'fuel_consumption|CO_emissions'),
+    ],
+    'container': [
+        in_range('Length', 0, 16.2),
+        in_range('Cubes', 0, 100),
+        in_range('EuroPricePerKm', 0),
+    ],
+    'consignor': [
+        in_range('Discount', 0, 100),
+    ],
+    'access': {
+        'Shipment': [
+            references('VoyageId', 'Voyage', 'VV_VoyageId'),
+            references('PortIdFrom', 'Port', 'VPS_PortId'),
+            references('PortIdTo', 'Port', 'VPS_PortId'),
+        ],
+        'ShipmentDetail': [
+            references('ShipmentId', 'Shipment', 'ShipmentId'),
+            references('Item', 'Item', 'item_key'),
+        ],
+        'Voyage': [
+            references('VS_ShipId', 'Ship', 'VS_Shipid'),
+            references('VPS_PortIdStart', 'Port', 'VPS_PortId'),
+            references('V_PortIdEnd', 'Port', 'VPS_PortId'),
+        ],
+        'VoyagePort': [
+            references('VV_VoyageId', 'Voyage', 'VV_VoyageId'),
+            references('VP_PortIdCurrent', 'Port', 'VPS_PortId'),
+            references('Vp_PortIdNext', 'Port', 'VPS_PortId'),
+        ],
+    },
+}
+
+
+@dataclass
+class ValidationResult:
+    """Rows that passed all reject rules, the rejected rows and their failed rules"""
+    valid: pd.DataFrame
+    rejected: pd.DataFrame
+    failed_rules: List[str] = field(default_factory=list)
+    counts: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+class DataQualityEngine:
+    """Evaluate rule sets on frames or chunks and keep per-rule pass/fail counts for one run"""
+
+    def __init__(self, rules: Dict[str, Any] = None, enabled: bool = None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.enabled = enabled if enabled is not None else os.getenv('DATA_QUALITY', 'true').lower() == 'true'
+        self.run_id = datetime.now().strftime('%Y%m%dT%H%M%S')
+        self.counts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._references: Dict[Tuple[str, str], pd.Index] = {}
+        self._lock = threading.Lock()
+        self.logger = logger
+
+    def rules_for(self, source: str, table: str = None) -> List[Rule]:
+        """The rules of a source, or of one table of a multi-table source"""
+        rules = self.rules.get(source, [])
+        if isinstance(rules, dict):
+            return rules.get(table, [])
+        return rules
+
+    def _referenced(self, rules: List[Rule]) -> Set[Tuple[str, str]]:
+        return {rule.reference for rule in rules if rule.reference}
+
+    def register_keys(self, source: str, table: str, df: pd.DataFrame):
+        """Remember the keys of a table that reference rules of the same source point to"""
+        rules = self.rules.get(source)
+        if not isinstance(rules, dict):
+            return
+        with self._lock:
+            for ref_table, key in self._referenced([rule for table_rules in rules.values() for rule in table_rules]):
+                if ref_table == table and key in df.columns:
+                    self._references[(table, key)] = pd.Index(df[key].dropna().unique())
+
+    def reference_keys(self, table: str, key: str) -> Optional[pd.Index]:
+        with self._lock:
+            return self._references.get((table, key))
+
+    def references_ready(self, source: str, table: str) -> bool:
+        """True when every table that the rules of a table reference has registered its keys"""
+        needed = self._referenced(self.rules_for(source, table))
+        with self._lock:
+            return all(reference in self._references for reference in needed)
+
+    def validate(self, df: pd.DataFrame, source: str, table_name: str, table: str = None) -> ValidationResult:
+        """Evaluate all rules of a source in one pass and split the frame into valid and rejected rows"""
+        rules = self.rules_for(source, table)
+        if not self.enabled or not rules or df.empty:
+            return ValidationResult(df, df.iloc[0:0])
+
+        evaluated, masks = [], []
+        for rule in rules:
+            mask = rule.check(df, self)
+            if mask is None:
+                self.logger.debug(f"Rule {rule.name} skipped for {table_name}")
+                continue
+            evaluated.append(rule)
+            masks.append(np.asarray(mask, dtype=bool))
+        if not evaluated:
+            return ValidationResult(df, df.iloc[0:0])
+
+        passed = np.column_stack(masks)  # rows x rules
+        failures = (~passed).sum(axis=0)
+        counts = {rule.name: {'passed': int(len(df) - failed), 'failed': int(failed)}
+                  for rule, failed in zip(evaluated, failures)}
+        self._record(table_name, evaluated, counts)
+
+        rejecting = np.array([rule.severity == 'reject' for rule in evaluated])
+        rejected_rows = (~passed[:, rejecting]).any(axis=1) if rejecting.any() else np.zeros(len(df), dtype=bool)
+        if not rejected_rows.any():
+            return ValidationResult(df, df.iloc[0:0], counts=counts)
+
+        names = np.array([rule.name for rule in evaluated], dtype=object)
+        failed_rules = [','.join(names[~row & rejecting]) for row in passed[rejected_rows]]
+        self.logger.warning(f"{int(rejected_rows.sum())} of {len(df)} rows of {table_name} failed data quality rules")
+        return ValidationResult(df[~rejected_rows], df[rejected_rows], failed_rules, counts)
+
+    def _record(self, table_name: str, rules: List[Rule], counts: Dict[str, Dict[str, int]]):
+        """Add a chunk's counts to the run totals"""
+        with self._lock:
+            for rule in rules:
+                total = self.counts.setdefault((table_name, rule.name),
+                                               {'severity': rule.severity, 'passed': 0, 'failed': 0})
+                total['passed'] += counts[rule.name]['passed']
+                total['failed'] += counts[rule.name]['failed']
+
+    def quarantine(self, engine, table_name: str, result: ValidationResult) -> int:
+        """Write rejected rows as JSON to the etl_rejects table"""
+        if result.rejected.empty:
+            return 0
+        from .models import RejectedRow, ensure_columns
+
+        ensure_columns(engine, RejectedRow.__table__)
+        row_data = result.rejected.to_json(orient='records', lines=True, date_format='iso',
+                                           default_handler=str).splitlines()
+        rows = [{'run_id': self.run_id, 'table_name': table_name, 'failed_rules': rules[:500], 'row_data': data,
+                 'rejected_at': datetime.now()}
+                for rules, data in zip(result.failed_rules, row_data)]
+        with engine.begin() as conn:
+            conn.execute(RejectedRow.__table__.insert(), rows)
+        return len(rows)
+
+    def apply(self, df: pd.DataFrame, source: str, table_name: str, engine, table: str = None) -> pd.DataFrame:
+        """Validate a frame or chunk, quarantine its rejected rows and return the rows to load"""
+        result = self.validate(df, source, table_name, table)
+        if not result.rejected.empty:
+            self.quarantine(engine, table_name, result)
+        return result.valid
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Pass/fail counts per table and rule"""
+        summary: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self._lock:
+            for (table_name, rule_name), counts in self.counts.items():
+                summary.setdefault(table_name, {})[rule_name] = dict(counts)
+        return summary
+
+    def export(self, engine):
+        """Write this run's per-rule counts to etl_quality_results; failures are only logged"""
+        if not self.counts:
+            return
+        try:
+            from .models import QualityResult, ensure_columns
+
+            ensure_columns(engine, QualityResult.__table__)
+            rows = [{'run_id': self.run_id, 'table_name': table_name, 'rule_name': rule_name,
+                     'severity': counts['severity'], 'rows_passed': counts['passed'],
+                     'rows_failed': counts['failed']}
+                    for (table_name, rule_name), counts in self.counts.items()]
+            with engine.begin() as conn:
+                conn.execute(QualityResult.__table__.insert(), rows)
+        except Exception as e:
+            self.logger.warning(f"Could not write data quality results: {e}")
@@ -2,23 +2,78 @@
 Database connection and engine management
 """
 import os
+import threading
+import time
 import sqlalchemy as sa
 from sqlalchemy import create_engine, text
-from typing import Optional
+from sqlalchemy.pool import QueuePool
+from typing import Any, Dict, Optional, Union
 import logging
 from dotenv import load_dotenv
 
+from ..aio import run_blocking
+from ..config import DEFAULT_CONFIG_PATH, load_config
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-class DatabaseManager:
-    """Centralized database connection management"""
-    
-    def __init__(self, config_path: str = None):
-        self._engines = {}
-        self._connection_config = self._load_config()
-    
-    def _load_config(self) -> dict:
+class PoolMetrics:
+    """Cumulative connection checkout wait statistics for one database"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float):
+        """Record the time spent waiting for a pooled connection"""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the metrics as a plain dict"""
+        return {
+            'checkouts': self.checkouts,
+            'wait_seconds_total': round(self.wait_seconds_total, 6),
+            'wait_seconds_avg': round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            'wait_seconds_max': round(self.wait_seconds_max, 6)
+        }
+
+
+def _timed_queue_pool(metrics: PoolMetrics) -> type:
+    """Build a QueuePool class that reports checkout wait time to metrics"""
+
+    class TimedQueuePool(QueuePool):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                metrics.record_wait(time.perf_counter() - start)
+
+    return TimedQueuePool
+
+
+class EngineRegistry:
+    """Process-wide registry of pooled engines, one per database"""
+
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH):
+        self._lock = threading.RLock()
+        self._engines: Dict[str, sa.Engine] = {}
+        self._urls: Dict[str, Union[str, sa.URL]] = {}
+        self._metrics: Dict[str, PoolMetrics] = {}
+        self.config_path = config_path
+        self.pool_settings = self._load_pool_settings(config_path)
+        self._connection_config = self._load_connection_config()
+
+    def _load_pool_settings(self, config_path: str) -> Dict[str, Any]:
+        """Load pool settings from the pool section of the YAML config"""
+        return load_config(config_path).pool.model_dump()
+
+    def _load_connection_config(self) -> dict:
         """Load database configuration from environment"""
         return {
             'server': os.getenv('DB_SERVER', 'localhost'),
@@ -27,37 +82,94 @@ class DatabaseManager:
             'driver': os.getenv('DB_DRIVER', 'ODBC Driver 17 for SQL Server'),
             'trusted_connection': os.getenv('DB_TRUSTED_CONNECTION', 'no').lower() == 'yes'
         }
-    
+
+    def register_url(self, database: str, url: Union[str, sa.URL]):
+        """Use a custom connection URL for a database (e.g. a local SQLite stand-in)"""
+        with self._lock:
+            self._dispose(database)
+            self._urls[database] = url
+
     def get_engine(self, database: str) -> sa.Engine:
-        """Get or create database engine for specific database"""
-        if database not in self._engines:
-            self._engines[database] = self._create_engine(database)
-        return self._engines[database]
-    
+        """Get or create the shared engine for a database"""
+        with self._lock:
+            if database not in self._engines:
+                self._engines[database] = self._create_engine(database)
+            return self._engines[database]
+
+    def _build_url(self, database: str) -> str:
+        """Build the SQL Server connection URL for a database"""
+        config = self._connection_config
+
+        if config['trusted_connection']:
+            return (
+                f"mssql+pyodbc://{config['server']}/{database}"
+                f"?driver={config['driver'].replace(' ', '+')}&TrustServerCertificate=yes&Trusted_Connection=yes"
+            )
+        return (
+            f"mssql+pyodbc://{config['username']}:{config['password']}@{config['server']}/{database}"
+            f"?driver={config['driver'].replace(' ', '+')}&TrustServerCertificate=yes"
+        )
+
     def _create_engine(self, database: str) -> sa.Engine:
-        """Create SQLAlchemy engine for database"""
+        """Create a pooled SQLAlchemy engine for a database"""
         try:
-            config = self._connection_config
-            
-            if config['trusted_connection']:
-                connection_string = (
-                    f"mssql+pyodbc://{config['server']}/{database}"
-                    f"?driver={config['driver'].replace(' ', '+')}&TrustServerCertificate=yes&Trusted_Connection=yes"
-                )
+            url = sa.make_url(self._urls.get(database) or self._build_url(database))
+            metrics = self._metrics.setdefault(database, PoolMetrics())
+
+            if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+                # In-memory SQLite lives in a single connection; QueuePool does not apply
+                engine = create_engine(url)
             else:
-                connection_string = (
-                    f"mssql+pyodbc://{config['username']}:{config['password']}@{config['server']}/{database}"
-                    f"?driver={config['driver'].replace(' ', '+')}&TrustServerCertificate=yes"
+                settings = self.pool_settings
+                engine = create_engine(
+                    url,
+                    poolclass=_timed_queue_pool(metrics),
+                    pool_size=settings['pool_size'],
+                    max_overflow=settings['max_overflow'],
+                    pool_pre_ping=settings['pool_pre_ping'],
+                    pool_recycle=settings['pool_recycle'],
+                    pool_timeout=settings['pool_timeout']
                 )
-            
-            engine = create_engine(connection_string)
+
             logger.info(f"Database engine created for: {database}")
             return engine
-            
+
         except Exception as e:
             logger.error(f"Failed to create engine for {database}: {e}")
             raise
-    
+
+    def get_pool_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get checkout wait metrics per database"""
+        with self._lock:
+            return {database: metrics.to_dict() for database, metrics in self._metrics.items()}
+
+    def _dispose(self, database: str):
+        engine = self._engines.pop(database, None)
+        if engine is not None:
+            engine.dispose()
+            logger.info(f"Closed connection to: {database}")
+
+    def dispose_all(self):
+        """Dispose all engines; they are recreated on next use"""
+        with self._lock:
+            for database in list(self._engines):
+                self._dispose(database)
+
+
+# Process-wide engine registry shared by all managers, loaders and pipelines
+engine_registry = EngineRegistry()
+
+
+class DatabaseManager:
+    """Centralized database connection management backed by the shared engine registry"""
+
+    def __init__(self, config_path: str = None, registry: Optional[EngineRegistry] = None):
+        self.registry = registry or engine_registry
+
+    def get_engine(self, database: str) -> sa.Engine:
+        """Get or create database engine for specific database"""
+        return self.registry.get_engine(database)
+
     def test_connection(self, database: str) -> bool:
         """Test database connection"""
         try:
@@ -69,13 +181,18 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Connection test failed for {database}: {e}")
             return False
-    
+
+    async def test_connection_async(self, database: str) -> bool:
+        """Test database connection without blocking the event loop"""
+        return await run_blocking(self.test_connection, database)
+
+    def get_pool_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get connection checkout wait metrics per database"""
+        return self.registry.get_pool_metrics()
+
     def close_all(self):
         """Close all database connections"""
-        for db_name, engine in self._engines.items():
-            engine.dispose()
-            logger.info(f"Closed connection to: {db_name}")
-        self._engines.clear()
+        self.registry.dispose_all()
 
 # Global database manager instance
 db_manager = DatabaseManager()
@@ -0,0 +1,14 @@
+"""
+Data warehouse layer: star schema loads from Kramse_STAGING into Kramse_DWH
+"""
+from .keys import SurrogateKeyCache
+from .dimensions import Dimension, load_dimension
+from .builder import WarehouseBuilder, DIMENSIONS
+
+__all__ = [
+    'SurrogateKeyCache',
+    'Dimension',
+    'load_dimension',
+    'WarehouseBuilder',
+    'DIMENSIONS'
+]
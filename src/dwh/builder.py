@@ -0,0 +1,385 @@
+"""
+Builds the Kramse_DWH star schema from the staging tables
+"""
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+
+from ..database import db_manager
+from ..loaders import BulkLoader
+from ..logging import MetricsCollector, measure
+from ..models.dwh import (DWHBase, DimConsignor, DimContainerType, DimDate, DimPort, DimShip,
+                          FactEmission, FactShipment, UNKNOWN_KEY)
+from ..staging import swap_tables
+from ..transformers.schema import to_boolean, to_number
+from .dimensions import Dimension, ensure_unknown_member, load_dimension
+from .keys import SurrogateKeyCache
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = {
+    'dim_consignor': Dimension(DimConsignor.__table__, 'consignor_id', 'consignor_sk', ['discount_pct']),
+    'dim_container_type': Dimension(DimContainerType.__table__, 'container_type_id', 'container_type_sk',
+                                    ['euro_price_per_km']),
+    'dim_ship': Dimension(DimShip.__table__, 'ship_key', 'ship_sk'),
+    'dim_port': Dimension(DimPort.__table__, 'port_id', 'port_sk'),
+}
+
+# Columns that identify a shipment line across builds, and its keys of type 2 dimensions
+SHIPMENT_LINE_KEY = ['shipment_id', 'item_id']
+SHIPMENT_VERSION_KEYS = ['consignor_sk', 'container_type_sk']
+
+# Container ranges in ShipmentDetail, e.g. "2001-3800"
+CONTAINER_RANGE_PATTERN = r'^\s*(\d+)\s*-\s*(\d+)\s*$'
+
+
+def date_keys(dates: pd.Series) -> pd.Series:
+    """yyyymmdd keys of dim_date; missing dates get the Unknown member"""
+    dates = pd.to_datetime(dates, errors='coerce')
+    keys = dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day
+    return keys.fillna(UNKNOWN_KEY).astype('int64')
+
+
+def container_counts(container_numbers: pd.Series) -> pd.Series:
+    """Number of containers in ranges like "1-2000"; a single number is one container"""
+    bounds = container_numbers.astype('string').str.extract(CONTAINER_RANGE_PATTERN)
+    counts = pd.to_numeric(bounds[1]) - pd.to_numeric(bounds[0]) + 1
+    return counts.fillna(1).astype('int64')
+
+
+def calendar(start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """dim_date rows for every day from start to end"""
+    days = pd.date_range(start, end, freq='D')
+    return pd.DataFrame({
+        'date_key': days.year * 10000 + days.month * 100 + days.day,
+        'full_date': days.date,
+        'year': days.year,
+        'quarter': days.quarter,
+        'month': days.month,
+        'month_name': days.month_name(),
+        'day': days.day,
+        'day_of_week': days.dayofweek + 1,
+        'day_name': days.day_name(),
+        'is_weekend': days.dayofweek >= 5
+    })
+
+
+class WarehouseBuilder:
+    """Load dimensions with surrogate keys and rebuild the facts from Kramse_STAGING"""
+
+    def __init__(self, source_database: str = None, target_database: str = None,
+                 metrics: MetricsCollector = None):
+        self.source_database = source_database or os.getenv('DB_STAGING', 'Kramse_STAGING')
+        self.target_database = target_database or os.getenv('DB_PRODUCTION', 'Kramse_DWH')
+        self.metrics = metrics
+        self.keys = SurrogateKeyCache()
+        self.logger = logger
+
+    @property
+    def source_engine(self) -> sa.Engine:
+        return db_manager.get_engine(self.source_database)
+
+    @property
+    def target_engine(self) -> sa.Engine:
+        return db_manager.get_engine(self.target_database)
+
+    def build(self) -> Dict[str, Any]:
+        """Load all dimensions, then rebuild the facts; stops at the first failing table"""
+        run_time = datetime.now()
+        DWHBase.metadata.create_all(self.target_engine)
+        staging = self._read_staging()
+
+        with self.target_engine.begin() as conn:
+            for dimension in DIMENSIONS.values():
+                ensure_unknown_member(conn, dimension)
+                self.keys.preload(conn, dimension.table, dimension.business_key, dimension.surrogate_key)
+            ensure_unknown_member(conn, Dimension(DimDate.__table__, 'full_date', 'date_key'))
+
+        incoming = {
+            'dim_consignor': self._consignors(staging),
+            'dim_container_type': self._container_types(staging),
+            'dim_ship': self._ships(staging),
+            'dim_port': self._ports(staging),
+        }
+        steps = [('dim_date', lambda: self._load_dates(staging))]
+        steps += [(name, lambda name=name: self._load_dimension(name, incoming[name], run_time))
+                  for name in DIMENSIONS]
+        steps += [
+            ('fact_shipment', lambda: self._load_fact(FactShipment.__table__, self._shipments(staging, incoming))),
+            ('fact_emission', lambda: self._load_fact(FactEmission.__table__, self._emissions(staging))),
+        ]
+
+        results = {}
+        for name, step in steps:
+            try:
+                with measure('dwh', self.target_database, name) as span:
+                    span.rows = step()
+                if self.metrics is not None:
+                    self.metrics.add([span])
+                results[name] = {'status': 'success', 'loaded': span.rows}
+            except Exception as e:
+                self.logger.error(f"Failed to build {name}: {e}")
+                results[name] = {'status': 'failed', 'error': str(e)}
+                return {'status': 'failed', 'tables': results}
+
+        self.logger.info(f"Warehouse build completed: {results}")
+        return {'status': 'success', 'tables': results}
+
+    def _read_staging(self) -> Dict[str, Optional[pd.DataFrame]]:
+        """The staging tables the warehouse is built from; missing tables are None"""
+        existing = set(sa.inspect(self.source_engine).get_table_names())
+        columns = {
+            'stg_consignor': None,
+            'stg_container': None,
+            'stg_eu_mrv': ['IMO_Number', 'Name', 'Ship_type', 'Reporting_Period', 'Total_fuel_consumption_m_tonnes',
+                           'Total_CO_emissions_m_tonnes', 'Annual_Total_time_spent_at_sea_hours',
+                           'Technical_efficiency_value', 'Technical_efficiency_type'],
+            'stg_access_Ship': None,
+            'stg_access_Port': None,
+            'stg_access_Voyage': None,
+            'stg_access_Shipment': None,
+            'stg_access_ShipmentDetail': None,
+        }
+        frames = {}
+        for table_name, selected in columns.items():
+            if table_name not in existing:
+                self.logger.warning(f"Staging table {table_name} not found")
+                frames[table_name] = None
+                continue
+            table = sa.Table(table_name, sa.MetaData(), autoload_with=self.source_engine)
+            query = sa.select(*(table.c[col] for col in selected if col in table.c)) if selected else sa.select(table)
+            with self.source_engine.connect() as conn:
+                frames[table_name] = pd.read_sql(query, conn)
+        return frames
+
+    def _load_dimension(self, name: str, incoming: Optional[pd.DataFrame], run_time: datetime) -> int:
+        if incoming is None:
+            return 0
+        with self.target_engine.begin() as conn:
+            counts = load_dimension(conn, DIMENSIONS[name], incoming, self.keys, run_time)
+        return counts['inserted'] + counts['versioned'] + counts['updated']
+
+    def _load_dates(self, staging: Dict[str, Optional[pd.DataFrame]]) -> int:
+        """Add the calendar days of all years that facts refer to"""
+        years: List[int] = []
+        voyages = staging['stg_access_Voyage']
+        if voyages is not None:
+            years += pd.to_datetime(voyages['V_DateDepartVoyage'], errors='coerce').dt.year.dropna().tolist()
+        emissions = staging['stg_eu_mrv']
+        if emissions is not None:
+            years += pd.to_numeric(emissions['Reporting_Period'], errors='coerce').dropna().tolist()
+        if not years:
+            return 0
+
+        days = calendar(pd.Timestamp(int(min(years)), 1, 1), pd.Timestamp(int(max(years)), 12, 31))
+        table = DimDate.__table__
+        with self.target_engine.begin() as conn:
+            known = {key for (key,) in conn.execute(sa.select(table.c.date_key))}
+            days = days[~days['date_key'].isin(known)]
+            if not days.empty:
+                conn.execute(table.insert(), days.astype(object).to_dict('records'))
+        return len(days)
+
+    def _consignors(self, staging) -> Optional[pd.DataFrame]:
+        df = staging['stg_consignor']
+        if df is None:
+            return None
+        return pd.DataFrame({
+            'consignor_id': pd.to_numeric(df['Id'], errors='coerce').astype('Int64'),
+            'consignor_name': df['Consignor'],
+            'city': df['City'],
+            'country': df['Country'],
+            'discount_pct': to_number(df['Discount'])
+        })
+
+    def _container_types(self, staging) -> Optional[pd.DataFrame]:
+        df = staging['stg_container']
+        if df is None:
+            return None
+        return pd.DataFrame({
+            'container_type_id': pd.to_numeric(df['Id'], errors='coerce').astype('Int64'),
+            'type_name': df['Type'],
+            'refrigerated': to_boolean(df['RefrigerationFlag']),
+            'power_flag': df['PowerFlag'],
+            'length_m': to_number(df['Length']),
+            'cubes_m3': to_number(df['Cubes']),
+            'euro_price_per_km': to_number(df['EuroPricePerKm'])
+        })
+
+    def _ports(self, staging) -> Optional[pd.DataFrame]:
+        df = staging['stg_access_Port']
+        if df is None:
+            return None
+        return pd.DataFrame({
+            'port_id': pd.to_numeric(df['VPS_PortId'], errors='coerce').astype('Int64'),
+            'port_name': df['P_PortName'],
+            'country': df['P_Country'],
+            'distance_from_oslo': to_number(df['P_DistanceFromOslo']),
+            'distance_from_piraeus': to_number(df['P_DistanceFromPiraeus'])
+        })
+
+    def _ships(self, staging) -> Optional[pd.DataFrame]:
+        """EU MRV ships, enriched with TPS ships that have a unique name match, plus unmatched TPS ships"""
+        mrv, tps = staging['stg_eu_mrv'], staging['stg_access_Ship']
+        if mrv is None and tps is None:
+            return None
+
+        if mrv is not None:
+            mrv = pd.DataFrame({
+                'imo_number': pd.to_numeric(mrv['IMO_Number'], errors='coerce').astype('Int64'),
+                'ship_name': mrv['Name'],
+                'ship_type': mrv['Ship_type']
+            }).dropna(subset=['imo_number']).drop_duplicates('imo_number', keep='last')
+        else:
+            mrv = pd.DataFrame({'imo_number': pd.Series(dtype='Int64'), 'ship_name': pd.Series(dtype='string'),
+                                'ship_type': pd.Series(dtype='string')})
+
+        if tps is not None:
+            tps = pd.DataFrame({
+                'tps_ship_id': pd.to_numeric(tps['VS_Shipid'], errors='coerce').astype('Int64'),
+                'tps_name': tps['Sh_Shipname'],
+                'flag_country': tps['Sh_Country'],
+                'max_teu': pd.to_numeric(tps['Sh_MaxTEU'], errors='coerce').astype('Int64'),
+                'speed_knots': to_number(tps['Sh_SpeedInKnots']),
+                'length_m': to_number(tps['Sh_Length']),
+                'width_m': to_number(tps['Sh_Width'])
+            })
+            name_keys = mrv['ship_name'].astype('string').str.strip().str.upper()
+            unique_names = ~name_keys.duplicated(keep=False)
+            imo_by_name = pd.Series(mrv['imo_number'].to_numpy()[unique_names.to_numpy()],
+                                    index=name_keys[unique_names].to_numpy())
+            tps['imo_number'] = tps['tps_name'].astype('string').str.strip().str.upper().map(imo_by_name).astype('Int64')
+            ships = mrv.merge(tps, on='imo_number', how='outer')
+            unmatched = ships['imo_number'].isna()
+            ships.loc[unmatched, 'ship_name'] = ships.loc[unmatched, 'tps_name']
+            ships = ships.drop(columns='tps_name')
+        else:
+            ships = mrv.assign(tps_ship_id=pd.NA, flag_country=None, max_teu=pd.NA, speed_knots=np.nan,
+                               length_m=np.nan, width_m=np.nan)
+
+        ships.insert(0, 'ship_key', np.where(
+            ships['imo_number'].notna(), 'IMO' + ships['imo_number'].astype('string'),
+            'TPS' + ships['tps_ship_id'].astype('string')
+        ))
+        return ships
+
+    def _shipments(self, staging, incoming) -> Optional[pd.DataFrame]:
+        """Shipment lines with surrogate keys looked up in the key cache
+
+        Lines loaded by an earlier build keep the dimension versions they were
+        loaded with (see ``_keep_loaded_versions``); revenue is priced with the
+        price and discount of those versions.
+        """
+        details, shipments, voyages = (staging[name] for name in
+                                       ('stg_access_ShipmentDetail', 'stg_access_Shipment', 'stg_access_Voyage'))
+        if details is None or shipments is None:
+            return None
+
+        lines = details.merge(shipments, on='ShipmentId', how='left')
+        if voyages is not None:
+            lines = lines.merge(voyages, left_on='VoyageId', right_on='VV_VoyageId', how='left')
+        else:
+            lines = lines.assign(VS_ShipId=pd.NA, V_DateDepartVoyage=pd.NaT)
+
+        ships = incoming['dim_ship']
+        ship_key_by_tps_id = (ships.dropna(subset=['tps_ship_id']).set_index('tps_ship_id')['ship_key']
+                              if ships is not None else pd.Series(dtype='string'))
+        fact = pd.DataFrame({
+            'shipment_id': lines['ShipmentId'],
+            'voyage_id': lines['VoyageId'],
+            'container_nr': lines['ContainerNr'],
+            'item_id': lines['Item'],
+            'date_key': date_keys(lines['V_DateDepartVoyage']),
+            'ship_sk': self.keys.lookup('dim_ship', lines['VS_ShipId'].map(ship_key_by_tps_id)),
+            'consignor_sk': self.keys.lookup('dim_consignor', lines['ConsignorId']),
+            'container_type_sk': self.keys.lookup('dim_container_type', lines['ContainertypeId']),
+            'port_from_sk': self.keys.lookup('dim_port', lines['PortIdFrom']),
+            'port_to_sk': self.keys.lookup('dim_port', lines['PortIdTo']),
+            'container_count': container_counts(lines['ContainerNr']),
+            'distance': to_number(lines['Distance'])
+        })
+
+        fact = self._keep_loaded_versions(fact, FactShipment.__table__, SHIPMENT_LINE_KEY, SHIPMENT_VERSION_KEYS)
+
+        # Revenue at the price and discount of the fact's versions: containers x distance x price, less discount
+        price = self._version_attribute('dim_container_type', 'euro_price_per_km')
+        discount = self._version_attribute('dim_consignor', 'discount_pct')
+        fact['revenue_eur'] = (fact['container_count'] * fact['distance']
+                               * fact['container_type_sk'].map(price)
+                               * (1 - fact['consignor_sk'].map(discount).fillna(0) / 100))
+        return fact
+
+    def _keep_loaded_versions(self, fact: pd.DataFrame, table: sa.Table, line_key: List[str],
+                              version_keys: List[str]) -> pd.DataFrame:
+        """Put back the type 2 surrogate keys of facts an earlier build loaded
+
+        Facts are rebuilt on every build, but a fact refers to the version of a
+        member that was current when it was first loaded; only new facts, and
+        facts that pointed to the Unknown member, take the current version.
+        """
+        if not sa.inspect(self.target_engine).has_table(table.name):
+            return fact
+        with self.target_engine.connect() as conn:
+            loaded = pd.DataFrame(conn.execute(sa.select(*(table.c[col] for col in line_key + version_keys))).all(),
+                                  columns=line_key + version_keys)
+        if loaded.empty:
+            return fact
+
+        def numeric(df):
+            return pd.DataFrame({col: pd.to_numeric(df[col], errors='coerce').astype('Float64') for col in line_key})
+
+        loaded = pd.concat([numeric(loaded), loaded[version_keys]], axis=1).drop_duplicates(line_key, keep='last')
+        stored = numeric(fact).merge(loaded, on=line_key, how='left')
+        for col in version_keys:
+            keep = (stored[col].notna() & (stored[col] != UNKNOWN_KEY)).to_numpy()
+            fact[col] = np.where(keep, stored[col].fillna(UNKNOWN_KEY).astype('int64').to_numpy(), fact[col].to_numpy())
+        self.logger.info(f"{table.name}: {len(fact) - int(stored[version_keys[0]].isna().sum())} facts "
+                         f"keep the dimension versions they were loaded with")
+        return fact
+
+    def _version_attribute(self, name: str, column: str) -> pd.Series:
+        """Surrogate key -> attribute of every version of a dimension"""
+        table = DIMENSIONS[name].table
+        with self.target_engine.connect() as conn:
+            rows = conn.execute(sa.select(table.c[DIMENSIONS[name].surrogate_key], table.c[column])).all()
+        return pd.Series(dict(rows), dtype='float64')
+
+    def _emissions(self, staging) -> Optional[pd.DataFrame]:
+        """EU MRV emission figures per ship and reporting period"""
+        df = staging['stg_eu_mrv']
+        if df is None:
+            return None
+        imo_numbers = pd.to_numeric(df['IMO_Number'], errors='coerce').astype('Int64')
+        periods = pd.to_numeric(df['Reporting_Period'], errors='coerce').astype('Int64')
+        def column(name):
+            return to_number(df[name]) if name in df.columns else np.nan
+
+        return pd.DataFrame({
+            'ship_sk': self.keys.lookup('dim_ship', 'IMO' + imo_numbers.astype('string')),
+            'date_key': (periods * 10000 + 1231).fillna(UNKNOWN_KEY).astype('int64'),
+            'reporting_period': periods,
+            'total_fuel_consumption_t': column('Total_fuel_consumption_m_tonnes'),
+            'total_co2_emissions_t': column('Total_CO_emissions_m_tonnes'),
+            'time_at_sea_hours': column('Annual_Total_time_spent_at_sea_hours'),
+            'technical_efficiency_value': column('Technical_efficiency_value'),
+            'technical_efficiency_type': df.get('Technical_efficiency_type')
+        })
+
+    def _load_fact(self, table: sa.Table, fact: Optional[pd.DataFrame]) -> int:
+        """Rebuild a fact table next to the live one and swap it in"""
+        if fact is None:
+            return 0
+        new_table = table.to_metadata(sa.MetaData(), name=f"{table.name}__new")
+        new_table.drop(self.target_engine, checkfirst=True)
+        new_table.create(self.target_engine)
+
+        loaded = BulkLoader(engine=self.target_engine).load(fact, new_table.name, if_exists='append')
+        if loaded != len(fact):
+            raise RuntimeError(f"Loaded {loaded} of {len(fact)} rows into {new_table.name}")
+        with self.target_engine.begin() as conn:
+            swap_tables(conn, table.name, new_table.name)
+        return loaded
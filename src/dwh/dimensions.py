@@ -0,0 +1,134 @@
+"""
+Set-based dimension loading with type 1 and type 2 slowly changing attributes
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+
+from ..models.dwh import UNKNOWN_KEY
+from .keys import SurrogateKeyCache
+
+logger = logging.getLogger(__name__)
+
+# valid_from of the first version of a member, so facts of any date find it
+EARLIEST_VALID_FROM = datetime(1900, 1, 1)
+
+# Keys per UPDATE ... WHERE key IN (...) statement, below every driver's parameter limit
+EXPIRE_BATCH_SIZE = 900
+
+
+@dataclass
+class Dimension:
+    """A dimension table with its business key and type 2 tracked attributes
+
+    Changes in ``scd2_columns`` expire the current row and add a new version;
+    changes in other attributes overwrite the current row (type 1).
+    """
+    table: sa.Table
+    business_key: str
+    surrogate_key: str
+    scd2_columns: List[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+    @property
+    def versioned(self) -> bool:
+        return bool(self.scd2_columns)
+
+
+def as_objects(series: pd.Series) -> np.ndarray:
+    """Values as Python objects with None for every kind of missing value"""
+    return series.to_numpy(dtype=object, na_value=None)
+
+
+def frame_to_rows(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Plain Python rows with missing values as None, ready for executemany"""
+    columns = {col: as_objects(df[col]) for col in df.columns}
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def changed(current: pd.DataFrame, incoming: pd.DataFrame, columns: List[str]) -> pd.Series:
+    """Rows where any of the columns differs; two missing values count as equal"""
+    mask = np.zeros(len(incoming), dtype=bool)
+    for col in columns:
+        # Python objects compare None == None and 5 == 5.0
+        mask |= as_objects(incoming[col]) != as_objects(current[col])
+    return pd.Series(mask, index=incoming.index)
+
+
+def ensure_unknown_member(conn, dimension: Dimension):
+    """Add the member facts point to when their business key is not found"""
+    table = dimension.table
+    exists = conn.execute(
+        sa.select(sa.func.count()).select_from(table).where(table.c[dimension.surrogate_key] == UNKNOWN_KEY)
+    ).scalar()
+    if not exists:
+        conn.execute(table.insert().values({dimension.surrogate_key: UNKNOWN_KEY}))
+
+
+def load_dimension(conn, dimension: Dimension, incoming: pd.DataFrame, keys: SurrogateKeyCache,
+                   run_time: datetime) -> Dict[str, int]:
+    """Apply new members, type 1 updates and type 2 versions of a dimension in bulk
+
+    ``incoming`` holds one row per business key with the dimension's attribute
+    columns. The key cache must be preloaded for the dimension.
+    """
+    table, bk, sk = dimension.table, dimension.business_key, dimension.surrogate_key
+    incoming = incoming.dropna(subset=[bk]).drop_duplicates(subset=[bk], keep='last').reset_index(drop=True)
+    attributes = [col for col in incoming.columns if col != bk]
+    type1_columns = [col for col in attributes if col not in dimension.scd2_columns]
+
+    query = sa.select(*(table.c[col] for col in [sk, bk] + attributes)).where(table.c[bk].isnot(None))
+    if dimension.versioned:
+        query = query.where(table.c.is_current == sa.true())
+    current = pd.DataFrame(conn.execute(query).all(), columns=[sk, bk] + attributes)
+
+    # Align the current rows with the incoming ones on the business key
+    current = incoming[[bk]].merge(current, on=bk, how='left')
+    existing = current[sk].notna()
+    new_version = existing & changed(current, incoming, dimension.scd2_columns)
+    overwrite = existing & ~new_version & changed(current, incoming, type1_columns)
+
+    # Type 2: close the current versions in a few set-based statements
+    expired_keys = current.loc[new_version, sk].astype('int64').tolist()
+    if expired_keys:
+        expire = (table.update()
+                  .where(table.c[sk].in_(sa.bindparam('expired_keys', expanding=True)))
+                  .values(valid_to=run_time, is_current=False))
+        for start in range(0, len(expired_keys), EXPIRE_BATCH_SIZE):
+            conn.execute(expire, {'expired_keys': expired_keys[start:start + EXPIRE_BATCH_SIZE]})
+
+    # Type 1: overwrite changed attributes of current rows with one executemany
+    if overwrite.any():
+        updates = incoming.loc[overwrite, type1_columns].copy()
+        updates['b_surrogate_key'] = current.loc[overwrite, sk].astype('int64')
+        statement = (table.update()
+                     .where(table.c[sk] == sa.bindparam('b_surrogate_key'))
+                     .values({col: sa.bindparam(f"b_{col}") for col in type1_columns}))
+        conn.execute(statement, frame_to_rows(updates.rename(columns={col: f"b_{col}" for col in type1_columns})))
+
+    # New members and new versions get freshly allocated keys
+    inserts = incoming.loc[~existing | new_version].copy()
+    if not inserts.empty:
+        inserts.insert(0, sk, keys.allocate(dimension.name, inserts[bk]))
+        if dimension.versioned:
+            inserts['valid_from'] = [run_time if is_version else EARLIEST_VALID_FROM
+                                     for is_version in new_version[inserts.index]]
+            inserts['valid_to'] = None
+            inserts['is_current'] = True
+        conn.execute(table.insert(), frame_to_rows(inserts))
+
+    counts = {
+        'inserted': int((~existing).sum()),
+        'versioned': int(new_version.sum()),
+        'updated': int(overwrite.sum())
+    }
+    logger.info(f"{dimension.name}: {counts['inserted']} new, {counts['versioned']} new versions, "
+                f"{counts['updated']} updated")
+    return counts
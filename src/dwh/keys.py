@@ -0,0 +1,57 @@
+"""
+In-memory surrogate key lookups for the warehouse dimensions
+"""
+import logging
+from typing import Any, Dict, Iterable, List
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+
+from ..models.dwh import UNKNOWN_KEY
+
+logger = logging.getLogger(__name__)
+
+
+class SurrogateKeyCache:
+    """Business key -> surrogate key maps, preloaded once per warehouse build
+
+    Fact rows get their keys from hash lookups on these maps instead of joins
+    against the dimension tables. New dimension members get their keys from
+    here as well, without a round trip to the database, so only one build may
+    write to a warehouse at a time.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, Dict[Any, int]] = {}
+        self._next: Dict[str, int] = {}
+        self.logger = logger
+
+    def preload(self, conn, table: sa.Table, business_key: str, surrogate_key: str):
+        """Read the current business key -> surrogate key pairs of a dimension"""
+        name = table.name
+        query = sa.select(table.c[business_key], table.c[surrogate_key]).where(table.c[business_key].isnot(None))
+        if 'is_current' in table.c:
+            query = query.where(table.c.is_current == sa.true())
+        self._keys[name] = {key: sk for key, sk in conn.execute(query)}
+
+        # Expired versions keep their keys, so allocation continues after the overall maximum
+        max_key = conn.execute(sa.select(sa.func.max(table.c[surrogate_key]))).scalar()
+        self._next[name] = max(max_key or 0, 0) + 1
+        self.logger.info(f"Preloaded {len(self._keys[name])} surrogate keys for {name}")
+
+    def keys(self, name: str) -> Dict[Any, int]:
+        """The business key -> surrogate key map of a lookup"""
+        return self._keys[name]
+
+    def lookup(self, name: str, business_keys: pd.Series) -> pd.Series:
+        """Surrogate keys for a column of business keys; unknown keys get the Unknown member"""
+        return business_keys.map(self._keys[name]).fillna(UNKNOWN_KEY).astype('int64')
+
+    def allocate(self, name: str, business_keys: Iterable[Any]) -> np.ndarray:
+        """New surrogate keys for business keys, replacing the current key of each"""
+        business_keys: List[Any] = list(business_keys)
+        start = self._next[name]
+        surrogate_keys = np.arange(start, start + len(business_keys), dtype=np.int64)
+        self._next[name] = start + len(business_keys)
+        self._keys[name].update(zip(business_keys, surrogate_keys.tolist()))
+        return surrogate_keys
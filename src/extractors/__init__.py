@@ -2,6 +2,8 @@
 Data extractors package
 """
 from .base import BaseExtractor
+from .cache import ExtractionCache, extraction_cache
+from .parsing import ColumnSpec, ParseSchema
 from .container import ContainerExtractor
 from .consignor import ConsignorExtractor
 from .eu_mrv import EUMRVExtractor
@@ -9,6 +11,10 @@ from .access import AccessExtractor
 
 __all__ = [
     'BaseExtractor',
+    'ExtractionCache',
+    'extraction_cache',
+    'ColumnSpec',
+    'ParseSchema',
     'ContainerExtractor',
     'ConsignorExtractor', 
     'EUMRVExtractor',
@@ -3,17 +3,21 @@ Base extractor class for all data sources
 """
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List
 import pandas as pd
 from pathlib import Path
+from .cache import ExtractionCache, extraction_cache
+from .parsing import ParseSchema
+from ..config import source_files
 
 logger = logging.getLogger(__name__)
 
 class BaseExtractor(ABC):
     """Abstract base class for all data extractors"""
     
-    def __init__(self, source_config: Dict[str, Any]):
+    def __init__(self, source_config: Dict[str, Any], cache: Optional[ExtractionCache] = None):
         self.source_config = source_config
+        self.cache = cache or extraction_cache
         self.logger = logger
     
     @abstractmethod
@@ -22,10 +26,65 @@ class BaseExtractor(ABC):
         pass
     
     @abstractmethod
-    def validate_source(self) -> bool:
+    def validate_source(self, source_path: str = None) -> bool:
         """Validate that data source is accessible"""
         pass
     
+    def source_files(self, source_path: str = None) -> List[str]:
+        """Files of a source path or glob pattern; a path without matches is returned as is"""
+        file_path = source_path or self.source_config['file_path']
+        return source_files(file_path) or [file_path]
+    
+    def read_options(self) -> Dict[str, Any]:
+        """Keyword arguments for pandas.read_csv built from the source config"""
+        options = {'encoding': self.source_config.get('encoding', 'utf-8')}
+        if 'delimiter' in self.source_config:
+            options['delimiter'] = self.source_config['delimiter']
+        # Typed columns are parsed by the C parser while reading, not afterwards in Python
+        schema: ParseSchema = self.source_config.get('parse_schema')
+        if schema is not None:
+            options.update(schema.read_options())
+        return options
+    
+    def cache_namespace(self) -> str:
+        """Identifies this extractor and its parse options in the extraction cache"""
+        return f"{self.__class__.__name__}|{sorted(self.read_options().items())}"
+    
+    def chunk_layout(self, chunksize: int) -> str:
+        """Settings that decide where extract_chunks splits a source into chunks"""
+        return f"chunksize={chunksize}"
+    
+    def extract_cached(self, source_path: str = None) -> pd.DataFrame:
+        """Extract through the extraction cache, parsing only the files that changed
+        
+        A glob pattern extracts every matching file and concatenates them in name order.
+        """
+        frames = [
+            self.cache.get_or_extract(file_path, self.cache_namespace(), lambda path=file_path: self.extract(path))
+            for file_path in self.source_files(source_path)
+        ]
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    
+    def extract_chunks(self, source_path: str = None, chunksize: int = 10000) -> Iterator[pd.DataFrame]:
+        """Stream the source as DataFrames of at most chunksize rows, file by file for a glob pattern"""
+        for file_path in self.source_files(source_path):
+            yield from self._file_chunks(file_path, chunksize)
+    
+    def _file_chunks(self, file_path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+        if not self.validate_source(file_path):
+            raise FileNotFoundError(f"Source file not accessible")
+        
+        namespace = f"{self.cache_namespace()}|chunksize={chunksize}"
+        cached = self.cache.lookup_chunks(file_path, namespace)
+        if cached is not None:
+            self.logger.info(f"Streaming {file_path} from the extraction cache")
+            yield from cached
+            return
+        
+        self.logger.info(f"Streaming {file_path} in chunks of {chunksize} rows")
+        with pd.read_csv(file_path, chunksize=chunksize, **self.read_options()) as reader:
+            yield from self.cache.cache_chunks(file_path, namespace, reader)
+    
     def get_source_info(self) -> Dict[str, Any]:
         """Get metadata about the data source"""
         return {
@@ -0,0 +1,237 @@
+"""
+On-disk cache of parsed source frames, keyed by source file content
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached frame layout changes
+CACHE_VERSION = 1
+
+
+def arrow_available() -> bool:
+    """Check whether pyarrow is installed for the Arrow IPC format"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ExtractionCache:
+    """Size-bounded LRU cache of extracted DataFrames
+
+    Entries are keyed by the SHA-256 of the source file plus a namespace that
+    identifies the extractor and its read options. The file hash is memoized by
+    path, mtime and size, so unchanged sources are not re-hashed; the memo files
+    count towards ``max_bytes`` and are evicted like frames. Frames are
+    stored as Arrow IPC files and memory-mapped on read when pyarrow is
+    installed, and pickled otherwise.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None, enabled: bool = None):
+        self.cache_dir = Path(cache_dir or os.getenv('EXTRACT_CACHE_DIR', '.cache/extract'))
+        self.max_bytes = max_bytes or int(float(os.getenv('EXTRACT_CACHE_MAX_MB', '512')) * 2**20)
+        self.enabled = enabled if enabled is not None else os.getenv('EXTRACT_CACHE', 'true').lower() == 'true'
+        self.format = 'arrow' if arrow_available() else 'pickle'
+        self._lock = threading.Lock()
+        self._hashes = {}
+        self.logger = logger
+
+    def __getstate__(self):
+        # The cache travels with extractors to worker processes
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get_or_extract(self, source_path: str, namespace: str, extract: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Return the cached frame for the source, or extract and cache it"""
+        if not self.enabled or not os.path.isfile(source_path):
+            return extract()
+
+        key = self.cache_key(source_path, namespace)
+        df = self.get(key)
+        if df is not None:
+            self.logger.info(f"Extraction cache hit for {source_path} ({namespace})")
+            return df
+
+        df = extract()
+        if isinstance(df, pd.DataFrame):
+            self.put(key, df)
+        return df
+
+    def lookup_chunks(self, source_path: str, namespace: str) -> Optional[Iterator[pd.DataFrame]]:
+        """Return an iterator over a completely cached chunk stream, if any"""
+        if not self.enabled or not os.path.isfile(source_path):
+            return None
+        manifest = self.get(self.cache_key(source_path, f"{namespace}|manifest"))
+        if manifest is None:
+            return None
+        keys = [self.cache_key(source_path, f"{namespace}|chunk={i}") for i in range(int(manifest['chunks'].iloc[0]))]
+        if not all(self._entry_path(key).exists() for key in keys):
+            return None
+        return self._read_chunks(keys)
+
+    def _read_chunks(self, keys) -> Iterator[pd.DataFrame]:
+        for key in keys:
+            chunk = self.get(key)
+            if chunk is None:
+                raise RuntimeError(f"Extraction cache entry {key} disappeared while streaming")
+            yield chunk
+
+    def cache_chunks(self, source_path: str, namespace: str, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Pass chunks through while caching each one; the stream is reusable once fully consumed"""
+        if not self.enabled or not os.path.isfile(source_path):
+            yield from chunks
+            return
+        count = 0
+        for chunk in chunks:
+            self.put(self.cache_key(source_path, f"{namespace}|chunk={count}"), chunk)
+            count += 1
+            yield chunk
+        self.put(self.cache_key(source_path, f"{namespace}|manifest"), pd.DataFrame({'chunks': [count]}))
+
+    def cache_key(self, source_path: str, namespace: str) -> str:
+        """Cache key from the source content hash and the extractor namespace"""
+        content_hash = self._content_hash(source_path)
+        return hashlib.sha256(f"{CACHE_VERSION}|{self.format}|{namespace}|{content_hash}".encode()).hexdigest()
+
+    def _content_hash(self, source_path: str) -> str:
+        """SHA-256 of the file, memoized by path, mtime and size"""
+        path = Path(source_path).resolve()
+        stat = path.stat()
+        stat_key = (str(path), stat.st_mtime_ns, stat.st_size)
+
+        # Threads reading tables of the same file share one hash computation
+        with self._lock:
+            if stat_key in self._hashes:
+                return self._hashes[stat_key]
+
+            memo_file = self.cache_dir / f"stat-{hashlib.sha1(str(path).encode()).hexdigest()}.json"
+            try:
+                with open(memo_file, encoding='utf-8') as f:
+                    memo = json.load(f)
+                if memo['mtime_ns'] != stat.st_mtime_ns or memo['size'] != stat.st_size:
+                    raise ValueError("stale memo")
+                os.utime(memo_file)  # LRU order, as for frames
+            except (OSError, ValueError, KeyError):
+                digest = hashlib.sha256()
+                with open(path, 'rb') as f:
+                    for block in iter(lambda: f.read(1 << 20), b''):
+                        digest.update(block)
+                memo = {'path': str(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                        'sha256': digest.hexdigest()}
+                self._atomic_write(memo_file, lambda f: f.write(json.dumps(memo).encode()))
+
+            self._hashes[stat_key] = memo['sha256']
+            return memo['sha256']
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.{self.format}"
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Read a cached frame and mark it as recently used"""
+        path = self._entry_path(key)
+        if not path.exists():
+            return None
+        try:
+            df = self._read(path)
+            os.utime(path)  # LRU order is the file mtime
+            return df
+        except Exception as e:
+            self.logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, df: pd.DataFrame):
+        """Write a frame to the cache and evict old entries beyond the size bound"""
+        try:
+            self._atomic_write(self._entry_path(key), lambda f: self._write(df, f))
+        except Exception as e:
+            # Caching is an optimization; frames that cannot be serialized are just not cached
+            self.logger.warning(f"Could not cache extracted frame: {e}")
+            return
+        self.evict()
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        if self.format == 'arrow':
+            import pyarrow as pa
+            with pa.memory_map(str(path), 'r') as source:
+                return pa.ipc.open_file(source).read_all().to_pandas()
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def _write(self, df: pd.DataFrame, f):
+        if self.format == 'arrow':
+            import pyarrow as pa
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _atomic_write(self, path: Path, write: Callable):
+        """Write through a temp file so concurrent readers never see partial files"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _entries(self):
+        """(mtime, size, path) of cached frames and hash memos; other processes may remove files meanwhile"""
+        entries = []
+        paths = itertools.chain(self.cache_dir.glob(f"*.{self.format}"), self.cache_dir.glob("stat-*.json"))
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            while entries and total > self.max_bytes:
+                _, size, oldest = entries.pop(0)
+                total -= size
+                oldest.unlink(missing_ok=True)
+                self.logger.info(f"Evicted extraction cache entry {oldest.name}")
+
+    def size_bytes(self) -> int:
+        """Total size of cached frames and hash memos"""
+        return sum(size for _, size, _ in self._entries()) if self.cache_dir.exists() else 0
+
+    def clear(self):
+        """Remove all cached frames and file hash memos"""
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.iterdir():
+            if path.is_file():
+                path.unlink(missing_ok=True)
+        with self._lock:
+            self._hashes.clear()
+        self.logger.info(f"Cleared extraction cache: {self.cache_dir}")
+
+
+# Process-wide extraction cache shared by all extractors
+extraction_cache = ExtractionCache()
@@ -4,20 +4,22 @@ Consignor data extractor
 import os
 import pandas as pd
 from .base import BaseExtractor
+from .parsing import CONSIGNOR_SCHEMA
 
 class ConsignorExtractor(BaseExtractor):
     """Extractor for consignor data from CSV files"""
     
     def __init__(self, file_path: str = None):
         config = {
-            'file_path': file_path or os.getenv('CONSIGNOR_FILE', 'data/Consignor.csv'),
-            'encoding': 'latin-1'
+            'file_path': file_path or os.getenv('CONSIGNOR_FILE', 'Data/Consignor.csv'),
+            'encoding': 'latin-1',
+            'parse_schema': CONSIGNOR_SCHEMA
         }
         super().__init__(config)
     
-    def validate_source(self) -> bool:
+    def validate_source(self, source_path: str = None) -> bool:
         """Check if consignor file exists"""
-        file_path = self.source_config['file_path']
+        file_path = source_path or self.source_config['file_path']
         exists = os.path.exists(file_path)
         if not exists:
             self.logger.error(f"Consignor file not found: {file_path}")
@@ -29,15 +31,12 @@ class ConsignorExtractor(BaseExtractor):
             # Use provided path or default from config
             file_path = source_path or self.source_config['file_path']
             
-            if not self.validate_source():
+            if not self.validate_source(file_path):
                 raise FileNotFoundError(f"Source file not accessible")
             
             self.logger.info(f"Extracting consignor data from: {file_path}")
             
-            df = pd.read_csv(
-                file_path,
-                encoding=self.source_config['encoding']
-            )
+            df = pd.read_csv(file_path, **self.read_options())
             
             self.logger.info(f"Extracted {len(df)} consignor records")
             return df
@@ -5,21 +5,23 @@ import os
 import pandas as pd
 from typing import Dict, Any
 from .base import BaseExtractor
+from .parsing import CONTAINER_SCHEMA
 
 class ContainerExtractor(BaseExtractor):
     """Extractor for container data from text files"""
     
     def __init__(self, file_path: str = None):
         config = {
-            'file_path': file_path or os.getenv('CONTAINER_FILE', 'data/Container v3.txt'),
+            'file_path': file_path or os.getenv('CONTAINER_FILE', 'Data/Container v3.txt'),
             'delimiter': '\t',
-            'encoding': 'latin-1'
+            'encoding': 'latin-1',
+            'parse_schema': CONTAINER_SCHEMA
         }
         super().__init__(config)
     
-    def validate_source(self) -> bool:
+    def validate_source(self, source_path: str = None) -> bool:
         """Check if container file exists"""
-        file_path = self.source_config['file_path']
+        file_path = source_path or self.source_config['file_path']
         exists = os.path.exists(file_path)
         if not exists:
             self.logger.error(f"Container file not found: {file_path}")
@@ -31,16 +33,12 @@ class ContainerExtractor(BaseExtractor):
             # Use provided path or default from config
             file_path = source_path or self.source_config['file_path']
             
-            if not self.validate_source():
+            if not self.validate_source(file_path):
                 raise FileNotFoundError(f"Source file not accessible")
             
             self.logger.info(f"Extracting container data from: {file_path}")
             
-            df = pd.read_csv(
-                file_path,
-                delimiter=self.source_config['delimiter'],
-                encoding=self.source_config['encoding']
-            )
+            df = pd.read_csv(file_path, **self.read_options())
             
             self.logger.info(f"Extracted {len(df)} container records")
             return df
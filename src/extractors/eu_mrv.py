@@ -1,58 +1,118 @@
 """
 EU MRV data extractor
 """
+import itertools
 import os
+import re
+from typing import Iterator, List, Optional, Tuple
 import pandas as pd
 from .base import BaseExtractor
+from .parsing import EU_MRV_SCHEMA
+from .partitions import Partition, concat_partitions, parse_partitions, partition_file
+
+# Column with the publication year of the file a row came from
+REPORTING_YEAR_COLUMN = 'Reporting Year'
+
+# Publication files are named after their year, e.g. "2016-EU MRV Publication of information v5.csv"
+YEAR_PATTERN = re.compile(r'(?<!\d)(20\d{2})(?!\d)')
+
+
+def reporting_year(file_path: str) -> Optional[int]:
+    """Publication year in the name of an EU MRV file, None if it has none"""
+    match = YEAR_PATTERN.search(os.path.basename(file_path))
+    return int(match.group(1)) if match else None
+
 
 class EUMRVExtractor(BaseExtractor):
-    """Extractor for EU MRV shipping data from CSV files"""
-    
+    """Extractor for EU MRV shipping data from CSV files
+
+    The path may be a glob over the publications of several years. Files larger
+    than ``partition_bytes`` are split into byte ranges on record boundaries
+    that ``max_workers`` processes parse in parallel; partitions are returned
+    in file and byte order with the year of their file in ``Reporting Year``.
+    """
+
     def __init__(self, file_path: str = None):
         config = {
-            'file_path': file_path or os.getenv('EU_MRV_FILE', 'data/2016-EU MRV Publication of information v5.csv'),
-            'encoding': 'latin-1'
+            'file_path': file_path or os.getenv('EU_MRV_FILE', 'Data/2016-EU MRV Publication of information v5.csv'),
+            'encoding': 'latin-1',
+            'parse_schema': EU_MRV_SCHEMA,
+            'max_workers': int(os.getenv('EU_MRV_PARALLELISM', '1')),
+            'partition_bytes': int(float(os.getenv('EU_MRV_PARTITION_MB', '16')) * 2**20)
         }
         super().__init__(config)
-    
-    def validate_source(self) -> bool:
+
+    def validate_source(self, source_path: str = None) -> bool:
         """Check if EU MRV file exists"""
-        file_path = self.source_config['file_path']
+        file_path = source_path or self.source_config['file_path']
         exists = os.path.exists(file_path)
         if not exists:
             self.logger.error(f"EU MRV file not found: {file_path}")
         return exists
-    
+
+    def cache_namespace(self) -> str:
+        # Partition boundaries decide the chunk boundaries of a stream
+        return f"{super().cache_namespace()}|partition_bytes={self.source_config['partition_bytes']}"
+
+    def chunk_layout(self, chunksize: int) -> str:
+        # Chunks never span two partitions
+        return f"{super().chunk_layout(chunksize)}|partition_bytes={self.source_config['partition_bytes']}"
+
+    def _partitions(self, file_path: str) -> List[Partition]:
+        if not self.validate_source(file_path):
+            raise FileNotFoundError(f"Source file not accessible")
+        partitions = partition_file(file_path, self.source_config['partition_bytes'])
+        self.logger.info(f"EU MRV file {file_path} split into {len(partitions)} partitions")
+        return partitions
+
+    def _parse(self, partitions: List[Partition]) -> Iterator[Tuple[Partition, pd.DataFrame]]:
+        """Parse partitions in order, each with the reporting year of its file"""
+        for partition, df in parse_partitions(partitions, self.read_options(), self.source_config['max_workers']):
+            df[REPORTING_YEAR_COLUMN] = pd.Series(reporting_year(partition.path), index=df.index, dtype='Int16')
+            yield partition, df
+
     def extract(self, source_path: str = None) -> pd.DataFrame:
         """Extract EU MRV data from CSV file"""
         try:
             # Use provided path or default from config
             file_path = source_path or self.source_config['file_path']
-            
-            if not self.validate_source():
-                raise FileNotFoundError(f"Source file not accessible")
-            
+
             self.logger.info(f"Extracting EU MRV data from: {file_path}")
-            
-            # Sample first to check structure
-            df_sample = pd.read_csv(
-                file_path,
-                encoding=self.source_config['encoding'],
-                nrows=5
-            )
-            
-            self.logger.info(f"EU MRV file has {len(df_sample.columns)} columns")
-            self.logger.info(f"Sample columns: {list(df_sample.columns[:10])}")
-            
-            # Read full dataset
-            df = pd.read_csv(
-                file_path,
-                encoding=self.source_config['encoding']
-            )
-            
+
+            df = concat_partitions(list(self._parse(self._partitions(file_path))), self.read_options())
+
+            self.logger.info(f"EU MRV file has {len(df.columns)} columns")
+            self.logger.info(f"Sample columns: {list(df.columns[:10])}")
+
             self.logger.info(f"Extracted {len(df)} EU MRV records with {len(df.columns)} columns")
             return df
-            
+
         except Exception as e:
             self.logger.error(f"Failed to extract EU MRV data: {e}")
             raise
+
+    def extract_chunks(self, source_path: str = None, chunksize: int = 10000) -> Iterator[pd.DataFrame]:
+        """Stream the files in chunks of at most chunksize rows, parsing partitions ahead in the process pool
+
+        The partitions of all files share one pool, so small files of several
+        years are parsed in parallel too. Chunks never span two partitions.
+        """
+        files = self.source_files(source_path)
+        namespace = f"{self.cache_namespace()}|chunksize={chunksize}"
+        cached = {file_path: self.cache.lookup_chunks(file_path, namespace) for file_path in files}
+        partitions = {file_path: self._partitions(file_path) for file_path in files if cached[file_path] is None}
+        frames = self._parse([partition for file_path in files for partition in partitions.get(file_path, [])])
+
+        for file_path in files:
+            if cached[file_path] is not None:
+                self.logger.info(f"Streaming {file_path} from the extraction cache")
+                yield from cached[file_path]
+                continue
+
+            self.logger.info(f"Streaming {file_path} in chunks of {chunksize} rows")
+            chunks = (
+                df.iloc[start:start + chunksize].reset_index(drop=True)
+                for _, df in itertools.islice(frames, len(partitions[file_path]))
+                for start in range(0, len(df), chunksize)
+            )
+            yield from self.cache.cache_chunks(file_path, namespace, chunks)
@@ -0,0 +1,362 @@
+"""
+Pure-Python reader for Jet 4 (Access 2000-2003) .mdb files
+
+Reads the table catalog and data pages straight from a memory-mapped file, so
+Access tables can be extracted without an ODBC driver (e.g. on Linux workers).
+Only the structures needed for reading are parsed; indexes are ignored.
+"""
+import mmap
+import struct
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import pandas as pd
+
+PAGE_SIZE = 4096
+JET4_VERSION = 0x01
+CATALOG_PAGE = 2
+
+PAGE_DATA = 0x01
+PAGE_TDEF = 0x02
+
+# Row offset flags on data pages
+OFFSET_MASK = 0x1FFF
+LOOKUP_FLAG = 0x4000
+DELETE_FLAG = 0x8000
+
+# Table definition layout (Jet 4)
+TDEF_NEXT_PAGE = 4
+TDEF_NUM_VAR_COLS = 43
+TDEF_NUM_COLS = 45
+TDEF_NUM_REAL_IDX = 51
+TDEF_COLS_START = 63
+TDEF_REAL_IDX_ENTRY = 12
+TDEF_COL_ENTRY = 25
+
+# Column types
+COL_BOOL = 0x01
+COL_BYTE = 0x02
+COL_INT = 0x03
+COL_LONGINT = 0x04
+COL_MONEY = 0x05
+COL_FLOAT = 0x06
+COL_DOUBLE = 0x07
+COL_DATETIME = 0x08
+COL_BINARY = 0x09
+COL_TEXT = 0x0A
+COL_OLE = 0x0B
+COL_MEMO = 0x0C
+COL_GUID = 0x0F
+COL_NUMERIC = 0x10
+
+# MSysObjects object type and flags of user tables
+OBJECT_TYPE_TABLE = 1
+SYSTEM_OBJECT_FLAGS = 0x80000002
+
+ACCESS_EPOCH = datetime(1899, 12, 30)
+
+
+class MdbFormatError(ValueError):
+    """Raised when a file is not a supported Jet 4 database"""
+
+
+@dataclass
+class JetColumn:
+    """Column definition from a table definition page"""
+    name: str
+    col_type: int
+    col_num: int
+    var_col_num: int
+    fixed_offset: int
+    size: int
+    is_fixed: bool
+    precision: int
+    scale: int
+
+
+def decode_text(raw: bytes) -> str:
+    """Decode Jet 4 text, which is UCS-2 with optional single-byte compression"""
+    if raw[:2] != b'\xff\xfe':
+        return raw.decode('utf-16-le', errors='replace')
+
+    # Compressed text: single bytes, with 0x00 toggling to and from UCS-2 runs
+    parts = []
+    compressed = True
+    i, end = 2, len(raw)
+    while i < end:
+        if raw[i] == 0:
+            compressed = not compressed
+            i += 1
+        elif compressed:
+            start = i
+            while i < end and raw[i] != 0:
+                i += 1
+            parts.append(raw[start:i].decode('latin-1'))
+        else:
+            parts.append(raw[i:i + 2].decode('utf-16-le', errors='replace'))
+            i += 2
+    return ''.join(parts)
+
+
+def _decode_numeric(raw: bytes, scale: int) -> Decimal:
+    """Decode a NUMERIC value: sign byte followed by four little-endian 32-bit words, most significant first"""
+    words = struct.unpack_from('<4I', raw, 1)
+    value = (words[0] << 96) | (words[1] << 64) | (words[2] << 32) | words[3]
+    if raw[0] & 0x80:
+        value = -value
+    return Decimal(value).scaleb(-scale)
+
+
+def _decode_datetime(raw: bytes) -> datetime:
+    return ACCESS_EPOCH + timedelta(days=struct.unpack('<d', raw)[0])
+
+
+FIXED_DECODERS: Dict[int, Callable[[bytes, JetColumn], Any]] = {
+    COL_BYTE: lambda raw, col: raw[0],
+    COL_INT: lambda raw, col: struct.unpack('<h', raw)[0],
+    COL_LONGINT: lambda raw, col: struct.unpack('<i', raw)[0],
+    COL_MONEY: lambda raw, col: Decimal(struct.unpack('<q', raw)[0]).scaleb(-4),
+    COL_FLOAT: lambda raw, col: struct.unpack('<f', raw)[0],
+    COL_DOUBLE: lambda raw, col: struct.unpack('<d', raw)[0],
+    COL_DATETIME: lambda raw, col: _decode_datetime(raw),
+    COL_GUID: lambda raw, col: '{%s}' % str(__import__('uuid').UUID(bytes_le=bytes(raw))).upper(),
+    COL_NUMERIC: lambda raw, col: _decode_numeric(raw, col.scale),
+}
+
+
+class JetDatabase:
+    """Read-only access to the tables of a Jet 4 .mdb file"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        version = self._buf[0x14]
+        if version != JET4_VERSION:
+            self.close()
+            raise MdbFormatError(f"Unsupported Jet version {version:#x} in {file_path}")
+
+        self.num_pages = len(self._buf) // PAGE_SIZE
+        self._data_pages = None
+        self._catalog = None
+
+    def __enter__(self) -> 'JetDatabase':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the memory map and file handle"""
+        if self._buf is not None:
+            self._buf.close()
+            self._buf = None
+        self._file.close()
+
+    # Pages ----------------------------------------------------------------
+
+    def _page(self, page_num: int) -> memoryview:
+        start = page_num * PAGE_SIZE
+        return memoryview(self._buf)[start:start + PAGE_SIZE]
+
+    def _data_pages_by_table(self) -> Dict[int, List[int]]:
+        """Map each table definition page to its data pages by scanning page headers once"""
+        if self._data_pages is None:
+            pages = defaultdict(list)
+            buf = self._buf
+            for page_num in range(1, self.num_pages):
+                start = page_num * PAGE_SIZE
+                if buf[start] == PAGE_DATA:
+                    pages[struct.unpack_from('<I', buf, start + 4)[0]].append(page_num)
+            self._data_pages = pages
+        return self._data_pages
+
+    def _row_bounds(self, page: memoryview, row_num: int) -> Tuple[int, int, int]:
+        """Get (start, end, flags) of a row on a data page; end is exclusive"""
+        offset = struct.unpack_from('<H', page, 0x0E + row_num * 2)[0]
+        if row_num == 0:
+            end = PAGE_SIZE
+        else:
+            end = struct.unpack_from('<H', page, 0x0E + (row_num - 1) * 2)[0] & OFFSET_MASK
+        return offset & OFFSET_MASK, end, offset & ~OFFSET_MASK
+
+    def _read_row_pointer(self, pointer: int) -> memoryview:
+        """Read a row addressed by a (page << 8 | row) pointer"""
+        page = self._page(pointer >> 8)
+        start, end, _ = self._row_bounds(page, pointer & 0xFF)
+        return page[start:end]
+
+    # Table definitions ----------------------------------------------------
+
+    def read_table_definition(self, tdef_page: int) -> List[JetColumn]:
+        """Parse the columns of a table definition, following continuation pages"""
+        page = self._page(tdef_page)
+        if page[0] != PAGE_TDEF:
+            raise MdbFormatError(f"Page {tdef_page} is not a table definition")
+
+        buf = bytearray(page)
+        next_page = struct.unpack_from('<I', page, TDEF_NEXT_PAGE)[0]
+        while next_page:
+            continuation = self._page(next_page)
+            buf += continuation[8:]
+            next_page = struct.unpack_from('<I', continuation, TDEF_NEXT_PAGE)[0]
+
+        num_cols = struct.unpack_from('<H', buf, TDEF_NUM_COLS)[0]
+        num_real_idx = struct.unpack_from('<I', buf, TDEF_NUM_REAL_IDX)[0]
+
+        pos = TDEF_COLS_START + num_real_idx * TDEF_REAL_IDX_ENTRY
+        entries = []
+        for _ in range(num_cols):
+            entries.append(bytes(buf[pos:pos + TDEF_COL_ENTRY]))
+            pos += TDEF_COL_ENTRY
+
+        columns = []
+        for entry in entries:
+            name_len = struct.unpack_from('<H', buf, pos)[0]
+            name = decode_text(bytes(buf[pos + 2:pos + 2 + name_len]))
+            pos += 2 + name_len
+            columns.append(JetColumn(
+                name=name,
+                col_type=entry[0],
+                col_num=struct.unpack_from('<H', entry, 5)[0],
+                var_col_num=struct.unpack_from('<H', entry, 7)[0],
+                fixed_offset=struct.unpack_from('<H', entry, 21)[0],
+                size=struct.unpack_from('<H', entry, 23)[0],
+                is_fixed=bool(entry[15] & 0x01),
+                precision=entry[11],
+                scale=entry[12]
+            ))
+
+        return sorted(columns, key=lambda col: col.col_num)
+
+    # Rows -----------------------------------------------------------------
+
+    def _iter_rows(self, tdef_page: int):
+        """Yield the raw bytes of every live row of a table"""
+        for page_num in self._data_pages_by_table().get(tdef_page, []):
+            page = self._page(page_num)
+            num_rows = struct.unpack_from('<H', page, 0x0C)[0]
+            for row_num in range(num_rows):
+                start, end, flags = self._row_bounds(page, row_num)
+                if flags & DELETE_FLAG:
+                    continue
+                if flags & LOOKUP_FLAG:
+                    # Overflow row: the stored bytes point to the real row
+                    pointer = struct.unpack_from('<I', page, start)[0]
+                    yield self._read_row_pointer(pointer)
+                else:
+                    yield page[start:end]
+
+    def _read_long_value(self, raw: bytes) -> bytes:
+        """Read MEMO/OLE data: inline, on one LVAL page, or chained over LVAL pages"""
+        if len(raw) < 12:
+            return b''
+        header = struct.unpack_from('<I', raw, 0)[0]
+        length = header & 0x3FFFFFFF
+        if header & 0x80000000:
+            return bytes(raw[12:12 + length])
+
+        pointer = struct.unpack_from('<I', raw, 4)[0]
+        if header & 0x40000000:
+            return bytes(self._read_row_pointer(pointer)[:length])
+
+        data = bytearray()
+        while pointer and len(data) < length:
+            row = self._read_row_pointer(pointer)
+            pointer = struct.unpack_from('<I', row, 0)[0]
+            data += row[4:]
+        return bytes(data[:length])
+
+    def _decode_value(self, col: JetColumn, raw: memoryview) -> Any:
+        decoder = FIXED_DECODERS.get(col.col_type)
+        if decoder is not None:
+            return decoder(raw, col)
+        if col.col_type == COL_TEXT:
+            return decode_text(bytes(raw))
+        if col.col_type == COL_MEMO:
+            return decode_text(self._read_long_value(raw))
+        if col.col_type == COL_OLE:
+            return self._read_long_value(raw)
+        return bytes(raw)
+
+    def read_columns(self, tdef_page: int, columns: Optional[Sequence[str]] = None) -> Dict[str, List[Any]]:
+        """Decode all rows of a table into one list per column"""
+        table_columns = self.read_table_definition(tdef_page)
+        if columns is not None:
+            table_columns = [col for col in table_columns if col.name in columns]
+        data: Dict[str, List[Any]] = {col.name: [] for col in table_columns}
+
+        for row in self._iter_rows(tdef_page):
+            row_cols = struct.unpack_from('<H', row, 0)[0]
+            row_end = len(row)
+            bitmask_size = (row_cols + 7) // 8
+            null_mask = row[row_end - bitmask_size:]
+
+            row_var_cols = struct.unpack_from('<H', row, row_end - bitmask_size - 2)[0]
+            var_offsets = [
+                struct.unpack_from('<H', row, row_end - bitmask_size - 4 - i * 2)[0]
+                for i in range(row_var_cols + 1)
+            ]
+            row_fixed_cols = row_cols - row_var_cols
+
+            fixed_found = 0
+            for col in table_columns:
+                byte_num, bit_num = divmod(col.col_num, 8)
+                # Null mask bits are set for non-null values
+                present = byte_num < bitmask_size and bool(null_mask[byte_num] & (1 << bit_num))
+
+                if col.is_fixed:
+                    in_row = fixed_found < row_fixed_cols
+                    fixed_found += 1
+                    if col.col_type == COL_BOOL:
+                        # Booleans have no data bytes; the null mask bit is the value
+                        data[col.name].append(present)
+                        continue
+                    if not (present and in_row):
+                        data[col.name].append(None)
+                        continue
+                    start = col.fixed_offset + 2
+                    raw = row[start:start + col.size]
+                else:
+                    if not present or col.var_col_num >= row_var_cols:
+                        data[col.name].append(None)
+                        continue
+                    raw = row[var_offsets[col.var_col_num]:var_offsets[col.var_col_num + 1]]
+
+                data[col.name].append(self._decode_value(col, raw))
+
+        return data
+
+    # Catalog --------------------------------------------------------------
+
+    def _catalog_entries(self) -> Dict[str, int]:
+        """Map user table names to their table definition pages"""
+        if self._catalog is None:
+            objects = self.read_columns(CATALOG_PAGE, columns=('Id', 'Name', 'Type', 'Flags'))
+            catalog = {}
+            for obj_id, name, obj_type, flags in zip(objects['Id'], objects['Name'], objects['Type'], objects['Flags']):
+                if obj_type != OBJECT_TYPE_TABLE or name is None or name.startswith('MSys'):
+                    continue
+                if flags and flags & SYSTEM_OBJECT_FLAGS:
+                    continue
+                catalog[name] = obj_id & 0x00FFFFFF
+            self._catalog = catalog
+        return self._catalog
+
+    def list_tables(self) -> List[str]:
+        """Names of the user tables"""
+        return list(self._catalog_entries())
+
+    def read_table(self, table_name: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Read a user table into a DataFrame"""
+        catalog = self._catalog_entries()
+        if table_name not in catalog:
+            raise KeyError(f"Table not found: {table_name}")
+        return pd.DataFrame(self.read_columns(catalog[table_name], columns))
@@ -0,0 +1,99 @@
+"""
+Per-column parse schemas applied by the pandas C parser at read time
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+
+@dataclass
+class ColumnSpec:
+    """How one source column is parsed
+
+    ``dtype`` is any pandas dtype name; 'boolean' columns use ``true_values`` and
+    ``false_values``, 'category' columns may fix their ``categories``.
+    """
+    dtype: Optional[str] = None
+    decimal: Optional[str] = None
+    thousands: Optional[str] = None
+    true_values: List[str] = field(default_factory=list)
+    false_values: List[str] = field(default_factory=list)
+    categories: Optional[List[str]] = None
+    na_values: List[str] = field(default_factory=list)
+
+    def pandas_dtype(self) -> Any:
+        if self.categories is not None:
+            return pd.CategoricalDtype(self.categories)
+        return self.dtype
+
+
+@dataclass
+class ParseSchema:
+    """Column specs of one delimited source, turned into pandas.read_csv options
+
+    The C parser takes one decimal and one thousands separator per file and
+    applies true/false values to every boolean column, so specs of one schema
+    must agree on separators.
+    """
+    columns: Dict[str, ColumnSpec] = field(default_factory=dict)
+
+    def _separator(self, name: str) -> Optional[str]:
+        separators = {getattr(spec, name) for spec in self.columns.values() if getattr(spec, name)}
+        if len(separators) > 1:
+            raise ValueError(f"Conflicting {name} separators in parse schema: {sorted(separators)}")
+        return separators.pop() if separators else None
+
+    def read_options(self) -> Dict[str, Any]:
+        """Keyword arguments for pandas.read_csv"""
+        options: Dict[str, Any] = {}
+        for name in ('decimal', 'thousands'):
+            separator = self._separator(name)
+            if separator:
+                options[name] = separator
+
+        dtypes = {col: spec.pandas_dtype() for col, spec in self.columns.items() if spec.pandas_dtype()}
+        if dtypes:
+            options['dtype'] = dtypes
+
+        true_values = sorted({value for spec in self.columns.values() for value in spec.true_values})
+        false_values = sorted({value for spec in self.columns.values() for value in spec.false_values})
+        if true_values:
+            options['true_values'] = true_values
+        if false_values:
+            options['false_values'] = false_values
+
+        na_values = {col: spec.na_values for col, spec in self.columns.items() if spec.na_values}
+        if na_values:
+            options['na_values'] = na_values
+        return options
+
+
+# Dutch export: decimal commas, a Yes/No flag and country codes for the power plug
+CONTAINER_SCHEMA = ParseSchema({
+    'Id': ColumnSpec('Int64'),
+    'RefrigerationFlag': ColumnSpec('boolean', true_values=['Yes'], false_values=['No']),
+    'PowerFlag': ColumnSpec('category'),
+    'Length': ColumnSpec('float64', decimal=','),
+    'Cubes': ColumnSpec('float64', decimal=','),
+    'EuroPricePerKm': ColumnSpec('float64', decimal=','),
+})
+
+# Discount uses '-' for "no discount agreed"
+CONSIGNOR_SCHEMA = ParseSchema({
+    'Id': ColumnSpec('Int64'),
+    'Discount': ColumnSpec('float64', na_values=['-']),
+})
+
+# Monitoring methods A-D are 'Yes' or empty; numeric columns are typed by EUMRVTransformer
+EU_MRV_SCHEMA = ParseSchema({
+    **{method: ColumnSpec('boolean', true_values=['Yes']) for method in ('A', 'B', 'C', 'D')},
+    'Ship type': ColumnSpec('category'),
+    'Ice Class': ColumnSpec('category'),
+})
+
+# Schemas by name, for the parse_schema of a source in config/database.yaml
+PARSE_SCHEMAS = {
+    'container': CONTAINER_SCHEMA,
+    'consignor': CONSIGNOR_SCHEMA,
+    'eu_mrv': EU_MRV_SCHEMA,
+}
@@ -0,0 +1,152 @@
+"""
+Byte-range partitions of delimited files, aligned to record boundaries and parsed in a process pool
+"""
+import functools
+import io
+import itertools
+import mmap
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+QUOTE = ord('"')
+NEWLINE = b'\n'
+
+# Files up to this size are parsed as a single partition
+DEFAULT_PARTITION_BYTES = 16 * 2**20
+
+# Partitions are parsed while chunks load in other threads, so workers must not be forked
+PROCESS_CONTEXT = multiprocessing.get_context('spawn')
+
+
+@dataclass(frozen=True)
+class Partition:
+    """Bytes [start, end) of a file holding whole records, parsed with the file's header line"""
+    path: str
+    index: int
+    start: int
+    end: int
+    header: bytes
+
+
+def _record_start(mm: mmap.mmap, data: np.ndarray, offset: int, quoted: bool) -> int:
+    """First record start at or after offset, given whether offset lies inside a quoted field
+
+    A newline ends a record only outside quotes; quoted fields may span lines.
+    Escaped quotes ("") flip the state twice, so counting quotes is enough.
+    """
+    while True:
+        newline = mm.find(NEWLINE, offset)
+        if newline == -1:
+            return len(data)
+        quoted ^= bool(np.count_nonzero(data[offset:newline] == QUOTE) & 1)
+        if not quoted:
+            return newline + 1
+        offset = newline + 1
+
+
+def partition_file(path: str, partition_bytes: int = DEFAULT_PARTITION_BYTES) -> List[Partition]:
+    """Split a delimited file with a header line into partitions of about partition_bytes"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = np.frombuffer(mm, dtype=np.uint8)
+        try:
+            header_end = _record_start(mm, data, 0, False)
+            header = mm[:header_end]
+            starts = [header_end]
+            while starts[-1] + partition_bytes < size:
+                target = starts[-1] + partition_bytes
+                # Record starts are outside quotes, so the quotes since the last one give the state at target
+                quoted = bool(np.count_nonzero(data[starts[-1]:target] == QUOTE) & 1)
+                start = _record_start(mm, data, target, quoted)
+                if start >= size:
+                    break
+                starts.append(start)
+        finally:
+            # The mmap cannot close while the array still exports its buffer
+            del data
+    # Only a file without records gives an empty partition, which parses to its columns
+    ends = starts[1:] + [size]
+    return [Partition(path, index, start, end, header) for index, (start, end) in enumerate(zip(starts, ends))]
+
+
+def read_partition(partition: Partition, options: Dict[str, Any]) -> pd.DataFrame:
+    """Parse one partition with pandas.read_csv options; runs in a worker process"""
+    with open(partition.path, 'rb') as f:
+        f.seek(partition.start)
+        data = f.read(partition.end - partition.start)
+    return pd.read_csv(io.BytesIO(partition.header + data), **options)
+
+
+def _text_column(partition: Partition, options: Dict[str, Any], col: str) -> pd.Series:
+    """Re-read one column of a partition as text"""
+    options = {key: value for key, value in options.items() if key not in ('dtype', 'converters', 'parse_dates')}
+    return read_partition(partition, {**options, 'usecols': [col], 'dtype': {col: 'str'}})[col]
+
+
+def concat_partitions(parsed: Sequence[Tuple[Partition, pd.DataFrame]], options: Dict[str, Any]) -> pd.DataFrame:
+    """Concatenate parsed partitions with the column types one read of the whole file gives
+
+    Types are inferred per partition: a column without values there is float64,
+    a column with only numbers in one partition and text in another has to be
+    text throughout, and category columns get the categories of their partition only.
+    """
+    frames = [df for _, df in parsed]
+    if len(frames) == 1:
+        return frames[0]
+    for col in frames[0].columns:
+        columns = [df[col] for df in frames]
+        if all(isinstance(column.dtype, pd.CategoricalDtype) for column in columns):
+            categories = functools.reduce(pd.Index.union, (column.cat.categories for column in columns))
+            for df in frames:
+                df[col] = df[col].cat.set_categories(categories)
+            continue
+        filled = {column.dtype for column in columns if column.notna().any()}
+        if len(filled) <= 1 or all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                                   for dtype in filled):
+            dtype = np.result_type(*filled) if len(filled) > 1 else next(iter(filled), None)
+            for df in frames:
+                if dtype is not None and df[col].dtype != dtype:
+                    df[col] = df[col].astype(dtype)
+            continue
+        for partition, df in parsed:
+            if not pd.api.types.is_string_dtype(df[col].dtype):
+                df[col] = _text_column(partition, options, col)
+    return pd.concat(frames, ignore_index=True)
+
+
+def parse_partitions(partitions: Sequence[Partition], options: Dict[str, Any],
+                     max_workers: int = 1) -> Iterator[Tuple[Partition, pd.DataFrame]]:
+    """Parse partitions in a process pool and yield them in order
+
+    At most two partitions per worker are parsed ahead of the consumer, so a
+    slow consumer bounds memory. A single partition or worker is parsed inline.
+    """
+    if max_workers <= 1 or len(partitions) <= 1:
+        for partition in partitions:
+            yield partition, read_partition(partition, options)
+        return
+
+    remaining = iter(partitions)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(partitions)), mp_context=PROCESS_CONTEXT) as pool:
+        try:
+            for partition in itertools.islice(remaining, 2 * max_workers):
+                pending.append((partition, pool.submit(read_partition, partition, options)))
+            while pending:
+                partition, future = pending.popleft()
+                df = future.result()
+                following = next(remaining, None)
+                if following is not None:
+                    pending.append((following, pool.submit(read_partition, following, options)))
+                yield partition, df
+        finally:
+            for _, future in pending:
+                future.cancel()
@@ -2,11 +2,24 @@
 Data loaders package
 """
 from .base import BaseLoader
+from .backends import LoadBackend, ExecuteManyBackend, FastExecuteManyBackend, BulkCopyBackend, get_backend
 from .batch import BatchLoader
+from .bulk import BulkLoader
+from .checkpoint import ChunkedLoad, RetryPolicy
 from .eu_mrv import EUMRVLoader
+from .incremental import IncrementalLoader
 
 __all__ = [
     'BaseLoader',
+    'LoadBackend',
+    'ExecuteManyBackend',
+    'FastExecuteManyBackend',
+    'BulkCopyBackend',
+    'get_backend',
     'BatchLoader',
-    'EUMRVLoader'
+    'BulkLoader',
+    'ChunkedLoad',
+    'RetryPolicy',
+    'EUMRVLoader',
+    'IncrementalLoader'
 ]
@@ -0,0 +1,209 @@
+"""
+Pluggable write backends for batch loading
+"""
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import sqlalchemy as sa
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .bulk import build_insert_sql
+
+logger = logging.getLogger(__name__)
+
+class LoadBackend(ABC):
+    """Abstract write strategy that inserts prepared records into an existing table"""
+
+    name = 'base'
+    # Writes join the transaction of the connection passed to write()
+    transactional = True
+
+    def __init__(self):
+        self.rows_written = 0
+        self.seconds = 0.0
+
+    @classmethod
+    @abstractmethod
+    def supports(cls, engine: sa.Engine) -> bool:
+        """Check whether this strategy can be used with the engine"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _write(self, engine: sa.Engine, table_name: str, columns: Sequence[str],
+               records: List[Tuple[Any, ...]], connection: Optional[sa.Connection] = None):
+        """Write records to the table, inside the transaction of connection when given"""
+        raise NotImplementedError
+
+    def write(self, engine: sa.Engine, table_name: str, columns: Sequence[str],
+              records: List[Tuple[Any, ...]], connection: Optional[sa.Connection] = None) -> int:
+        """Write records and record throughput statistics"""
+        start = time.perf_counter()
+        self._write(engine, table_name, columns, records, connection)
+        self.seconds += time.perf_counter() - start
+        self.rows_written += len(records)
+        return len(records)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rows written, elapsed time and rows/sec for this strategy"""
+        return {
+            'strategy': self.name,
+            'rows': self.rows_written,
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_written / self.seconds, 1) if self.seconds else 0.0
+        }
+
+
+class ExecuteManyBackend(LoadBackend):
+    """Generic DBAPI executemany with one prepared single-row statement"""
+
+    name = 'executemany'
+
+    @classmethod
+    def supports(cls, engine: sa.Engine) -> bool:
+        return True
+
+    def _write(self, engine, table_name, columns, records, connection=None):
+        sql = build_insert_sql(engine, table_name, columns)
+        if connection is not None:
+            connection.exec_driver_sql(sql, records)
+            return
+        with engine.begin() as conn:
+            conn.exec_driver_sql(sql, records)
+
+
+class FastExecuteManyBackend(LoadBackend):
+    """pyodbc executemany with parameter arrays (fast_executemany)"""
+
+    name = 'fast_executemany'
+
+    @classmethod
+    def supports(cls, engine: sa.Engine) -> bool:
+        return engine.dialect.driver == 'pyodbc'
+
+    def _write(self, engine, table_name, columns, records, connection=None):
+        sql = build_insert_sql(engine, table_name, columns)
+        if connection is not None:
+            # The chunk transaction commits or rolls back
+            self._executemany(connection.connection, sql, records)
+            return
+        raw_conn = engine.raw_connection()
+        try:
+            self._executemany(raw_conn, sql, records)
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+
+    @staticmethod
+    def _executemany(raw_conn, sql: str, records: List[Tuple[Any, ...]]):
+        cursor = raw_conn.cursor()
+        try:
+            cursor.fast_executemany = True
+            cursor.executemany(sql, records)
+        finally:
+            cursor.close()
+
+
+class BulkCopyBackend(LoadBackend):
+    """SQL Server native bulk copy through the bcp utility"""
+
+    name = 'bulk_copy'
+    transactional = False
+    field_terminator = '\x1f'
+    row_terminator = '\x1e'
+
+    @classmethod
+    def supports(cls, engine: sa.Engine) -> bool:
+        return engine.dialect.name == 'mssql' and shutil.which('bcp') is not None
+
+    def _write(self, engine, table_name, columns, records, connection=None):
+        # bcp runs in its own session and commits on its own, so chunked loads do not use it (see BatchLoader)
+        rows = [[self._format_value(v) for v in record] for record in records]
+        if any(self.field_terminator in value or self.row_terminator in value for row in rows for value in row):
+            # Character mode has no escaping, so such values cannot be told apart from terminators
+            logger.warning(f"Values of {table_name} contain bcp terminators, writing this batch with executemany")
+            ExecuteManyBackend()._write(engine, table_name, columns, records, connection)
+            return
+
+        fd, data_file = tempfile.mkstemp(suffix='.bcp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                for row in rows:
+                    f.write(self.field_terminator.join(row))
+                    f.write(self.row_terminator)
+            subprocess.run(self._build_command(engine, table_name, data_file), check=True,
+                           capture_output=True, text=True, env=self._environment(engine))
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"bcp failed for {table_name}: {e.stdout or e.stderr}") from e
+        finally:
+            os.remove(data_file)
+
+    @staticmethod
+    def _format_value(value: Any) -> str:
+        """Format a value for bcp character mode; empty fields load as NULL (-k)"""
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return str(int(value))
+        if isinstance(value, datetime):
+            return value.isoformat(sep=' ', timespec='milliseconds')
+        return str(value)
+
+    def _build_command(self, engine: sa.Engine, table_name: str, data_file: str) -> List[str]:
+        """Build the bcp command line from the engine URL; the password goes through the environment"""
+        url = engine.url
+        server = url.host or 'localhost'
+        if url.port:
+            server = f"{server},{url.port}"
+        command = [
+            'bcp', f"{url.database}.dbo.{table_name}", 'in', data_file,
+            '-S', server,
+            '-c', '-C', '65001', '-k',
+            '-t', f"0x{ord(self.field_terminator):02x}",
+            '-r', f"0x{ord(self.row_terminator):02x}"
+        ]
+        if url.username:
+            command += ['-U', url.username]
+        else:
+            command.append('-T')
+        return command
+
+    @staticmethod
+    def _environment(engine: sa.Engine) -> Dict[str, str]:
+        """Environment of the bcp process; a password on the command line would show up in ps"""
+        env = dict(os.environ)
+        if engine.url.username:
+            env['SQLCMDPASSWORD'] = engine.url.password or ''
+        return env
+
+
+LOAD_BACKENDS = {
+    BulkCopyBackend.name: BulkCopyBackend,
+    FastExecuteManyBackend.name: FastExecuteManyBackend,
+    ExecuteManyBackend.name: ExecuteManyBackend,
+}
+
+# bcp spawns a process per batch, so 'auto' only picks in-process strategies
+AUTO_STRATEGIES = (FastExecuteManyBackend, ExecuteManyBackend)
+
+
+def get_backend(strategy: str, engine: sa.Engine) -> LoadBackend:
+    """Create the configured write backend, falling back to the best supported one"""
+    if strategy != 'auto':
+        backend_class = LOAD_BACKENDS.get(strategy)
+        if backend_class is None:
+            raise ValueError(f"Unknown load strategy: {strategy}")
+        if backend_class.supports(engine):
+            return backend_class()
+        logger.warning(f"Load strategy {strategy} not supported for {engine.dialect.name}, using auto")
+
+    for backend_class in AUTO_STRATEGIES:
+        if backend_class.supports(engine):
+            return backend_class()
+    return ExecuteManyBackend()
@@ -1,36 +1,302 @@
 """
 Base loader for database operations
 """
+import threading
 import pandas as pd
 import sqlalchemy as sa
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Any, Iterable, Iterator, Optional, Tuple
 import logging
 
+from ..aio import DEFAULT_QUEUE_SIZE, pipelined, run_blocking
+from ..config import DEFAULT_CONFIG_PATH, load_config
+from ..models import RowFingerprint
+from ..models.ddl import add_business_key_index, build_table, create_indexes, create_table, widen_columns
+from ..staging import rollback_swap, swap_tables
+from .checkpoint import ChunkedLoad, RetryPolicy
+
 logger = logging.getLogger(__name__)
 
 class BaseLoader(ABC):
     """Abstract base class for all data loaders"""
     
-    def __init__(self, config_path: str = None):
-        from ..database import DatabaseManager
-        self.config_path = config_path or "config/database.yaml"
-        self.db_manager = DatabaseManager(config_path)
-        self.config = {}
+    def __init__(self, config_path: str = None, engine: Optional[sa.Engine] = None):
+        from ..database import db_manager
+        self.config_path = config_path or DEFAULT_CONFIG_PATH
+        self.db_manager = db_manager
+        # Pipeline settings (batch_size, load_strategy, write_mode, ...); callers add business_keys
+        self.config: Dict[str, Any] = load_config(self.config_path).pipeline.model_dump()
+        self.engine = engine
         self.logger = logger
+        # Tables this loader created or reflected, so appends never reflect them again
+        self._tables: Dict[Tuple[str, str], sa.Table] = {}
+        # Shadow table -> table it replaces, for loads in swap mode
+        self._shadows: Dict[str, str] = {}
+        self.retry = RetryPolicy.from_config(self.config_path)
+        # Connection of the chunk being written, per thread
+        self._chunk = threading.local()
+    
+    def get_engine(self, database: str = 'Kramse_RAW') -> sa.Engine:
+        """Get the injected engine, or the managed engine for a database"""
+        if self.engine is not None:
+            return self.engine
+        return self.db_manager.get_engine(database)
     
     @abstractmethod
-    def load(self, df: pd.DataFrame, table_name: str) -> int:
+    def load(self, df: pd.DataFrame, table_name: str, if_exists: str = 'replace') -> int:
         """Load DataFrame to database table"""
         raise NotImplementedError
     
+    @property
+    def swap_mode(self) -> bool:
+        """Whether full loads go to a shadow table that is swapped in (write_mode swap)"""
+        return self.config.get('write_mode', 'replace').lower() == 'swap'
+    
+    @property
+    def checkpoints(self) -> bool:
+        """Whether chunked loads record checkpoints and resume after the last one"""
+        return bool(self.config.get('checkpoints', True))
+    
+    def replace_table(self, df: pd.DataFrame, table_name: str) -> int:
+        """Replace the contents of a table with df, through a shadow table in swap mode"""
+        with self.swapped(table_name) as target:
+            # Replacing is idempotent, so a failed attempt is simply run again
+            return self.retry.run(lambda: self.load(df, target, 'replace'), f"Load of {table_name}")
+    
+    def load_chunks(self, chunks: Iterable[pd.DataFrame], table_name: str, source_path: str = None,
+                    layout: str = None) -> int:
+        """Load a stream of DataFrames; the first chunk replaces the table, the rest append
+        
+        Each chunk is written in one transaction and retried on transient errors.
+        With a source_path a checkpoint is committed with every chunk, and a load
+        of the same source file that died part-way resumes after its last
+        committed chunk instead of starting over. ``layout`` describes how the
+        source was split into chunks (see ``BaseExtractor.chunk_layout``);
+        checkpoints of another layout are not resumed.
+        """
+        load = self._start_chunked_load(table_name, source_path, layout)
+        with self.swapped(table_name, resume=load.resuming, keep=load.checkpointed) as target:
+            load.resume(target)
+            for index, chunk in enumerate(chunks):
+                self._write_chunk(load, chunk, target, index, self.load)
+        load.complete()
+        return load.loaded
+    
+    async def load_chunks_async(self, chunks: Iterable[pd.DataFrame], table_name: str,
+                                queue_size: int = DEFAULT_QUEUE_SIZE,
+                                write_chunk: Callable[[pd.DataFrame, str, str], int] = None,
+                                source_path: str = None, layout: str = None) -> int:
+        """Load a stream of DataFrames, reading the next chunk while the current one is written
+        
+        ``write_chunk(chunk, table_name, if_exists)`` replaces ``load`` for callers
+        that wrap each write, e.g. to time it. Chunks are checkpointed and
+        retried as in ``load_chunks``.
+        """
+        write_chunk = write_chunk or self.load
+        load = await run_blocking(self._start_chunked_load, table_name, source_path, layout)
+        target = await run_blocking(self.begin_swap, table_name, load.resuming) if self.swap_mode else table_name
+        
+        def write(chunk: pd.DataFrame, index: int) -> int:
+            return self._write_chunk(load, chunk, target, index, write_chunk)
+        
+        try:
+            await run_blocking(load.resume, target)
+            await pipelined(chunks, write, queue_size)
+        except Exception:
+            if target != table_name:
+                await run_blocking(self.abort_swap, target, load.checkpointed)
+            raise
+        if target != table_name:
+            await run_blocking(self.finish_swap, table_name, target)
+        await run_blocking(load.complete)
+        return load.loaded
+    
+    def _start_chunked_load(self, table_name: str, source_path: str = None, layout: str = None) -> ChunkedLoad:
+        if not self.checkpoints:
+            source_path = None
+        return ChunkedLoad.start(self._target_engine(), table_name, source_path, layout)
+    
+    def _write_chunk(self, load: ChunkedLoad, chunk: pd.DataFrame, target: str, index: int,
+                     write_chunk: Callable[[pd.DataFrame, str, str], int]) -> int:
+        """Write one chunk and its checkpoint in a single transaction, retrying transient failures"""
+        if load.skip(index, chunk):
+            return 0
+        if_exists = 'replace' if index == 0 else 'append'
+        engine = self._target_engine()
+        
+        def attempt():
+            start_time = datetime.now()
+            with self.chunk_transaction(engine) as conn:
+                loaded = write_chunk(chunk, target, if_exists)
+                digest = load.commit(conn, index, chunk, loaded, start_time)
+            return loaded, digest
+        
+        loaded, digest = self.retry.run(attempt, f"Chunk {index} of {target}")
+        load.committed(digest, loaded)
+        return loaded
+    
+    @contextmanager
+    def chunk_transaction(self, engine: sa.Engine) -> Iterator[sa.Connection]:
+        """Transaction that the inserts of the chunk being loaded in this thread join"""
+        with engine.begin() as conn:
+            self._chunk.connection = conn
+            try:
+                yield conn
+            finally:
+                self._chunk.connection = None
+    
+    def chunk_connection(self, engine: sa.Engine) -> Optional[sa.Connection]:
+        """Connection of the chunk transaction of this thread on engine, if any"""
+        conn = getattr(self._chunk, 'connection', None)
+        return conn if conn is not None and conn.engine is engine else None
+    
+    @contextmanager
+    def begin(self, engine: sa.Engine) -> Iterator[sa.Connection]:
+        """Join the chunk transaction of this thread, or begin a transaction of its own"""
+        conn = self.chunk_connection(engine)
+        if conn is not None:
+            yield conn
+            return
+        with engine.begin() as conn:
+            yield conn
+    
+    @contextmanager
+    def swapped(self, table_name: str, resume: bool = False, keep: bool = False) -> Iterator[str]:
+        """Name to load table_name under: a shadow table swapped in on success in swap mode
+        
+        Readers keep seeing the complete previous table until the swap, and a
+        failed load leaves it untouched. Outside swap mode this is table_name
+        itself. With ``resume`` loading continues in the shadow table of an
+        unfinished load, and with ``keep`` a failed load leaves its shadow table
+        for the next attempt to resume.
+        """
+        if not self.swap_mode:
+            yield table_name
+            return
+        
+        shadow = self.begin_swap(table_name, resume)
+        try:
+            yield shadow
+        except Exception:
+            self.abort_swap(shadow, keep)
+            raise
+        self.finish_swap(table_name, shadow)
+    
+    def _target_engine(self) -> sa.Engine:
+        return self.get_engine(self.config.get('target_db', 'Kramse_RAW'))
+    
+    def begin_swap(self, table_name: str, resume: bool = False) -> str:
+        """Return the shadow name to load into, dropping one left by a failed load unless resuming it"""
+        shadow = f"{table_name}__new"
+        engine = self._target_engine()
+        if not resume:
+            sa.Table(shadow, sa.MetaData()).drop(engine, checkfirst=True)
+        self._shadows[shadow] = table_name
+        return shadow
+    
+    def finish_swap(self, table_name: str, shadow: str):
+        """Index the loaded shadow table and swap it in, keeping the previous table as <table>__old"""
+        engine = self._target_engine()
+        self._shadows.pop(shadow, None)
+        table = self._tables.pop((str(engine.url), shadow), None)
+        self._tables.pop((str(engine.url), table_name), None)
+        if table is None:
+            if not sa.inspect(engine).has_table(shadow):
+                self.logger.warning(f"Nothing loaded into {shadow}, keeping the current {table_name}")
+                return
+            # Loaded by an earlier, resumed attempt
+            table = self._reflect(engine, shadow, table_name)
+        
+        # Indexes are built once on the full data instead of maintained per inserted row
+        with engine.begin() as conn:
+            create_indexes(conn, table)
+        with engine.begin() as conn:
+            swap_tables(conn, table_name, shadow, keep_old=True)
+        self.logger.info(f"Swapped {shadow} in as {table_name}; previous version kept as {table_name}__old")
+    
+    def abort_swap(self, shadow: str, keep: bool = False):
+        """Drop a partially loaded shadow table; the live table was never touched
+        
+        With ``keep`` (checkpointed loads) the committed chunks stay for the next attempt to resume.
+        """
+        engine = self._target_engine()
+        self._shadows.pop(shadow, None)
+        self._tables.pop((str(engine.url), shadow), None)
+        if keep:
+            return
+        try:
+            sa.Table(shadow, sa.MetaData()).drop(engine, checkfirst=True)
+        except Exception as e:
+            self.logger.warning(f"Could not drop shadow table {shadow}: {e}")
+    
+    def rollback(self, table_name: str):
+        """Put back the version of a table that the last swap replaced"""
+        with self._target_engine().begin() as conn:
+            rollback_swap(conn, table_name)
+        self.reset_fingerprints(self._target_engine(), table_name)
+        self._tables.pop((str(self._target_engine().url), table_name), None)
+        self.logger.info(f"Rolled {table_name} back to its previous version")
+    
+    def create_table(self, df: pd.DataFrame, table_name: str, engine: sa.Engine, if_exists: str = 'replace'):
+        """Create the target table once with column types sized to the data
+        
+        Types come from a profile of df (see ``models.ddl``); types declared by a
+        transformer in ``df.attrs['sql_types']`` override them. Business keys from
+        ``config['business_keys']`` get a clustered index. Appending to a known
+        table only widens the columns df does not fit in. Replacing a table
+        drops its row fingerprints, see ``reset_fingerprints``.
+        """
+        key = (str(engine.url), table_name)
+        if if_exists == 'append':
+            table = self._tables.get(key)
+            if table is None and sa.inspect(engine).has_table(table_name):
+                table = self._tables[key] = self._reflect(engine, table_name, self._shadows.get(table_name))
+            if table is not None:
+                widen_columns(engine, table, df)
+                return
+        
+        # A shadow table gets the definition of the table it replaces, without indexes until it is full
+        base_name = self._shadows.get(table_name, table_name)
+        business_keys = self.config.get('business_keys', {}).get(base_name)
+        table = build_table(df, base_name, business_keys, df.attrs.get('sql_types'),
+                            physical_name=table_name if table_name != base_name else None)
+        create_table(engine, table, replace=if_exists == 'replace', indexes=table_name == base_name)
+        self._tables[key] = table
+        if if_exists == 'replace':
+            self.reset_fingerprints(engine, base_name)
+    
+    def reset_fingerprints(self, engine: sa.Engine, table_name: str):
+        """Forget the row fingerprints of a table whose rows were replaced outside an incremental load
+        
+        The next incremental load then rebuilds the table instead of diffing
+        against fingerprints of rows that are no longer there.
+        """
+        fingerprints = RowFingerprint.__table__
+        if not sa.inspect(engine).has_table(fingerprints.name):
+            return
+        with engine.begin() as conn:
+            deleted = conn.execute(fingerprints.delete().where(fingerprints.c.table_name == table_name)).rowcount
+        if deleted:
+            self.logger.info(f"Reset {deleted} row fingerprints of {table_name}")
+    
+    def _reflect(self, engine: sa.Engine, table_name: str, base_name: str = None) -> sa.Table:
+        """Reflect a table; a shadow table of base_name gets the business key index it was created without"""
+        table = sa.Table(table_name, sa.MetaData(), autoload_with=engine)
+        if base_name is not None:
+            add_business_key_index(table, base_name, self.config.get('business_keys', {}).get(base_name),
+                                   shadow=True)
+        return table
+    
     def validate_data(self, df: pd.DataFrame) -> bool:
         """Validate data before loading"""
         if df.empty:
             self.logger.warning("DataFrame is empty")
             return False
         
-        if df.isna().all().all():
+        # Stops at the first column with a value instead of scanning the whole frame
+        if not any(df[col].notna().any() for col in df.columns):
             self.logger.warning("DataFrame contains only null values")
             return False
         
@@ -1,71 +1,94 @@
 """
 Standard batch loader for regular data
 """
+import threading
 import pandas as pd
+from typing import Any, Dict
 from .base import BaseLoader
+from .backends import LoadBackend, get_backend
+from .bulk import dataframe_to_records
 
 class BatchLoader(BaseLoader):
     """Standard batch loader for regular datasets"""
     
-    def load(self, df: pd.DataFrame, table_name: str) -> int:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.strategy_stats: Dict[str, Dict[str, Any]] = {}
+        self._stats_lock = threading.Lock()
+    
+    def load(self, df: pd.DataFrame, table_name: str, if_exists: str = 'replace') -> int:
         """Load DataFrame in batches"""
         try:
             if not self.validate_data(df):
                 return 0
             
             # Get engine for raw database
-            engine = self.db_manager.get_engine('Kramse_RAW')
+            engine = self.get_engine('Kramse_RAW')
             
             batch_size = self.config.get('batch_size', 500)
-            self.logger.info("Loading %d records to %s", len(df), table_name)
+            strategy = self.config.get('load_strategy', 'auto')
+            backend = get_backend(strategy, engine)
+            if not backend.transactional and self.chunk_connection(engine) is not None:
+                # A chunk commits with its checkpoint, and a retry must not find it half written; bcp commits on its own
+                self.logger.info(f"Load strategy {backend.name} commits on its own, using auto for chunked loads")
+                backend = get_backend('auto', engine)
+            self.logger.info(f"Loading {len(df)} records to {table_name} using {backend.name}")
+            
+            # Create the table once so batches do not re-reflect or re-create it
+            self.create_table(df, table_name, engine, if_exists)
             
             if len(df) > batch_size:
-                return self._load_in_batches(df, table_name, batch_size, engine)
+                loaded = self._load_in_batches(df, table_name, batch_size, engine, backend)
             else:
-                return self._load_single_batch(df, table_name, engine)
+                loaded = self._load_single_batch(df, table_name, engine, backend)
+            
+            self._record_stats(backend)
+            return loaded
                 
         except Exception as e:
-            self.logger.error("Failed to load data to %s: %s", table_name, e)
+            self.logger.error(f"Failed to load data to {table_name}: {e}")
             raise
     
-    def _load_in_batches(self, df: pd.DataFrame, table_name: str, batch_size: int, engine) -> int:
+    def _load_in_batches(self, df: pd.DataFrame, table_name: str, batch_size: int, engine,
+                         backend: LoadBackend) -> int:
         """Load data in multiple batches"""
-        self.logger.info("Using batch processing with batch size: %d", batch_size)
+        self.logger.info(f"Using batch processing with batch size: {batch_size}")
         
         total_loaded = 0
+        total_batches = (len(df) + batch_size - 1) // batch_size
         for i in range(0, len(df), batch_size):
             batch_df = df.iloc[i:i+batch_size]
             batch_num = (i // batch_size) + 1
-            total_batches = (len(df) + batch_size - 1) // batch_size
             
-            self.logger.info("Processing batch %d/%d (%d records)", batch_num, total_batches, len(batch_df))
+            self.logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch_df)} records)")
             
-            # First batch replaces, subsequent batches append
-            if_exists_batch = 'replace' if i == 0 else 'append'
-            
-            batch_df.to_sql(
-                table_name,
-                engine,
-                if_exists=if_exists_batch,
-                index=False,
-                method='multi',
-                chunksize=100
-            )
-            total_loaded += len(batch_df)
+            total_loaded += backend.write(engine, table_name, df.columns, dataframe_to_records(batch_df),
+                                          self.chunk_connection(engine))
         
-        self.logger.info("Batch loading completed: %d total records loaded", total_loaded)
+        self.logger.info(f"Batch loading completed: {total_loaded} total records loaded")
         return total_loaded
     
-    def _load_single_batch(self, df: pd.DataFrame, table_name: str, engine) -> int:
+    def _load_single_batch(self, df: pd.DataFrame, table_name: str, engine, backend: LoadBackend) -> int:
         """Load data in single operation"""
-        df.to_sql(
-            table_name,
-            engine,
-            if_exists='replace',
-            index=False,
-            method='multi',
-            chunksize=250
-        )
+        loaded = backend.write(engine, table_name, df.columns, dataframe_to_records(df), self.chunk_connection(engine))
         
-        self.logger.info("Successfully loaded %d records to %s", len(df), table_name)
-        return len(df)
+        self.logger.info(f"Successfully loaded {loaded} records to {table_name}")
+        return loaded
+    
+    def _record_stats(self, backend: LoadBackend):
+        """Accumulate and report throughput per load strategy"""
+        # Access tables are loaded from several threads through one loader
+        with self._stats_lock:
+            stats = self.strategy_stats.setdefault(backend.name, {'rows': 0, 'seconds': 0.0})
+            stats['rows'] += backend.rows_written
+            stats['seconds'] += backend.seconds
+            stats['rows_per_second'] = round(stats['rows'] / stats['seconds'], 1) if stats['seconds'] else 0.0
+        
+        self.logger.info(
+            f"Load strategy {backend.name}: {backend.rows_written} rows in {backend.seconds:.3f}s "
+            f"({backend.get_stats()['rows_per_second']:.1f} rows/sec)"
+        )
+    
+    def get_strategy_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get accumulated rows/sec per load strategy"""
+        return self.strategy_stats
@@ -0,0 +1,129 @@
+"""
+Set-based bulk loader for wide tables
+"""
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+from typing import Any, List, Sequence, Tuple
+from .base import BaseLoader
+from .checkpoint import is_transient
+
+# Maximum number of bound parameters per statement, per SQLAlchemy dialect
+DIALECT_PARAMETER_LIMITS = {
+    'mssql': 2100,
+    'sqlite': 999,
+    'postgresql': 32767,
+    'mysql': 65535,
+}
+DEFAULT_PARAMETER_LIMIT = 999
+
+# SQL Server rejects table value constructors with more than 1000 rows
+MAX_ROWS_PER_STATEMENT = 1000
+
+
+def get_parameter_limit(engine: sa.Engine) -> int:
+    """Get the bound parameter limit of the engine's driver"""
+    return DIALECT_PARAMETER_LIMITS.get(engine.dialect.name, DEFAULT_PARAMETER_LIMIT)
+
+
+def rows_per_chunk(n_columns: int, parameter_limit: int) -> int:
+    """Number of rows that fit in one multi-row INSERT for the given column count"""
+    # Keep one parameter spare; some drivers bind an extra return parameter
+    rows = (parameter_limit - 1) // max(n_columns, 1)
+    return max(1, min(rows, MAX_ROWS_PER_STATEMENT))
+
+
+def dataframe_to_records(df: pd.DataFrame) -> List[Tuple[Any, ...]]:
+    """Convert DataFrame rows to driver-ready tuples with NaN/NaT mapped to None"""
+    columns = []
+    for _, series in df.items():
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            # Drivers bind plain datetimes; pd.Timestamp is not adapted by every DBAPI
+            values = np.array(series.dt.to_pydatetime(), dtype=object)
+        else:
+            values = series.to_numpy(dtype=object, copy=True)
+        values[series.isna().to_numpy()] = None
+        columns.append(values)
+    return list(zip(*columns))
+
+
+def build_insert_sql(engine: sa.Engine, table_name: str, columns: Sequence[str], n_rows: int = 1) -> str:
+    """Build a positional (multi-row) INSERT statement for the engine's dialect"""
+    preparer = engine.dialect.identifier_preparer
+    marker = '%s' if engine.dialect.paramstyle in ('format', 'pyformat') else '?'
+    column_list = ', '.join(preparer.quote(str(col)) for col in columns)
+    row_values = '(' + ', '.join([marker] * len(columns)) + ')'
+    return (
+        f"INSERT INTO {preparer.quote(table_name)} ({column_list}) "
+        f"VALUES {', '.join([row_values] * n_rows)}"
+    )
+
+
+class BulkLoader(BaseLoader):
+    """Set-based loader that sends parameter arrays in driver-sized chunks"""
+
+    def load(self, df: pd.DataFrame, table_name: str, if_exists: str = 'replace') -> int:
+        """Load DataFrame with multi-row INSERT statements"""
+        try:
+            if not self.validate_data(df):
+                return 0
+
+            engine = self.get_engine(self.config.get('target_db', 'Kramse_RAW'))
+            chunk_rows = rows_per_chunk(len(df.columns), get_parameter_limit(engine))
+            self.logger.info(f"Bulk loading {len(df)} records with {len(df.columns)} columns to {table_name} "
+                             f"({chunk_rows} rows per statement)")
+
+            self.create_table(df, table_name, engine, if_exists)
+
+            # One conversion of the whole frame; slicing per chunk would pay the pandas overhead every statement
+            all_records = dataframe_to_records(df)
+            total_loaded = 0
+            failed_records = 0
+            for start in range(0, len(all_records), chunk_rows):
+                records = all_records[start:start + chunk_rows]
+                loaded = self._insert_chunk(engine, table_name, df.columns, records, start)
+                total_loaded += loaded
+                failed_records += len(records) - loaded
+
+            self.logger.info(f"Bulk loading completed: {total_loaded}/{len(df)} records loaded "
+                             f"({failed_records} failed)")
+            return total_loaded
+
+        except Exception as e:
+            self.logger.error(f"Failed to bulk load data to {table_name}: {e}")
+            raise
+
+    def _insert_chunk(self, engine: sa.Engine, table_name: str, columns: Sequence[str],
+                      records: List[Tuple[Any, ...]], offset: int) -> int:
+        """Insert one chunk; on failure retry the chunk row by row
+        
+        Transient errors (a lost connection, a timeout) are raised instead, for
+        the load to be retried as a whole.
+        """
+        try:
+            self._execute_insert(engine, table_name, columns, records)
+            return len(records)
+        except Exception as chunk_error:
+            if is_transient(chunk_error):
+                raise
+            self.logger.warning(f"Chunk at row {offset + 1} failed, retrying {len(records)} rows individually: "
+                                f"{chunk_error}")
+
+        loaded = 0
+        for i, record in enumerate(records):
+            try:
+                self._execute_insert(engine, table_name, columns, [record])
+                loaded += 1
+            except Exception as record_error:
+                if is_transient(record_error):
+                    raise
+                self.logger.warning(f"Failed to load record {offset + i + 1}: {record_error}")
+        return loaded
+
+    def _execute_insert(self, engine: sa.Engine, table_name: str, columns: Sequence[str],
+                        records: List[Tuple[Any, ...]]):
+        """Execute a single multi-row INSERT in its own transaction or the chunk's"""
+        sql = build_insert_sql(engine, table_name, columns, len(records))
+        params = tuple(value for record in records for value in record)
+        with self.begin(engine) as conn:
+            conn.exec_driver_sql(sql, params)
@@ -0,0 +1,242 @@
+"""
+Chunk checkpoints in etl_metadata and retry with backoff per chunk
+"""
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional, TypeVar, Union
+import pandas as pd
+import sqlalchemy as sa
+
+from ..config import load_config, source_files
+from ..models import LoadMetadata, ensure_columns
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Columns added by the transformers that change on every run
+METADATA_COLUMNS = {'loaded_at', 'processed_date', 'source_file', 'total_columns_in_source'}
+
+# Wait before the first retry; doubles after every further failure
+DEFAULT_RETRY_DELAY = float(os.getenv('RETRY_DELAY_SECONDS', '1'))
+
+
+def file_fingerprint(file_path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a source file"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path: Union[str, List[str]]) -> Optional[str]:
+    """SHA-256 of the files of a source (a path or glob); a single file hashes like the file itself"""
+    files = source_files(path) if isinstance(path, str) else list(path)
+    if not files:
+        return None
+    if len(files) == 1:
+        return file_fingerprint(files[0])
+    digest = hashlib.sha256()
+    for file_path in files:
+        digest.update(f"{os.path.basename(file_path)}:{file_fingerprint(file_path)}\n".encode())
+    return digest.hexdigest()
+
+
+def chunk_hash(df: pd.DataFrame) -> str:
+    """SHA-256 over the vectorized row hashes of a chunk, ignoring per-run metadata columns"""
+    value_columns = [col for col in df.columns if col not in METADATA_COLUMNS]
+    hashes = pd.util.hash_pandas_object(df[value_columns], index=False)
+    return hashlib.sha256(hashes.to_numpy().tobytes()).hexdigest()
+
+
+def is_transient(error: BaseException) -> bool:
+    """Lost connections, timeouts and locks are worth retrying; bad data is not"""
+    if isinstance(error, sa.exc.DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, (sa.exc.OperationalError, sa.exc.InterfaceError, sa.exc.TimeoutError,
+                              sa.exc.DisconnectionError, ConnectionError, TimeoutError))
+
+
+@dataclass
+class RetryPolicy:
+    """Retry transient failures with exponential backoff within a time budget
+
+    ``retries`` and ``timeout_seconds`` come from ``retry_attempts`` and
+    ``timeout_seconds`` of the pipeline configuration (see ``src.config``).
+    """
+    retries: int = 3
+    timeout_seconds: float = 300
+    delay: float = DEFAULT_RETRY_DELAY
+
+    @classmethod
+    def from_config(cls, config_path: str) -> 'RetryPolicy':
+        pipeline = load_config(config_path).pipeline
+        return cls(retries=pipeline.retry_attempts, timeout_seconds=pipeline.timeout_seconds)
+
+    def run(self, func: Callable[[], T], description: str) -> T:
+        """Call func until it succeeds, fails for good, or the next wait would pass the time budget"""
+        deadline = time.monotonic() + self.timeout_seconds
+        delay = self.delay
+        for attempt in range(self.retries + 1):
+            try:
+                return func()
+            except Exception as e:
+                if not is_transient(e) or attempt == self.retries or time.monotonic() + delay > deadline:
+                    raise
+                logger.warning(f"{description} failed (attempt {attempt + 1} of {self.retries + 1}), "
+                               f"retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
+                delay *= 2
+
+
+@dataclass
+class ChunkedLoad:
+    """Progress of one chunked load, checkpointed in etl_metadata after every committed chunk
+
+    Each checkpoint row (stage 'checkpoint', status COMMITTED) holds the chunk
+    index, its first row in the target table (``chunk_offset``), its row count
+    (``records_loaded``) and its hash. It is written in the transaction that
+    inserts the chunk, so the target table holds exactly the checkpointed rows.
+    A later load of the same source file split into chunks the same way
+    (``layout``, e.g. the chunksize) resumes after the last checkpoint; a
+    completed load ends with a COMPLETE row.
+    """
+    table_name: str
+    engine: Optional[sa.Engine] = None
+    source_path: Optional[str] = None
+    source_hash: Optional[str] = None
+    layout: Optional[str] = None
+    hashes: List[str] = field(default_factory=list)  # hashes of the committed chunks, in order
+    loaded: int = 0
+
+    @classmethod
+    def start(cls, engine: sa.Engine, table_name: str, source_path: str = None,
+              layout: str = None) -> 'ChunkedLoad':
+        """Begin a load, picking up the checkpoints of an unfinished load of the same source file and layout"""
+        source_hash = source_fingerprint(source_path) if source_path else None
+        if source_hash is None:
+            return cls(table_name)
+        ensure_columns(engine, LoadMetadata.__table__)
+        load = cls(table_name, engine, source_path, source_hash, layout)
+        load.hashes, load.loaded = load._committed()
+        return load
+
+    @property
+    def checkpointed(self) -> bool:
+        return self.engine is not None
+
+    @property
+    def resuming(self) -> bool:
+        return bool(self.hashes)
+
+    def _committed(self):
+        """Chunk hashes and rows of the last load of the table if it did not complete"""
+        metadata = LoadMetadata.__table__
+        query = (
+            sa.select(metadata.c.status, metadata.c.source_hash, metadata.c.chunk_index,
+                      metadata.c.chunk_offset, metadata.c.records_loaded, metadata.c.chunk_hash,
+                      metadata.c.chunk_layout)
+            .where(metadata.c.table_name == self.table_name, metadata.c.stage == 'checkpoint')
+            .order_by(metadata.c.id.desc())
+        )
+        with self.engine.connect() as conn:
+            last = conn.execute(query.limit(1)).first()
+            if last is None or last.status != 'COMMITTED' or last.source_hash != self.source_hash:
+                return [], 0
+            if last.chunk_layout != self.layout:
+                # Chunk i of another layout holds other rows, so none of its checkpoints apply
+                logger.info(f"Checkpoints of {self.table_name} were taken with chunk layout {last.chunk_layout} "
+                            f"instead of {self.layout}, loading from the start")
+                return [], 0
+            rows = conn.execute(query.limit(last.chunk_index + 1)).all()[::-1]
+        if [row.chunk_index for row in rows] != list(range(last.chunk_index + 1)):
+            return [], 0
+        return [row.chunk_hash for row in rows], last.chunk_offset + last.records_loaded
+
+    def resume(self, target: str):
+        """Keep the checkpoints only if target still holds exactly the committed rows"""
+        if not self.resuming:
+            return
+        with self.engine.connect() as conn:
+            exists = sa.inspect(conn).has_table(target)
+            rows = conn.execute(sa.select(sa.func.count()).select_from(sa.table(target))).scalar() if exists else None
+        if rows != self.loaded:
+            logger.warning(f"{target} holds {rows} rows instead of the {self.loaded} checkpointed, "
+                           f"loading {self.table_name} from the start")
+            self.hashes, self.loaded = [], 0
+            return
+        logger.info(f"Resuming load of {self.table_name} after chunk {len(self.hashes) - 1} "
+                    f"({self.loaded} rows committed)")
+
+    def skip(self, index: int, chunk: pd.DataFrame) -> bool:
+        """True for a chunk a previous attempt committed; its content must not have changed
+
+        A first chunk that changed restarts the load from it in this run; a later
+        one cannot, since the chunks before it were skipped.
+        """
+        if index >= len(self.hashes):
+            return False
+        if chunk_hash(chunk) == self.hashes[index]:
+            return True
+        if index == 0:
+            logger.warning(f"First chunk of {self.table_name} differs from its checkpoint, loading from the start")
+            self.hashes, self.loaded = [], 0
+            return False
+        self._close('INVALID')
+        raise ValueError(f"Chunk {index} of {self.table_name} differs from its checkpoint; "
+                         f"the next run loads the table from the start")
+
+    def commit(self, conn, index: int, chunk: pd.DataFrame, loaded: int, start_time: datetime) -> Optional[str]:
+        """Write the checkpoint of a chunk in the transaction that inserted it"""
+        if self.engine is None:
+            return None
+        digest = chunk_hash(chunk)
+        conn.execute(LoadMetadata.__table__.insert().values(
+            table_name=self.table_name,
+            source_file=self.source_path,
+            source_hash=self.source_hash,
+            stage='checkpoint',
+            status='COMMITTED',
+            load_mode='FULL',
+            chunk_index=index,
+            chunk_offset=self.loaded,
+            chunk_hash=digest,
+            chunk_layout=self.layout,
+            records_processed=len(chunk),
+            records_loaded=loaded,
+            start_time=start_time,
+            end_time=datetime.now()
+        ))
+        return digest
+
+    def committed(self, digest: Optional[str], loaded: int):
+        """Count a chunk once its transaction committed"""
+        if digest is not None:
+            self.hashes.append(digest)
+        self.loaded += loaded
+
+    def complete(self):
+        self._close('COMPLETE')
+
+    def _close(self, status: str):
+        """End the checkpoints of this load so the next one starts from the first chunk"""
+        if self.engine is None:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(LoadMetadata.__table__.insert().values(
+                table_name=self.table_name,
+                source_file=self.source_path,
+                source_hash=self.source_hash,
+                stage='checkpoint',
+                status=status,
+                load_mode='FULL',
+                chunk_index=len(self.hashes),
+                chunk_layout=self.layout,
+                records_loaded=self.loaded,
+                end_time=datetime.now()
+            ))
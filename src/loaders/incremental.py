@@ -0,0 +1,219 @@
+"""
+Incremental loader that applies only changed rows using content fingerprints
+"""
+import json
+import pandas as pd
+import sqlalchemy as sa
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from .backends import LoadBackend, get_backend
+from .base import BaseLoader
+from .bulk import dataframe_to_records
+from .checkpoint import METADATA_COLUMNS, source_fingerprint
+from ..models import LoadMetadata, RowFingerprint, ensure_columns
+
+
+def row_fingerprints(df: pd.DataFrame, exclude: Sequence[str] = ()) -> pd.Series:
+    """Vectorized 64-bit content hash per row, as hex strings"""
+    value_columns = [col for col in df.columns if col not in METADATA_COLUMNS and col not in exclude]
+    hashes = pd.util.hash_pandas_object(df[value_columns], index=False)
+    return hashes.map('{:016x}'.format)
+
+
+def business_key_strings(df: pd.DataFrame, business_keys: Sequence[str]) -> pd.Series:
+    """Composite business key per row as a JSON array of its values, which parses back to typed values"""
+    records = dataframe_to_records(df[list(business_keys)])
+    return pd.Series([json.dumps(record, default=str, ensure_ascii=False) for record in records],
+                     index=df.index, dtype=object)
+
+
+class IncrementalLoader(BaseLoader):
+    """Loader that skips unchanged sources and applies only inserted, updated and deleted rows"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metadata_ready = set()
+
+    def load(self, df: pd.DataFrame, table_name: str, if_exists: str = 'replace') -> int:
+        """Apply the changes in df to table_name using the configured business keys"""
+        business_keys = self.config.get('business_keys', {}).get(table_name)
+        if not business_keys:
+            raise ValueError(f"No business keys configured for incremental load of {table_name}")
+        return self.load_incremental(df, table_name, business_keys)
+
+    def source_unchanged(self, table_name: str, source_path: str) -> bool:
+        """Check whether the source file matches the last successful load of the table"""
+        engine = self.get_engine(self.config.get('target_db', 'Kramse_RAW'))
+        self._ensure_metadata_tables(engine)
+
+        metadata = LoadMetadata.__table__
+        query = (
+            sa.select(metadata.c.source_hash)
+            .where(
+                metadata.c.table_name == table_name,
+                metadata.c.status.in_(['SUCCESS', 'SKIPPED']),
+                # Metrics spans share etl_metadata but carry no source hash
+                metadata.c.source_hash.isnot(None)
+            )
+            .order_by(metadata.c.id.desc())
+            .limit(1)
+        )
+        with engine.connect() as conn:
+            last_hash = conn.execute(query).scalar()
+
+        return last_hash is not None and last_hash == source_fingerprint(source_path)
+
+    def record_skip(self, table_name: str, source_path: str):
+        """Record a skipped run for an unchanged source"""
+        engine = self.get_engine(self.config.get('target_db', 'Kramse_RAW'))
+        now = datetime.now()
+        with engine.begin() as conn:
+            self._write_metadata(conn, table_name, source_path, source_fingerprint(source_path),
+                                 'SKIPPED', 0, (0, 0, 0), now, now)
+        self.logger.info(f"Source unchanged, skipped load of {table_name}")
+
+    def load_incremental(self, df: pd.DataFrame, table_name: str, business_keys: List[str],
+                         source_path: Optional[str] = None) -> int:
+        """Diff df against stored fingerprints and apply the changes in one transaction"""
+        start_time = datetime.now()
+        if not self.validate_data(df):
+            return 0
+
+        engine = self.get_engine(self.config.get('target_db', 'Kramse_RAW'))
+        self._ensure_metadata_tables(engine)
+        source_hash = source_fingerprint(source_path) if source_path else None
+
+        missing_keys = df[business_keys].isna().any(axis=1)
+        if missing_keys.any():
+            self.logger.warning(f"Rejecting {missing_keys.sum()} rows without a complete business key in {table_name}")
+            df = df[~missing_keys]
+        keys = business_key_strings(df, business_keys)
+        duplicated = keys.duplicated(keep='last')
+        if duplicated.any():
+            self.logger.warning(f"Dropping {duplicated.sum()} rows with duplicate business keys in {table_name}")
+            df, keys = df[~duplicated], keys[~duplicated]
+        hashes = row_fingerprints(df)
+
+        stored = self._stored_fingerprints(engine, table_name)
+        # Without a fingerprinted baseline the table is (re)built from scratch
+        initial_load = not stored or not sa.inspect(engine).has_table(table_name)
+        if initial_load:
+            stored = {}
+
+        stored_hashes = keys.map(stored)
+        is_new = stored_hashes.isna().to_numpy()
+        is_changed = (~is_new) & (stored_hashes.to_numpy() != hashes.to_numpy())
+        deleted_keys = list(set(stored) - set(keys))
+
+        inserted, updated = df[is_new], df[is_changed]
+        changed_keys = keys[is_changed].tolist()
+        self.logger.info(
+            f"Incremental load of {table_name}: {len(inserted)} inserted, {len(updated)} updated, "
+            f"{len(deleted_keys)} deleted, {len(df) - len(inserted) - len(updated)} unchanged"
+        )
+
+        if initial_load:
+            self.create_table(df, table_name, engine, 'replace')
+        else:
+            self.create_table(df, table_name, engine, 'append')
+
+        # Deleting the old versions and inserting the new ones in one transaction is the upsert
+        to_write = pd.concat([inserted, updated]) if len(updated) else inserted
+        backend = self._backend(engine)
+        with engine.begin() as conn:
+            self._delete_rows(conn, engine, table_name, business_keys, updated, deleted_keys)
+            if len(to_write):
+                backend.write(engine, table_name, df.columns, dataframe_to_records(to_write), conn)
+            if initial_load:
+                self._clear_fingerprints(conn, table_name)
+            self._update_fingerprints(conn, table_name, changed_keys + deleted_keys,
+                                      keys[is_new | is_changed], hashes[is_new | is_changed])
+            self._write_metadata(conn, table_name, source_path, source_hash, 'SUCCESS', len(df),
+                                 (len(inserted), len(updated), len(deleted_keys)), start_time, datetime.now())
+
+        return len(to_write)
+
+    def _backend(self, engine: sa.Engine) -> LoadBackend:
+        """Configured write backend, if it can write inside the transaction of the changes"""
+        backend = get_backend(self.config.get('load_strategy', 'auto'), engine)
+        if not backend.transactional:
+            # The rows, fingerprints and metadata commit together; bcp commits in its own session
+            self.logger.info(f"Load strategy {backend.name} commits on its own, using auto for incremental loads")
+            backend = get_backend('auto', engine)
+        return backend
+
+    def _ensure_metadata_tables(self, engine: sa.Engine):
+        """Create etl_metadata and etl_row_fingerprints if they do not exist"""
+        if engine in self._metadata_ready:
+            return
+        ensure_columns(engine, LoadMetadata.__table__)
+        RowFingerprint.__table__.create(engine, checkfirst=True)
+        self._metadata_ready.add(engine)
+
+    def _stored_fingerprints(self, engine: sa.Engine, table_name: str) -> Dict[str, str]:
+        """Load business key -> row hash for the table"""
+        fingerprints = RowFingerprint.__table__
+        query = sa.select(fingerprints.c.business_key, fingerprints.c.row_hash).where(
+            fingerprints.c.table_name == table_name
+        )
+        with engine.connect() as conn:
+            return dict(conn.execute(query).all())
+
+    def _delete_rows(self, conn, engine: sa.Engine, table_name: str, business_keys: List[str],
+                     updated: pd.DataFrame, deleted_keys: List[str]):
+        """Delete the old versions of updated rows and rows no longer in the source"""
+        if not len(updated) and not deleted_keys:
+            return
+
+        preparer = engine.dialect.identifier_preparer
+        marker = '%s' if engine.dialect.paramstyle in ('format', 'pyformat') else '?'
+        condition = ' AND '.join(f"{preparer.quote(col)} = {marker}" for col in business_keys)
+        sql = f"DELETE FROM {preparer.quote(table_name)} WHERE {condition}"
+
+        # Deleted rows only exist as stored keys; their JSON holds the typed values
+        params = dataframe_to_records(updated[business_keys])
+        params += [tuple(json.loads(key)) for key in deleted_keys]
+        conn.exec_driver_sql(sql, params)
+
+    def _clear_fingerprints(self, conn, table_name: str):
+        """Remove all stored fingerprints of a table before a rebuild"""
+        fingerprints = RowFingerprint.__table__
+        conn.execute(fingerprints.delete().where(fingerprints.c.table_name == table_name))
+
+    def _update_fingerprints(self, conn, table_name: str, removed_keys: List[str],
+                             keys: pd.Series, hashes: pd.Series):
+        """Replace fingerprints of changed and deleted rows"""
+        fingerprints = RowFingerprint.__table__
+        if removed_keys:
+            conn.execute(
+                fingerprints.delete().where(
+                    fingerprints.c.table_name == table_name,
+                    fingerprints.c.business_key == sa.bindparam('key')
+                ),
+                [{'key': key} for key in removed_keys]
+            )
+        if len(keys):
+            now = datetime.now()
+            conn.execute(fingerprints.insert(), [
+                {'table_name': table_name, 'business_key': key, 'row_hash': row_hash, 'updated_at': now}
+                for key, row_hash in zip(keys, hashes)
+            ])
+
+    def _write_metadata(self, conn, table_name: str, source_path: Optional[str], source_hash: Optional[str],
+                        status: str, processed: int, changes: tuple, start_time: datetime, end_time: datetime):
+        """Write one etl_metadata row for this load"""
+        inserted, updated, deleted = changes
+        conn.execute(LoadMetadata.__table__.insert().values(
+            table_name=table_name,
+            source_file=source_path,
+            records_processed=processed,
+            records_loaded=inserted + updated,
+            status=status,
+            load_mode='INCREMENTAL',
+            source_hash=source_hash,
+            rows_inserted=inserted,
+            rows_updated=updated,
+            rows_deleted=deleted,
+            start_time=start_time,
+            end_time=end_time
+        ))
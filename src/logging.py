@@ -0,0 +1,234 @@
+"""
+Pipeline metrics: timed spans per stage with JSON lines, Prometheus and etl_metadata export
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """High-water mark of this process's resident memory, if the platform reports it"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        memory = psutil.Process().memory_info()
+        return getattr(memory, 'peak_wset', memory.rss)
+    except ImportError:
+        return None
+
+
+def frame_bytes(df: Optional[pd.DataFrame]) -> int:
+    """In-memory size of a DataFrame including string contents"""
+    if df is None:
+        return 0
+    return int(df.memory_usage(deep=True).sum())
+
+
+@dataclass
+class Span:
+    """Timing and volume of one pipeline stage for one source or table"""
+    stage: str
+    source: str
+    table: Optional[str] = None
+    rows: int = 0
+    bytes: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: Optional[int] = None
+    status: str = 'SUCCESS'
+    error: Optional[str] = None
+    start_time: datetime = field(default_factory=datetime.now)
+    end_time: Optional[datetime] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return round(self.rows / self.wall_seconds, 1) if self.wall_seconds else 0.0
+
+    def merge(self, other: 'Span') -> 'Span':
+        """Combine with a span of the same stage, e.g. for the chunks of a streamed source"""
+        self.rows += other.rows
+        self.bytes += other.bytes
+        self.wall_seconds += other.wall_seconds
+        self.cpu_seconds += other.cpu_seconds
+        self.peak_rss_bytes = max(filter(None, (self.peak_rss_bytes, other.peak_rss_bytes)), default=None)
+        self.start_time = min(self.start_time, other.start_time)
+        self.end_time = max(filter(None, (self.end_time, other.end_time)), default=None)
+        if other.status != 'SUCCESS':
+            self.status, self.error = other.status, other.error
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with ISO timestamps and rows/sec"""
+        data = asdict(self)
+        data['start_time'] = self.start_time.isoformat()
+        data['end_time'] = self.end_time.isoformat() if self.end_time else None
+        data['wall_seconds'] = round(self.wall_seconds, 6)
+        data['cpu_seconds'] = round(self.cpu_seconds, 6)
+        data['rows_per_second'] = self.rows_per_second
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Span':
+        values = {key: value for key, value in data.items() if key != 'rows_per_second'}
+        values['start_time'] = datetime.fromisoformat(values['start_time'])
+        if values.get('end_time'):
+            values['end_time'] = datetime.fromisoformat(values['end_time'])
+        return cls(**values)
+
+
+@contextmanager
+def measure(stage: str, source: str, table: Optional[str] = None) -> Iterator[Span]:
+    """Time a block; the caller sets span.rows and span.bytes
+
+    CPU time is measured for the current thread, so concurrent loads do not
+    count each other's work.
+    """
+    span = Span(stage=stage, source=source, table=table)
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        yield span
+    except Exception as e:
+        span.status, span.error = 'FAILED', str(e)
+        raise
+    finally:
+        span.wall_seconds = time.perf_counter() - wall_start
+        span.cpu_seconds = time.thread_time() - cpu_start
+        span.peak_rss_bytes = peak_rss_bytes()
+        span.end_time = datetime.now()
+
+
+class MetricsCollector:
+    """Thread-safe collection of spans for one pipeline run"""
+
+    def __init__(self, metrics_dir: str = None):
+        self.metrics_dir = Path(metrics_dir or os.getenv('METRICS_DIR', 'logs'))
+        self.run_id = datetime.now().strftime('%Y%m%dT%H%M%S')
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self.logger = logger
+
+    @contextmanager
+    def span(self, stage: str, source: str, table: Optional[str] = None) -> Iterator[Span]:
+        """Measure a block and record the span, also when it fails"""
+        with measure(stage, source, table) as span:
+            try:
+                yield span
+            finally:
+                self.add([span])
+
+    def add(self, spans: Iterable[Span]):
+        """Record spans measured elsewhere, e.g. in a worker process"""
+        spans = list(spans)
+        with self._lock:
+            self.spans.extend(spans)
+        for span in spans:
+            table = f"/{span.table}" if span.table else ''
+            self.logger.info(
+                f"{span.stage} {span.source}{table}: {span.rows} rows, {span.wall_seconds:.3f}s wall, "
+                f"{span.cpu_seconds:.3f}s cpu, {span.rows_per_second:.1f} rows/sec"
+            )
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Total wall and CPU seconds and rows per stage"""
+        totals = {}
+        for span in self.spans:
+            stage = totals.setdefault(span.stage, {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'rows': 0})
+            stage['wall_seconds'] = round(stage['wall_seconds'] + span.wall_seconds, 6)
+            stage['cpu_seconds'] = round(stage['cpu_seconds'] + span.cpu_seconds, 6)
+            stage['rows'] += span.rows
+        return totals
+
+    def export_jsonl(self, path: str = None) -> Path:
+        """Append all spans of this run as JSON lines"""
+        path = Path(path) if path else self.metrics_dir / 'metrics.jsonl'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            for span in self.spans:
+                f.write(json.dumps({'run_id': self.run_id, **span.to_dict()}) + '\n')
+        return path
+
+    def export_prometheus(self, path: str = None) -> Path:
+        """Write the spans of this run in the Prometheus textfile collector format"""
+        path = Path(path) if path else self.metrics_dir / 'etl_metrics.prom'
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        metrics = (
+            ('etl_stage_wall_seconds', 'Wall time per pipeline stage', lambda s: s.wall_seconds),
+            ('etl_stage_cpu_seconds', 'CPU time per pipeline stage', lambda s: s.cpu_seconds),
+            ('etl_stage_rows', 'Rows handled per pipeline stage', lambda s: s.rows),
+            ('etl_stage_bytes', 'Bytes handled per pipeline stage', lambda s: s.bytes),
+            ('etl_stage_rows_per_second', 'Throughput per pipeline stage', lambda s: s.rows_per_second),
+            ('etl_stage_success', '1 if the stage succeeded, else 0', lambda s: int(s.status == 'SUCCESS')),
+        )
+        lines = []
+        for name, help_text, value in metrics:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for span in self.spans:
+                labels = f'stage="{span.stage}",source="{span.source}",table="{span.table or ""}"'
+                lines.append(f"{name}{{{labels}}} {round(value(span), 6)}")
+
+        peaks = [span.peak_rss_bytes for span in self.spans if span.peak_rss_bytes]
+        if peaks:
+            lines += ["# HELP etl_peak_rss_bytes Peak resident memory of the pipeline process",
+                      "# TYPE etl_peak_rss_bytes gauge", f"etl_peak_rss_bytes {max(peaks)}"]
+
+        # The textfile collector may read at any time; replace the file atomically
+        tmp_path = path.with_suffix('.prom.tmp')
+        tmp_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        os.replace(tmp_path, path)
+        return path
+
+    def write_to_metadata(self, engine, load_mode: str = None):
+        """Insert one etl_metadata row per span"""
+        from .models import LoadMetadata, ensure_columns
+
+        ensure_columns(engine, LoadMetadata.__table__)
+        rows = [{
+            'table_name': span.table or span.source,
+            'stage': span.stage,
+            'records_processed': span.rows,
+            'records_loaded': span.rows if span.stage == 'load' else None,
+            'status': span.status,
+            'load_mode': load_mode.upper() if load_mode else None,
+            'wall_seconds': span.wall_seconds,
+            'cpu_seconds': span.cpu_seconds,
+            'bytes_processed': span.bytes,
+            'rows_per_second': span.rows_per_second,
+            'peak_rss_bytes': span.peak_rss_bytes,
+            'start_time': span.start_time,
+            'end_time': span.end_time,
+            'error_message': span.error
+        } for span in self.spans]
+        if rows:
+            with engine.begin() as conn:
+                conn.execute(LoadMetadata.__table__.insert(), rows)
+
+    def export(self, engine=None, load_mode: str = None):
+        """Export to JSON lines, Prometheus and, with an engine, etl_metadata; failures are only logged"""
+        for target, write in (('JSON lines', self.export_jsonl), ('Prometheus', self.export_prometheus)):
+            try:
+                self.logger.info(f"Metrics written to {write()}")
+            except Exception as e:
+                self.logger.warning(f"Could not write {target} metrics: {e}")
+        if engine is not None:
+            try:
+                self.write_to_metadata(engine, load_mode)
+            except Exception as e:
+                self.logger.warning(f"Could not write metrics to etl_metadata: {e}")
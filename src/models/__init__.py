@@ -1,7 +1,7 @@
 """
 Data models and table definitions
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, Text, Boolean, Index, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
@@ -12,7 +12,7 @@ class ContainerData(Base):
     __tablename__ = 'containers'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    # Add container-specific columns based on your data
+    # Source columns of raw_container are typed from a profile of each load (models.ddl)
     source_file = Column(String(255))
     loaded_at = Column(DateTime, default=func.now())
     created_at = Column(DateTime, default=func.now())
@@ -22,7 +22,7 @@ class ConsignorData(Base):
     __tablename__ = 'consignors'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    # Add consignor-specific columns based on your data
+    # Source columns of raw_consignor are typed from a profile of each load (models.ddl)
     source_file = Column(String(255))
     loaded_at = Column(DateTime, default=func.now())
     created_at = Column(DateTime, default=func.now())
@@ -32,7 +32,7 @@ class EUMRVData(Base):
     __tablename__ = 'eu_mrv_shipping'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    # Dynamic columns will be created based on CSV structure
+    # Source columns of raw_eu_mrv are typed from a profile of each load (models.ddl)
     source_file = Column(String(255))
     total_columns_in_source = Column(Integer)
     processed_date = Column(DateTime, default=func.now())
@@ -47,8 +47,78 @@ class LoadMetadata(Base):
     source_file = Column(String(500))
     records_processed = Column(Integer)
     records_loaded = Column(Integer)
-    status = Column(String(50))  # SUCCESS, FAILED, PARTIAL
+    status = Column(String(50))  # SUCCESS, FAILED, PARTIAL, SKIPPED; checkpoints: COMMITTED, COMPLETE, INVALID
+    load_mode = Column(String(20))  # FULL, INCREMENTAL
+    source_hash = Column(String(64))  # SHA-256 of the source file
+    rows_inserted = Column(Integer)
+    rows_updated = Column(Integer)
+    rows_deleted = Column(Integer)
+    stage = Column(String(20))  # extract, transform, load (metrics spans), checkpoint (committed chunks)
+    chunk_index = Column(Integer)
+    chunk_offset = Column(BigInteger)  # first row of a committed chunk in the target table
+    chunk_hash = Column(String(64))  # SHA-256 over the row hashes of a committed chunk
+    chunk_layout = Column(String(255))  # how the source was split into chunks, e.g. chunksize=10000
+    wall_seconds = Column(Float)
+    cpu_seconds = Column(Float)
+    bytes_processed = Column(BigInteger)
+    rows_per_second = Column(Float)
+    peak_rss_bytes = Column(BigInteger)
     start_time = Column(DateTime)
     end_time = Column(DateTime)
     error_message = Column(Text)
     created_at = Column(DateTime, default=func.now())
+
+class RowFingerprint(Base):
+    """Content hash per business key of the last loaded version of a row"""
+    __tablename__ = 'etl_row_fingerprints'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String(255), nullable=False)
+    business_key = Column(String(500), nullable=False)
+    row_hash = Column(String(16), nullable=False)
+    updated_at = Column(DateTime, default=func.now())
+    
+    __table_args__ = (Index('ix_etl_row_fingerprints_table_key', 'table_name', 'business_key'),)
+
+class RejectedRow(Base):
+    """Row quarantined by a data quality rule instead of being loaded"""
+    __tablename__ = 'etl_rejects'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String(20))
+    table_name = Column(String(255), nullable=False)
+    failed_rules = Column(String(500))
+    row_data = Column(Text)  # the rejected row as JSON
+    rejected_at = Column(DateTime, default=func.now())
+    
+    __table_args__ = (Index('ix_etl_rejects_table_run', 'table_name', 'run_id'),)
+
+class QualityResult(Base):
+    """Pass and fail counts of one data quality rule in one run"""
+    __tablename__ = 'etl_quality_results'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String(20))
+    table_name = Column(String(255), nullable=False)
+    rule_name = Column(String(100), nullable=False)
+    severity = Column(String(10))  # reject, warn
+    rows_passed = Column(Integer)
+    rows_failed = Column(Integer)
+    created_at = Column(DateTime, default=func.now())
+
+
+def ensure_columns(engine, table):
+    """Create a table, or add the columns an older version of its model did not have"""
+    table.create(engine, checkfirst=True)
+    existing = {col['name'] for col in inspect(engine).get_columns(table.name)}
+    missing = [col for col in table.columns if col.name not in existing]
+    if not missing:
+        return
+    
+    preparer = engine.dialect.identifier_preparer
+    with engine.begin() as conn:
+        for col in missing:
+            conn.execute(text(
+                f"ALTER TABLE {preparer.quote(table.name)} "
+                f"ADD {preparer.quote(col.name)} {col.type.compile(engine.dialect)}"
+            ))
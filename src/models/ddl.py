@@ -0,0 +1,271 @@
+"""
+Right-sized DDL for RAW tables, built from a profile of the data being loaded
+"""
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+
+from . import ConsignorData, ContainerData, EUMRVData
+
+logger = logging.getLogger(__name__)
+
+# Text columns get the smallest of these widths that fits; longer text becomes NVARCHAR(max)
+TEXT_WIDTHS = (16, 32, 64, 128, 255, 500, 1000, 2000, 4000)
+
+# Width of text columns without any value yet
+DEFAULT_TEXT_WIDTH = 255
+
+INTEGER_TYPES = (
+    (np.iinfo(np.int16), sa.SmallInteger),
+    (np.iinfo(np.int32), sa.Integer),
+    (np.iinfo(np.int64), sa.BigInteger),
+)
+
+# Models that declare the types of the metadata columns of a RAW table
+RAW_TABLE_MODELS = {
+    'raw_container': ContainerData,
+    'raw_consignor': ConsignorData,
+    'raw_eu_mrv': EUMRVData,
+}
+
+
+@dataclass
+class ColumnProfile:
+    """What a column holds: its kind, null count and value range or maximum text length"""
+    name: str
+    kind: str  # boolean, integer, float, datetime, text
+    nulls: int = 0
+    max_length: int = 0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    double: bool = True  # float64 rather than float32
+
+
+def profile_column(series: pd.Series) -> ColumnProfile:
+    """Profile one column with vectorized reductions"""
+    name, dtype = str(series.name), series.dtype
+    nulls = int(series.isna().sum())
+    if pd.api.types.is_bool_dtype(dtype):
+        return ColumnProfile(name, 'boolean', nulls)
+    if pd.api.types.is_integer_dtype(dtype):
+        present = series.dropna()
+        return ColumnProfile(name, 'integer', nulls,
+                             minimum=int(present.min()) if len(present) else None,
+                             maximum=int(present.max()) if len(present) else None)
+    if pd.api.types.is_float_dtype(dtype):
+        return ColumnProfile(name, 'float', nulls, double=dtype != np.float32)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return ColumnProfile(name, 'datetime', nulls)
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Only the categories need measuring, not every row
+        lengths = dtype.categories.astype(str).str.len()
+    else:
+        lengths = series.dropna().astype(str).str.len()
+    return ColumnProfile(name, 'text', nulls, max_length=int(lengths.max()) if len(lengths) else 0)
+
+
+def profile_frame(df: pd.DataFrame) -> Dict[str, ColumnProfile]:
+    """Profile every column of a frame"""
+    return {str(col): profile_column(df[col]) for col in df.columns}
+
+
+def text_width(max_length: int) -> Optional[int]:
+    """Smallest standard width that holds max_length characters, None for unbounded text"""
+    if max_length == 0:
+        return DEFAULT_TEXT_WIDTH
+    return next((width for width in TEXT_WIDTHS if width >= max_length), None)
+
+
+def sql_type(profile: ColumnProfile) -> sa.types.TypeEngine:
+    """Narrowest SQL type that holds every value of the profile"""
+    if profile.kind == 'boolean':
+        return sa.Boolean()
+    if profile.kind == 'integer':
+        if profile.minimum is None:
+            return sa.Integer()
+        for info, type_ in INTEGER_TYPES:
+            if info.min <= profile.minimum and profile.maximum <= info.max:
+                return type_()
+        return sa.BigInteger()
+    if profile.kind == 'float':
+        return sa.Float(precision=53 if profile.double else 24)
+    if profile.kind == 'datetime':
+        return sa.DateTime()
+    width = text_width(profile.max_length)
+    return sa.Unicode(width) if width else sa.UnicodeText()
+
+
+def declared_types(table_name: str) -> Dict[str, sa.types.TypeEngine]:
+    """Column types declared by the model of a RAW table"""
+    model = RAW_TABLE_MODELS.get(table_name)
+    if model is None:
+        return {}
+    return {col.name: col.type for col in model.__table__.columns if not col.primary_key}
+
+
+def build_table(df: pd.DataFrame, table_name: str, business_keys: Sequence[str] = None,
+                sql_types: Dict[str, sa.types.TypeEngine] = None, physical_name: str = None) -> sa.Table:
+    """Table definition for a frame with profiled column types
+
+    Types declared by the table's model and in ``sql_types`` take precedence
+    over profiled ones. Business keys get a (non-unique) clustered index, since
+    RAW data may still contain duplicate keys. ``physical_name`` names a shadow
+    table that is loaded in place of table_name and swapped in later.
+    """
+    overrides = {**declared_types(table_name), **(sql_types or {})}
+    business_keys = list(business_keys or [])
+    profiles = profile_frame(df)
+    columns = []
+    for name, profile in profiles.items():
+        type_ = overrides.get(name, sql_type(profile))
+        if name in business_keys and isinstance(type_, sa.Integer) and integer_rank(type_) == 0:
+            # Indexed columns are hard to widen later, so keys start at INT
+            type_ = sa.Integer()
+        columns.append(sa.Column(name, type_, nullable=True))
+    table = sa.Table(physical_name or table_name, sa.MetaData(), *columns)
+
+    add_business_key_index(table, table_name, business_keys, shadow=physical_name is not None)
+    return table
+
+
+def add_business_key_index(table: sa.Table, table_name: str, business_keys: Sequence[str] = None,
+                           shadow: bool = False):
+    """Declare the clustered business key index of a table when it has all key columns"""
+    business_keys = list(business_keys or [])
+    if not business_keys or any(key not in table.c for key in business_keys):
+        return
+    index_name = f"ix_{table_name}_business_key"
+    if shadow:
+        # A swapped in table keeps its index name, and SQLite index names are unique per database
+        index_name = f"{index_name}_{uuid.uuid4().hex[:8]}"
+    sa.Index(index_name[:128], *(table.c[key] for key in business_keys), mssql_clustered=True)
+
+
+def create_table(engine: sa.Engine, table: sa.Table, replace: bool = True, indexes: bool = True):
+    """Create a table, dropping an existing one first when replace is set
+
+    Without ``indexes`` only the table is created; ``create_indexes`` adds them
+    once the data is loaded.
+    """
+    with engine.begin() as conn:
+        if replace:
+            table.drop(conn, checkfirst=True)
+        elif sa.inspect(conn).has_table(table.name):
+            return
+        conn.execute(sa.schema.CreateTable(table))
+        if indexes:
+            create_indexes(conn, table)
+    logger.info(f"Created {table.name} with {len(table.columns)} columns")
+
+
+def create_indexes(conn, table: sa.Table):
+    """Build the indexes of a table"""
+    for index in table.indexes:
+        index.create(conn)
+
+
+def integer_rank(type_: sa.types.TypeEngine) -> int:
+    """0 for SMALLINT, 1 for INT, 2 for BIGINT"""
+    if isinstance(type_, sa.BigInteger):
+        return 2
+    return 0 if isinstance(type_, sa.SmallInteger) else 1
+
+
+# Characters a value of a non-text type needs once its column has become text
+TEXT_LENGTHS = ((sa.Boolean, 5), (sa.Integer, 20), (sa.Float, 24), (sa.DateTime, 26))
+
+
+def _text_length(type_: sa.types.TypeEngine) -> Optional[int]:
+    """Characters the values of a type need as text, None for unbounded text"""
+    if isinstance(type_, sa.String):
+        return type_.length
+    return next((length for class_, length in TEXT_LENGTHS if isinstance(type_, class_)), DEFAULT_TEXT_WIDTH)
+
+
+def _float_precision(type_: sa.types.TypeEngine) -> int:
+    """Float precision that holds every value of a boolean, integer or float type"""
+    if isinstance(type_, sa.Float):
+        return type_.precision or 53
+    if isinstance(type_, sa.Integer) and integer_rank(type_) > 0:
+        return 53
+    return 24
+
+
+def _is_number(type_: sa.types.TypeEngine) -> bool:
+    return isinstance(type_, (sa.Boolean, sa.Integer, sa.Float))
+
+
+def widened_type(current: sa.types.TypeEngine, needed: sa.types.TypeEngine) -> Optional[sa.types.TypeEngine]:
+    """Type that holds the values of both current and needed, None when current already does
+
+    Numbers promote BOOLEAN -> SMALLINT -> INT -> BIGINT -> FLOAT; a number or
+    datetime meeting text or a datetime meeting a number becomes text wide
+    enough for both. Other type pairs are left alone.
+    """
+    if isinstance(current, sa.String) or isinstance(needed, sa.String):
+        lengths = [_text_length(current), _text_length(needed)]
+        if isinstance(current, sa.String) and (current.length is None or
+                                               all(length is not None and length <= current.length
+                                                   for length in lengths)):
+            return None
+        width = None if None in lengths else text_width(max(lengths))
+        return sa.Unicode(width) if width else sa.UnicodeText()
+
+    if _is_number(current) and _is_number(needed):
+        if isinstance(current, sa.Float) or isinstance(needed, sa.Float):
+            precision = max(_float_precision(current), _float_precision(needed))
+            if isinstance(current, sa.Float) and precision <= _float_precision(current):
+                return None
+            return sa.Float(precision=precision)
+        if isinstance(needed, sa.Boolean):
+            return None
+        if isinstance(current, sa.Boolean) or integer_rank(needed) > integer_rank(current):
+            return needed
+        return None
+
+    if (isinstance(current, sa.DateTime) and _is_number(needed)) or \
+            (_is_number(current) and isinstance(needed, sa.DateTime)):
+        return sa.Unicode(text_width(max(_text_length(current), _text_length(needed))))
+    return None
+
+
+def widen_columns(engine: sa.Engine, table: sa.Table, df: pd.DataFrame) -> List[str]:
+    """Alter the columns of table that cannot hold a further chunk of data
+
+    Columns are promoted to a type that holds both their values and the chunk's
+    (see ``widened_type``). SQLite does not enforce declared types, so only the
+    table definition is updated there.
+    """
+    profiles = profile_frame(df)
+    widened = {}
+    for name, profile in profiles.items():
+        if name not in table.c:
+            continue
+        column = table.c[name]
+        type_ = widened_type(column.type, sql_type(profile))
+        if type_ is None:
+            continue
+        widened[name], column.type = column.type, type_
+
+    if widened and engine.dialect.name in ('mssql', 'postgresql'):
+        preparer = engine.dialect.identifier_preparer
+        type_keyword = '' if engine.dialect.name == 'mssql' else 'TYPE '
+        with engine.begin() as conn:
+            for name in widened:
+                type_ = table.c[name].type.compile(engine.dialect)
+                # PostgreSQL only converts between type families with an explicit cast, booleans only to INT
+                boolean = isinstance(widened[name], sa.Boolean) and not isinstance(table.c[name].type, sa.String)
+                via = '::integer' if boolean else ''
+                using = f" USING {preparer.quote(name)}{via}::{type_}" if engine.dialect.name == 'postgresql' else ''
+                conn.execute(sa.text(
+                    f"ALTER TABLE {preparer.quote(table.name)} ALTER COLUMN {preparer.quote(name)} "
+                    f"{type_keyword}{type_}{using}"
+                ))
+    if widened:
+        logger.info(f"Widened columns of {table.name}: {list(widened)}")
+    return list(widened)
@@ -0,0 +1,125 @@
+"""
+Star schema of the Kramse data warehouse (Kramse_DWH)
+"""
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Boolean, Index
+from sqlalchemy.ext.declarative import declarative_base
+
+# Separate metadata, so creating RAW tables never creates warehouse tables
+DWHBase = declarative_base()
+
+# Surrogate key of the "Unknown" member facts point to when a lookup fails
+UNKNOWN_KEY = -1
+
+
+class DimDate(DWHBase):
+    """Calendar dimension keyed by yyyymmdd"""
+    __tablename__ = 'dim_date'
+
+    date_key = Column(Integer, primary_key=True, autoincrement=False)
+    full_date = Column(Date)
+    year = Column(Integer)
+    quarter = Column(Integer)
+    month = Column(Integer)
+    month_name = Column(String(20))
+    day = Column(Integer)
+    day_of_week = Column(Integer)  # 1 = Monday
+    day_name = Column(String(20))
+    is_weekend = Column(Boolean)
+
+class DimConsignor(DWHBase):
+    """Consignor dimension; discount changes create a new version (SCD type 2)"""
+    __tablename__ = 'dim_consignor'
+
+    consignor_sk = Column(Integer, primary_key=True, autoincrement=False)
+    consignor_id = Column(Integer)
+    consignor_name = Column(String(100))
+    city = Column(String(100))
+    country = Column(String(100))
+    discount_pct = Column(Float)
+    valid_from = Column(DateTime)
+    valid_to = Column(DateTime)
+    is_current = Column(Boolean)
+
+    __table_args__ = (Index('ix_dim_consignor_current', 'consignor_id', 'is_current'),)
+
+class DimContainerType(DWHBase):
+    """Container type dimension; price changes create a new version (SCD type 2)"""
+    __tablename__ = 'dim_container_type'
+
+    container_type_sk = Column(Integer, primary_key=True, autoincrement=False)
+    container_type_id = Column(Integer)
+    type_name = Column(String(50))
+    refrigerated = Column(Boolean)
+    power_flag = Column(String(20))
+    length_m = Column(Float)
+    cubes_m3 = Column(Float)
+    euro_price_per_km = Column(Float)
+    valid_from = Column(DateTime)
+    valid_to = Column(DateTime)
+    is_current = Column(Boolean)
+
+    __table_args__ = (Index('ix_dim_container_type_current', 'container_type_id', 'is_current'),)
+
+class DimShip(DWHBase):
+    """Ships from the TPS database and the EU MRV register, matched on name"""
+    __tablename__ = 'dim_ship'
+
+    ship_sk = Column(Integer, primary_key=True, autoincrement=False)
+    ship_key = Column(String(20))  # IMO<number>, or TPS<id> for ships without an MRV record
+    imo_number = Column(Integer)
+    tps_ship_id = Column(Integer)
+    ship_name = Column(String(100))
+    ship_type = Column(String(100))
+    flag_country = Column(String(100))
+    max_teu = Column(Integer)
+    speed_knots = Column(Float)
+    length_m = Column(Float)
+    width_m = Column(Float)
+
+    __table_args__ = (Index('ix_dim_ship_key', 'ship_key'),)
+
+class DimPort(DWHBase):
+    """Port dimension"""
+    __tablename__ = 'dim_port'
+
+    port_sk = Column(Integer, primary_key=True, autoincrement=False)
+    port_id = Column(Integer)
+    port_name = Column(String(100))
+    country = Column(String(100))
+    distance_from_oslo = Column(Float)
+    distance_from_piraeus = Column(Float)
+
+    __table_args__ = (Index('ix_dim_port_id', 'port_id'),)
+
+class FactShipment(DWHBase):
+    """One row per shipment line: a range of containers of one type on a voyage"""
+    __tablename__ = 'fact_shipment'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    shipment_id = Column(Integer)
+    voyage_id = Column(Integer)
+    container_nr = Column(String(50))
+    item_id = Column(Integer)
+    date_key = Column(Integer)
+    ship_sk = Column(Integer)
+    consignor_sk = Column(Integer)
+    container_type_sk = Column(Integer)
+    port_from_sk = Column(Integer)
+    port_to_sk = Column(Integer)
+    container_count = Column(Integer)
+    distance = Column(Float)
+    revenue_eur = Column(Float)
+
+class FactEmission(DWHBase):
+    """One row per ship and EU MRV reporting period"""
+    __tablename__ = 'fact_emission'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ship_sk = Column(Integer)
+    date_key = Column(Integer)  # last day of the reporting period
+    reporting_period = Column(Integer)
+    total_fuel_consumption_t = Column(Float)
+    total_co2_emissions_t = Column(Float)
+    time_at_sea_hours = Column(Float)
+    technical_efficiency_value = Column(Float)
+    technical_efficiency_type = Column(String(16))
@@ -1,44 +1,136 @@
 """
 Main ETL pipeline orchestrator that coordinates all components
 """
-import os
 import logging
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union
 from pathlib import Path
+import pandas as pd
 
-from ..database import DatabaseManager
+from ..config import DEFAULT_CONFIG_PATH, SourceConfig, load_config, source_size
+from ..database import db_manager
+from ..data_quality import DataQualityEngine
+from ..logging import MetricsCollector, Span, frame_bytes, measure
 from ..extractors import ContainerExtractor, ConsignorExtractor, EUMRVExtractor, AccessExtractor
+from ..extractors.parsing import PARSE_SCHEMAS
 from ..transformers import ContainerTransformer, ConsignorTransformer, EUMRVTransformer
-from ..loaders import BatchLoader, EUMRVLoader
+from ..loaders import BatchLoader, EUMRVLoader, IncrementalLoader
+from ..staging import StagingManager
+from ..dwh import WarehouseBuilder
+from ..aio import DEFAULT_QUEUE_SIZE
+from .orchestrator import AsyncScheduler, DAGScheduler, Task
+
+# Extractor and transformer per source kind (see src/config.py)
+EXTRACTORS = {
+    'container': ContainerExtractor,
+    'consignor': ConsignorExtractor,
+    'eu_mrv': EUMRVExtractor,
+    'access': AccessExtractor,
+}
+TRANSFORMERS = {
+    'container': ContainerTransformer,
+    'consignor': ConsignorTransformer,
+    'eu_mrv': EUMRVTransformer,
+}
+
+
+def extract_and_transform(extractor, transformer, source_path: str, source_name: str = None):
+    """Extract a source and apply its transformer; runs in a worker process
+    
+    Returns (raw_data, transformed_data, spans) with the extract and transform
+    spans measured in the worker.
+    """
+    source_name = source_name or extractor.__class__.__name__
+    with measure('extract', source_name) as extract_span:
+        raw_data = extractor.extract_cached(source_path)
+        extract_span.rows = 0 if raw_data is None else len(raw_data)
+        extract_span.bytes = source_size(source_path)
+    
+    if raw_data is None or raw_data.empty:
+        return raw_data, None, [extract_span]
+    
+    with measure('transform', source_name) as transform_span:
+        if transformer is not None:
+            transformer.reset()
+        transformed_data = transformer.transform(raw_data) if transformer is not None else raw_data
+        transform_span.rows = len(transformed_data)
+        transform_span.bytes = frame_bytes(transformed_data)
+    return raw_data, transformed_data, [extract_span, transform_span]
+
+
+def extract_access(extractor, source_path: str):
+    """Extract all Access tables; runs in a worker process"""
+    return extractor.extract(source_path)
+
 
 class ETLPipeline:
     """Main ETL pipeline orchestrator"""
     
-    def __init__(self, config_path: str = "config/database.yaml"):
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH, load_mode: str = None):
         """Initialize pipeline with configuration"""
         self.config_path = config_path
-        self.db_manager = DatabaseManager(config_path)
+        self.config = load_config(config_path)
+        self.load_mode = (load_mode or self.config.pipeline.load_mode).lower()
+        self.db_manager = db_manager
         self.logger = self._setup_logging()
+        self.metrics = MetricsCollector()
+        self.quality = DataQualityEngine()
         
-        # Initialize components
-        self.extractors = {
-            'container': ContainerExtractor(),
-            'consignor': ConsignorExtractor(), 
-            'eu_mrv': EUMRVExtractor(),
-            'access': AccessExtractor()
-        }
-        
-        self.transformers = {
-            'container': ContainerTransformer(),
-            'consignor': ConsignorTransformer(),
-            'eu_mrv': EUMRVTransformer()
-        }
+        # Initialize components, one extractor and transformer per configured source
+        self.sources = self.config.data_sources
+        self.extractors = {name: self._build_extractor(source) for name, source in self.sources.items()}
+        self.transformers = {name: TRANSFORMERS[source.kind]() for name, source in self.sources.items()
+                             if source.kind in TRANSFORMERS}
         
         self.loaders = {
             'batch': BatchLoader(config_path),
-            'eu_mrv': EUMRVLoader(config_path)
+            'eu_mrv': EUMRVLoader(config_path),
+            'incremental': IncrementalLoader(config_path)
         }
     
+    @staticmethod
+    def _build_extractor(source: SourceConfig):
+        """Extractor of a source's kind, with the format, parse schema and parallelism of the source"""
+        extractor = EXTRACTORS[source.kind](source.path)
+        extractor.source_config['max_workers'] = source.parallelism
+        if source.kind == 'access':
+            return extractor
+        if source.partition_mb is not None:
+            extractor.source_config['partition_bytes'] = int(source.partition_mb * 2**20)
+        
+        extractor.source_config['delimiter'] = source.delimiter
+        if source.parse_schema is not None:
+            if source.parse_schema not in PARSE_SCHEMAS:
+                raise ValueError(f"Unknown parse schema {source.parse_schema!r}, "
+                                 f"expected one of {', '.join(PARSE_SCHEMAS)}")
+            extractor.source_config['parse_schema'] = PARSE_SCHEMAS[source.parse_schema]
+        return extractor
+    
+    def _kind(self, source_name: str) -> str:
+        """Source kind, which selects the data quality rules of a source"""
+        source = self.sources.get(source_name)
+        return source.kind if source is not None else source_name
+    
+    def _data_sources(self) -> Dict[str, Dict[str, Any]]:
+        """Run settings of the configured file sources"""
+        data_sources = {}
+        for name, source in self.config.file_sources().items():
+            data_sources[name] = {
+                'source_path': source.path,
+                'table_name': source.table_name,
+                'loader': source.loader,
+                'business_keys': list(source.business_keys),
+                'depends_on': list(source.depends_on)
+            }
+            if source.chunksize:
+                data_sources[name]['chunksize'] = source.chunksize
+        return data_sources
+    
+    def _access_path(self) -> Optional[str]:
+        source = self.config.access_source()
+        return source.path if source is not None else None
+    
     def _setup_logging(self) -> logging.Logger:
         """Setup logging for pipeline"""
         logger = logging.getLogger('etl_pipeline')
@@ -65,29 +157,82 @@ class ETLPipeline:
         
         return logger
     
-    def run_full_pipeline(self) -> Dict[str, Any]:
-        """Run complete ETL pipeline for all data sources"""
-        self.logger.info("Starting full ETL pipeline")
+    def run_full_pipeline(self, parallel: bool = True, staging: bool = False,
+                          warehouse: bool = False, asynchronous: bool = False) -> Dict[str, Any]:
+        """Run complete ETL pipeline for all data sources, optionally on to staging and the warehouse
+        
+        ``asynchronous`` runs the sources on an asyncio event loop, with streamed
+        sources reading their next chunk while the current one is loaded.
+        """
+        mode = 'async' if asynchronous else 'parallel' if parallel else 'sequential'
+        self.logger.info(f"Starting full ETL pipeline ({mode})")
         results = {}
+        self.metrics = MetricsCollector()
+        self.quality = DataQualityEngine()
         
-        # Data source configurations
-        data_sources = {
-            'container': {
-                'source_path': 'data/Container v3.txt',
-                'table_name': 'raw_container',
-                'loader': 'batch'
-            },
-            'consignor': {
-                'source_path': 'data/Consignor.csv',
-                'table_name': 'raw_consignor',
-                'loader': 'batch'
-            },
-            'eu_mrv': {
-                'source_path': 'data/2016-EU MRV Publication of information v5.csv',
-                'table_name': 'raw_eu_mrv',
-                'loader': 'eu_mrv'
-            }
+        # Data sources from the data_sources section of the configuration
+        data_sources = self._apply_load_mode(self._data_sources())
+        self._register_business_keys(data_sources)
+        
+        try:
+            if parallel or asynchronous:
+                results = self._run_scheduled(data_sources, self._access_path(), asynchronous)
+            else:
+                results = self._run_sequential(data_sources, self._access_path())
+            if staging:
+                results['staging'] = self.promote_to_staging()
+            if warehouse:
+                results['warehouse'] = self.build_warehouse()
+        finally:
+            try:
+                self.logger.info(f"Connection pool metrics: {self.db_manager.get_pool_metrics()}")
+                self.logger.info(f"Stage totals: {self.metrics.summary()}")
+                self.logger.info(f"Data quality: {self.quality.summary()}")
+                self._export_run_results()
+            finally:
+                self.db_manager.close_all()
+        
+        results['data_quality'] = self.quality.summary()
+        self.logger.info("Full ETL pipeline completed")
+        return results
+    
+    def _export_run_results(self):
+        """Write stage metrics and quality results to RAW
+        
+        Failures are logged rather than raised, so they neither hide an error of
+        the run itself nor keep the engines from being disposed.
+        """
+        exports = {
+            'stage metrics': lambda engine: self.metrics.export(engine, self.load_mode),
+            'data quality results': self.quality.export,
         }
+        for description, export in exports.items():
+            try:
+                export(self.db_manager.get_engine('Kramse_RAW'))
+            except Exception as e:
+                self.logger.error(f"Failed to export {description}: {e}")
+    
+    def promote_to_staging(self, mode: str = None) -> Dict[str, Any]:
+        """Move all RAW tables into Kramse_STAGING on the database server"""
+        self.logger.info("Promoting RAW tables to staging")
+        try:
+            return StagingManager(metrics=self.metrics).promote_all(mode)
+        except Exception as e:
+            self.logger.error(f"Failed to promote RAW tables to staging: {e}")
+            return {'status': 'failed', 'error': str(e)}
+    
+    def build_warehouse(self) -> Dict[str, Any]:
+        """Load the Kramse_DWH dimensions and facts from staging"""
+        self.logger.info("Building warehouse from staging")
+        try:
+            return WarehouseBuilder(metrics=self.metrics).build()
+        except Exception as e:
+            self.logger.error(f"Failed to build warehouse: {e}")
+            return {'status': 'failed', 'error': str(e)}
+    
+    def _run_sequential(self, data_sources: Dict[str, Dict[str, Any]], access_path: str) -> Dict[str, Any]:
+        """Run all sources one after another"""
+        results = {}
         
         # Process each data source
         for source_name, config in data_sources.items():
@@ -96,7 +241,8 @@ class ETLPipeline:
                     source_name=source_name,
                     source_path=config['source_path'],
                     table_name=config['table_name'],
-                    loader_type=config['loader']
+                    loader_type=config['loader'],
+                    chunksize=config.get('chunksize')
                 )
                 results[source_name] = result
                 
@@ -105,42 +251,210 @@ class ETLPipeline:
                 results[source_name] = {'status': 'failed', 'error': str(e)}
         
         # Process Access database separately
+        if access_path is None:
+            return results
         try:
-            access_result = self.process_access_database()
+            access_result = self.process_access_database(access_path)
             results['access'] = access_result
         except Exception as e:
             self.logger.error(f"Failed to process Access database: {e}")
             results['access'] = {'status': 'failed', 'error': str(e)}
         
-        self.logger.info("Full ETL pipeline completed")
         return results
     
-    def process_data_source(self, source_name: str, source_path: str, table_name: str, loader_type: str) -> Dict[str, Any]:
+    def process_data_source(self, source_name: str, source_path: str, table_name: str, loader_type: str,
+                            chunksize: int = None) -> Dict[str, Any]:
         """Process a single data source through extract-transform-load"""
         self.logger.info(f"Processing {source_name} from {source_path}")
         
+        skipped = self._skip_if_unchanged(table_name, source_path, loader_type)
+        if skipped:
+            return skipped
+        
+        if chunksize:
+            return self.process_data_source_streaming(source_name, source_path, table_name, loader_type, chunksize)
+        
+        try:
+            extracted = extract_and_transform(
+                self.extractors[source_name], self.transformers.get(source_name), source_path, source_name
+            )
+            return self._load_source(source_name, table_name, loader_type, extracted, source_path)
+            
+        except Exception as e:
+            self.logger.error(f"Error processing {source_name}: {e}")
+            return {'status': 'failed', 'error': str(e)}
+    
+    def _transformed_chunks(self, source_name: str, source_path: str, table_name: str, chunksize: int,
+                            counts: Dict[str, int], spans: Dict[str, Span]) -> Iterator[pd.DataFrame]:
+        """Extract, transform and validate a source chunk by chunk, timing each stage into spans"""
+        extractor = self.extractors[source_name]
+        transformer = self.transformers.get(source_name)
+        raw_engine = self.db_manager.get_engine('Kramse_RAW')
+        if transformer is not None:
+            # Column types are inferred per stream, not carried over from an earlier run
+            transformer.reset()
+        chunks = iter(extractor.extract_chunks(source_path, chunksize))
+        while True:
+            with measure('extract', source_name) as extract_span:
+                chunk = next(chunks, None)
+                extract_span.rows = 0 if chunk is None else len(chunk)
+            spans['extract'].merge(extract_span)
+            if chunk is None:
+                return
+            counts['extracted'] += len(chunk)
+            
+            with measure('transform', source_name) as transform_span:
+                chunk = transformer.transform(chunk) if transformer is not None else chunk
+                chunk = self.quality.apply(chunk, self._kind(source_name), table_name, raw_engine)
+                transform_span.rows, transform_span.bytes = len(chunk), frame_bytes(chunk)
+            spans['transform'].merge(transform_span)
+            yield chunk
+    
+    def _streaming_result(self, source_name: str, table_name: str, extracted: int, loaded: int) -> Dict[str, Any]:
+        if extracted == 0:
+            return {'status': 'failed', 'reason': 'No data extracted'}
+        
+        self.logger.info(f"Streamed {extracted} records from {source_name}")
+        return {
+            'status': 'success',
+            'extracted_records': extracted,
+            'loaded_records': loaded,
+            'table_name': table_name
+        }
+    
+    def process_data_source_streaming(self, source_name: str, source_path: str, table_name: str,
+                                      loader_type: str, chunksize: int) -> Dict[str, Any]:
+        """Stream a data source chunk by chunk through extract-transform-load"""
+        self.logger.info(f"Streaming {source_name} in chunks of {chunksize} rows")
+        
+        try:
+            counts = {'extracted': 0}
+            spans = {stage: Span(stage, source_name) for stage in ('extract', 'transform')}
+            chunks = self._transformed_chunks(source_name, source_path, table_name, chunksize, counts, spans)
+            
+            with measure('load', source_name, table_name) as load_span:
+                loaded_count = self.loaders[loader_type].load_chunks(
+                    chunks, table_name, source_path, self.extractors[source_name].chunk_layout(chunksize))
+                load_span.rows = loaded_count
+            
+            # load_chunks pulls the chunks, so its time includes extracting and transforming them
+            for span in spans.values():
+                load_span.wall_seconds -= span.wall_seconds
+                load_span.cpu_seconds -= span.cpu_seconds
+            spans['extract'].bytes = source_size(source_path)
+            self.metrics.add([spans['extract'], spans['transform'], load_span])
+            
+            return self._streaming_result(source_name, table_name, counts['extracted'], loaded_count)
+            
+        except Exception as e:
+            self.logger.error(f"Error processing {source_name}: {e}")
+            return {'status': 'failed', 'error': str(e)}
+    
+    async def process_data_source_async(self, source_name: str, source_path: str, table_name: str,
+                                        loader_type: str, chunksize: int,
+                                        queue_size: int = DEFAULT_QUEUE_SIZE) -> Dict[str, Any]:
+        """Stream a data source with the next chunk read and transformed while the current one is loaded"""
+        self.logger.info(f"Streaming {source_name} asynchronously in chunks of {chunksize} rows "
+                         f"({queue_size} chunks queued)")
+        
         try:
-            # Extract
-            extractor = self.extractors[source_name]
-            raw_data = extractor.extract(source_path)
+            loader = self.loaders[loader_type]
+            counts = {'extracted': 0}
+            spans = {stage: Span(stage, source_name) for stage in ('extract', 'transform')}
+            spans['load'] = Span('load', source_name, table_name)
+            chunks = self._transformed_chunks(source_name, source_path, table_name, chunksize, counts, spans)
+            
+            # Reads and writes run in different threads, so each chunk's load is timed on its own
+            def load_chunk(chunk: pd.DataFrame, target: str, if_exists: str) -> int:
+                with measure('load', source_name, table_name) as load_span:
+                    loaded = loader.load(chunk, target, if_exists)
+                    load_span.rows, load_span.bytes = loaded, frame_bytes(chunk)
+                spans['load'].merge(load_span)
+                return loaded
+            
+            loaded_count = await loader.load_chunks_async(chunks, table_name, queue_size, write_chunk=load_chunk,
+                                                          source_path=source_path,
+                                                          layout=self.extractors[source_name].chunk_layout(chunksize))
+            spans['extract'].bytes = source_size(source_path)
+            self.metrics.add(spans.values())
+            
+            return self._streaming_result(source_name, table_name, counts['extracted'], loaded_count)
+            
+        except Exception as e:
+            self.logger.error(f"Error processing {source_name}: {e}")
+            return {'status': 'failed', 'error': str(e)}
+    
+    def _apply_load_mode(self, data_sources: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Switch sources with business keys to the incremental loader when LOAD_MODE=incremental"""
+        if self.load_mode != 'incremental':
+            return data_sources
+        
+        incremental_loader = self.loaders['incremental']
+        business_keys = incremental_loader.config.setdefault('business_keys', {})
+        for config in data_sources.values():
+            if config.get('business_keys'):
+                # Change detection needs the full source, so incremental loads do not stream
+                config['loader'] = 'incremental'
+                config.pop('chunksize', None)
+                business_keys[config['table_name']] = config['business_keys']
+        return data_sources
+    
+    def _register_business_keys(self, data_sources: Dict[str, Dict[str, Any]]):
+        """Tell every loader the business keys of the tables it may create"""
+        for loader in self.loaders.values():
+            business_keys = loader.config.setdefault('business_keys', {})
+            for config in data_sources.values():
+                if config.get('business_keys'):
+                    business_keys[config['table_name']] = config['business_keys']
+    
+    def _skip_if_unchanged(self, table_name: str, source_path: str, loader_type: str) -> Dict[str, Any]:
+        """Result for an incremental source whose file did not change since its last load, else None"""
+        if loader_type != 'incremental':
+            return None
+        
+        loader = self.loaders['incremental']
+        try:
+            if not loader.source_unchanged(table_name, source_path):
+                return None
+            loader.record_skip(table_name, source_path)
+        except Exception as e:
+            self.logger.warning(f"Could not check fingerprint of {source_path}: {e}")
+            return None
+        
+        return {
+            'status': 'success',
+            'skipped': True,
+            'extracted_records': 0,
+            'loaded_records': 0,
+            'table_name': table_name
+        }
+    
+    def _load_source(self, source_name: str, table_name: str, loader_type: str, extracted,
+                     source_path: str = None) -> Dict[str, Any]:
+        """Load the output of extract_and_transform for a single data source"""
+        try:
+            raw_data, transformed_data, spans = extracted
+            self.metrics.add(spans)
             
             if raw_data is None or raw_data.empty:
                 return {'status': 'failed', 'reason': 'No data extracted'}
             
             self.logger.info(f"Extracted {len(raw_data)} records from {source_name}")
             
-            # Transform
-            if source_name in self.transformers:
-                transformer = self.transformers[source_name]
-                transformed_data = transformer.transform(raw_data)
-                self.logger.info(f"Transformed {source_name} data")
-            else:
-                transformed_data = raw_data
-                self.logger.info(f"No specific transformer for {source_name}, using raw data")
+            # Quarantine rows failing data quality rules instead of loading them
+            transformed_data = self.quality.apply(
+                transformed_data, self._kind(source_name), table_name, self.db_manager.get_engine('Kramse_RAW')
+            )
             
             # Load
             loader = self.loaders[loader_type]
-            loaded_count = loader.load(transformed_data, table_name)
+            with self.metrics.span('load', source_name, table_name) as load_span:
+                if loader_type == 'incremental':
+                    business_keys = loader.config['business_keys'][table_name]
+                    loaded_count = loader.load_incremental(transformed_data, table_name, business_keys, source_path)
+                else:
+                    loaded_count = loader.replace_table(transformed_data, table_name)
+                load_span.rows, load_span.bytes = loaded_count, frame_bytes(transformed_data)
             
             return {
                 'status': 'success',
@@ -153,33 +467,113 @@ class ETLPipeline:
             self.logger.error(f"Error processing {source_name}: {e}")
             return {'status': 'failed', 'error': str(e)}
     
-    def process_access_database(self) -> Dict[str, Any]:
+    def _run_scheduled(self, data_sources: Dict[str, Dict[str, Any]], access_path: str,
+                       asynchronous: bool = False) -> Dict[str, Any]:
+        """Run all sources as DAG tasks with parallel extract/transform and load"""
+        scheduler_class = AsyncScheduler if asynchronous else DAGScheduler
+        scheduler = scheduler_class(max_load_threads=self._connection_pool_size())
+        
+        for source_name, config in data_sources.items():
+            skipped = self._skip_if_unchanged(config['table_name'], config['source_path'], config['loader'])
+            if skipped:
+                scheduler.add_task(Task(name=source_name, extract=None, load=lambda _, result=skipped: result))
+                continue
+            
+            if config.get('chunksize') and asynchronous:
+                # Streaming sources keep chunks in flight between a reader and a writer thread
+                async def stream(_, name=source_name, cfg=config):
+                    return await self.process_data_source_async(
+                        name, cfg['source_path'], cfg['table_name'], cfg['loader'], cfg['chunksize']
+                    )
+                
+                scheduler.add_task(Task(name=source_name, extract=None, load=stream,
+                                        depends_on=config.get('depends_on', [])))
+                continue
+            
+            if config.get('chunksize'):
+                # Streaming sources overlap extract and load in a single load thread
+                scheduler.add_task(Task(
+                    name=source_name,
+                    extract=None,
+                    load=lambda _, name=source_name, cfg=config: self.process_data_source_streaming(
+                        name, cfg['source_path'], cfg['table_name'], cfg['loader'], cfg['chunksize']
+                    ),
+                    depends_on=config.get('depends_on', [])
+                ))
+                continue
+            
+            scheduler.add_task(Task(
+                name=source_name,
+                extract=extract_and_transform,
+                extract_args=(self.extractors[source_name], self.transformers.get(source_name), config['source_path'],
+                              source_name),
+                load=partial(self._load_source, source_name, config['table_name'], config['loader'],
+                             source_path=config['source_path']),
+                depends_on=config.get('depends_on', [])
+            ))
+        
+        if access_path is not None:
+            scheduler.add_task(Task(
+                name='access',
+                extract=extract_access,
+                extract_args=(self.extractors['access'], access_path),
+                load=self._load_access_tables
+            ))
+        
+        return scheduler.run()
+    
+    def _connection_pool_size(self) -> int:
+        """Size of the shared connection pool, used to bound concurrent loads"""
+        return self.db_manager.registry.pool_settings['pool_size']
+    
+    def process_access_database(self, source_path: str = None) -> Dict[str, Any]:
         """Process Access database with multiple tables"""
         self.logger.info("Processing Access database")
+        source_path = source_path or self._access_path()
         
         try:
-            extractor = self.extractors['access']
-            access_data = extractor.extract('data/KramseTPS v7.mdb')
+            # Tables are loaded as soon as they are extracted, overlapping extract and load
+            return self._load_access_tables(self.extractors['access'].iter_tables(source_path))
             
-            if not access_data:
-                return {'status': 'failed', 'reason': 'No Access data extracted'}
+        except Exception as e:
+            self.logger.error(f"Error processing Access database: {e}")
+            return {'status': 'failed', 'error': str(e)}
+    
+    def _load_access_tables(self, access_data: Union[Dict[str, Any], Iterable[Tuple[str, Any]]]) -> Dict[str, Any]:
+        """Load extracted Access tables concurrently, bounded by the extractor and pool sizes"""
+        try:
+            if isinstance(access_data, dict):
+                access_data = access_data.items()
             
-            results = {}
-            loader = self.loaders['batch']
-            
-            for table_name, df in access_data.items():
-                try:
-                    loaded_count = loader.load(df, f"raw_access_{table_name}")
-                    results[table_name] = {
-                        'status': 'success',
-                        'records': len(df),
-                        'loaded': loaded_count
-                    }
-                    self.logger.info(f"Loaded {loaded_count} records from Access table {table_name}")
-                    
-                except Exception as table_error:
-                    results[table_name] = {'status': 'failed', 'error': str(table_error)}
-                    self.logger.error(f"Failed to load Access table {table_name}: {table_error}")
+            max_workers = min(self.extractors['access'].source_config['max_workers'], self._connection_pool_size())
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                futures, waiting = {}, []
+                
+                def submit(table_name, df):
+                    # Validated before submitting, so the keys of a table exist before its children are checked
+                    df = self.quality.apply(df, 'access', f"raw_access_{table_name}",
+                                            self.db_manager.get_engine('Kramse_RAW'), table=table_name)
+                    self.quality.register_keys('access', table_name, df)
+                    futures[table_name] = pool.submit(self._load_access_table, table_name, df)
+                
+                def submit_ready():
+                    ready = [item for item in waiting if self.quality.references_ready('access', item[0])]
+                    while ready:
+                        for item in ready:
+                            waiting.remove(item)
+                            submit(*item)
+                        ready = [item for item in waiting if self.quality.references_ready('access', item[0])]
+                
+                for table_name, df in access_data:
+                    waiting.append((table_name, df))
+                    submit_ready()
+                # Tables whose referenced tables never arrived are checked without those rules
+                for item in list(waiting):
+                    submit(*item)
+                results = {table_name: future.result() for table_name, future in futures.items()}
+            
+            if not results:
+                return {'status': 'failed', 'reason': 'No Access data extracted'}
             
             return {'status': 'success', 'tables': results}
             
@@ -187,6 +581,29 @@ class ETLPipeline:
             self.logger.error(f"Error processing Access database: {e}")
             return {'status': 'failed', 'error': str(e)}
     
+    def _load_access_table(self, table_name: str, df) -> Dict[str, Any]:
+        """Load one Access table and report its extract and load times"""
+        if 'extract_span' in df.attrs:
+            self.metrics.add([Span.from_dict(df.attrs['extract_span'])])
+        
+        try:
+            with self.metrics.span('load', 'access', f"raw_access_{table_name}") as load_span:
+                loaded_count = self.loaders['batch'].replace_table(df, f"raw_access_{table_name}")
+                load_span.rows, load_span.bytes = loaded_count, frame_bytes(df)
+            load_seconds = round(load_span.wall_seconds, 4)
+            self.logger.info(f"Loaded {loaded_count} records from Access table {table_name} in {load_seconds:.3f}s")
+            return {
+                'status': 'success',
+                'records': len(df),
+                'loaded': loaded_count,
+                'extract_seconds': df.attrs.get('extract_seconds'),
+                'load_seconds': load_seconds
+            }
+            
+        except Exception as table_error:
+            self.logger.error(f"Failed to load Access table {table_name}: {table_error}")
+            return {'status': 'failed', 'error': str(table_error)}
+    
     def test_connections(self) -> bool:
         """Test all database connections"""
         return self.db_manager.test_connection('Kramse_RAW')
@@ -196,15 +613,11 @@ class ETLPipeline:
         if source_name == 'access':
             return self.process_access_database()
         
-        # Map source names to configurations
-        source_configs = {
-            'container': ('data/Container v3.txt', 'raw_container', 'batch'),
-            'consignor': ('data/Consignor.csv', 'raw_consignor', 'batch'),
-            'eu_mrv': ('data/2016-EU MRV Publication of information v5.csv', 'raw_eu_mrv', 'eu_mrv')
-        }
-        
-        if source_name not in source_configs:
+        data_sources = self._apply_load_mode(self._data_sources())
+        if source_name not in data_sources:
             return {'status': 'failed', 'error': f'Unknown source: {source_name}'}
         
-        source_path, table_name, loader_type = source_configs[source_name]
-        return self.process_data_source(source_name, source_path, table_name, loader_type)
+        self._register_business_keys(data_sources)
+        config = data_sources[source_name]
+        return self.process_data_source(source_name, config['source_path'], config['table_name'], config['loader'],
+                                        config.get('chunksize'))
@@ -0,0 +1,12 @@
+"""
+Staging layer: RAW to Kramse_STAGING promotion
+"""
+from .manager import StagingManager, StagingTable, DEFAULT_STAGING_TABLES, rollback_swap, swap_tables
+
+__all__ = [
+    'StagingManager',
+    'StagingTable',
+    'DEFAULT_STAGING_TABLES',
+    'rollback_swap',
+    'swap_tables'
+]
@@ -0,0 +1,263 @@
+"""
+Staging manager that promotes RAW tables into typed, deduplicated staging tables
+"""
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.dialects import sqlite
+
+from ..database import db_manager
+from ..logging import MetricsCollector, measure
+
+logger = logging.getLogger(__name__)
+
+# Schema name under which the RAW database is attached on SQLite stand-ins
+SQLITE_SOURCE_SCHEMA = 'raw'
+
+# Text key columns need a bounded type to be part of a primary key on SQL Server
+KEY_STRING_LENGTH = 255
+
+# Suffixes of the shadow, previous and in-between tables of table swaps
+SWAP_TABLE_SUFFIXES = ('__new', '__old', '__rollback')
+
+
+@dataclass
+class StagingTable:
+    """How one RAW table is promoted to staging
+
+    Rows are deduplicated on the business keys, keeping the latest row by
+    ``order_by``; tables without keys keep distinct rows. ``column_types``
+    overrides the types reflected from the RAW table.
+    """
+    source_table: str
+    business_keys: List[str] = field(default_factory=list)
+    order_by: Optional[str] = 'loaded_at'
+    column_types: Dict[str, Any] = field(default_factory=dict)
+    target_table: Optional[str] = None
+
+    def __post_init__(self):
+        if self.target_table is None:
+            name = self.source_table[len('raw_'):] if self.source_table.startswith('raw_') else self.source_table
+            self.target_table = f"stg_{name}"
+
+
+DEFAULT_STAGING_TABLES = [
+    StagingTable('raw_container', ['Id']),
+    StagingTable('raw_consignor', ['Id']),
+    StagingTable('raw_eu_mrv', ['IMO_Number', 'Reporting_Period'], order_by='processed_date'),
+]
+
+
+def rename_table(conn, old_name: str, new_name: str):
+    """Rename a table in the connection's default schema"""
+    preparer = conn.dialect.identifier_preparer
+    if conn.dialect.name == 'mssql':
+        conn.execute(text("EXEC sp_rename :old_name, :new_name"), {'old_name': old_name, 'new_name': new_name})
+    else:
+        conn.execute(text(f"ALTER TABLE {preparer.quote(old_name)} RENAME TO {preparer.quote(new_name)}"))
+
+
+def swap_tables(conn, table_name: str, new_table_name: str, keep_old: bool = False):
+    """Replace table_name by the fully loaded new_table_name within the caller's transaction
+
+    With ``keep_old`` the replaced table stays available as ``<table_name>__old``
+    for ``rollback_swap`` until the next swap.
+    """
+    preparer = conn.dialect.identifier_preparer
+    old_table_name = f"{table_name}__old"
+    inspector = sa.inspect(conn)
+    if inspector.has_table(old_table_name):
+        conn.execute(text(f"DROP TABLE {preparer.quote(old_table_name)}"))
+    replaces = inspector.has_table(table_name)
+    if replaces:
+        rename_table(conn, table_name, old_table_name)
+    rename_table(conn, new_table_name, table_name)
+    if replaces and not keep_old:
+        conn.execute(text(f"DROP TABLE {preparer.quote(old_table_name)}"))
+
+
+def rollback_swap(conn, table_name: str):
+    """Swap table_name back with the <table_name>__old copy kept by the last swap"""
+    old_table_name = f"{table_name}__old"
+    if not sa.inspect(conn).has_table(old_table_name):
+        raise ValueError(f"No previous version of {table_name} to roll back to")
+    # The rolled back version becomes __old, so a second rollback restores it
+    rename_table(conn, table_name, f"{table_name}__rollback")
+    rename_table(conn, old_table_name, table_name)
+    rename_table(conn, f"{table_name}__rollback", old_table_name)
+
+
+class StagingManager:
+    """Move data from Kramse_RAW into Kramse_STAGING with set-based SQL on the server
+
+    Both databases must live on the same server (SQL Server three-part names)
+    or, for SQLite stand-ins, be files the staging connection can attach.
+    """
+
+    def __init__(self, tables: List[StagingTable] = None, source_database: str = None,
+                 target_database: str = None, metrics: MetricsCollector = None):
+        self.tables = {table.source_table: table for table in (tables or DEFAULT_STAGING_TABLES)}
+        self.source_database = source_database or os.getenv('DB_RAW', 'Kramse_RAW')
+        self.target_database = target_database or os.getenv('DB_STAGING', 'Kramse_STAGING')
+        self.metrics = metrics
+        self.logger = logger
+
+    @property
+    def source_engine(self) -> sa.Engine:
+        return db_manager.get_engine(self.source_database)
+
+    @property
+    def target_engine(self) -> sa.Engine:
+        return db_manager.get_engine(self.target_database)
+
+    def discover(self) -> List[StagingTable]:
+        """All configured tables plus keyless definitions for other raw_* tables in RAW"""
+        for name in sa.inspect(self.source_engine).get_table_names():
+            if name.startswith('raw_') and not name.endswith(SWAP_TABLE_SUFFIXES) and name not in self.tables:
+                self.tables[name] = StagingTable(name)
+        return list(self.tables.values())
+
+    def promote_all(self, mode: str = None) -> Dict[str, Any]:
+        """Promote every RAW table that exists; mode is 'swap' (default) or 'merge'"""
+        mode = (mode or os.getenv('STAGING_MODE', 'swap')).lower()
+        results = {}
+        for table in self.discover():
+            try:
+                results[table.target_table] = self.promote(table, mode)
+            except Exception as e:
+                self.logger.error(f"Failed to promote {table.source_table} to staging: {e}")
+                results[table.target_table] = {'status': 'failed', 'error': str(e)}
+
+        failed = [name for name, result in results.items() if result['status'] != 'success']
+        return {'status': 'failed' if failed else 'success', 'tables': results}
+
+    def promote(self, table: StagingTable, mode: str = 'swap') -> Dict[str, Any]:
+        """Promote one RAW table; 'swap' rebuilds the staging table, 'merge' upserts on its keys"""
+        if mode not in ('swap', 'merge'):
+            raise ValueError(f"Unknown staging mode: {mode}")
+        if mode == 'merge' and not table.business_keys:
+            self.logger.warning(f"{table.source_table} has no business keys; rebuilding instead of merging")
+            mode = 'swap'
+
+        columns = sa.inspect(self.source_engine).get_columns(table.source_table)
+        with measure('staging', self.target_database, table.target_table) as span:
+            if mode == 'swap':
+                rows = self._swap_load(table, columns)
+            else:
+                rows = self._merge_load(table, columns)
+            span.rows = rows
+        if self.metrics is not None:
+            self.metrics.add([span])
+
+        self.logger.info(f"Promoted {table.source_table} to {table.target_table} ({mode}): {rows} rows")
+        return {'status': 'success', 'loaded': rows, 'mode': mode, 'table_name': table.target_table}
+
+    def _swap_load(self, table: StagingTable, columns: List[Dict[str, Any]]) -> int:
+        """Fill a new table next to the staging table, then swap them in one transaction"""
+        new_name = f"{table.target_table}__new"
+        with self.target_engine.connect() as conn:
+            source = self._source_table(conn, table, columns)
+            target = self._target_table(new_name, table, columns)
+            with conn.begin():
+                target.drop(conn, checkfirst=True)
+                target.create(conn)
+                conn.execute(target.insert().from_select(
+                    [col['name'] for col in columns], self._deduplicated(conn, table, source, columns)
+                ))
+                rows = conn.execute(sa.select(sa.func.count()).select_from(target)).scalar()
+
+            # Readers see the old table until the renames commit
+            with conn.begin():
+                swap_tables(conn, table.target_table, new_name)
+        return rows
+
+    def _merge_load(self, table: StagingTable, columns: List[Dict[str, Any]]) -> int:
+        """Upsert the deduplicated RAW rows into the staging table on its business keys"""
+        names = [col['name'] for col in columns]
+        with self.target_engine.connect() as conn:
+            source = self._source_table(conn, table, columns)
+            target = self._target_table(table.target_table, table, columns)
+            with conn.begin():
+                target.create(conn, checkfirst=True)
+                selection = self._deduplicated(conn, table, source, columns)
+                updates = [name for name in names if name not in table.business_keys]
+
+                if conn.dialect.name == 'sqlite':
+                    statement = sqlite.insert(target).from_select(names, selection)
+                    statement = statement.on_conflict_do_update(
+                        index_elements=table.business_keys,
+                        set_={name: statement.excluded[name] for name in updates}
+                    )
+                    conn.execute(statement)
+                else:
+                    conn.execute(text(self._merge_statement(conn, target, selection, table.business_keys, names, updates)))
+            return conn.execute(sa.select(sa.func.count()).select_from(target)).scalar()
+
+    def _merge_statement(self, conn, target: sa.Table, selection, keys: List[str], names: List[str],
+                         updates: List[str]) -> str:
+        """T-SQL MERGE of a compiled SELECT into target"""
+        quote = conn.dialect.identifier_preparer.quote
+        source_sql = selection.compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True})
+        matched = ''
+        if updates:
+            matched = "WHEN MATCHED THEN UPDATE SET " + ", ".join(f"t.{quote(n)} = s.{quote(n)}" for n in updates)
+        return (
+            f"MERGE {quote(target.name)} WITH (HOLDLOCK) AS t "
+            f"USING ({source_sql}) AS s "
+            f"ON {' AND '.join(f't.{quote(k)} = s.{quote(k)}' for k in keys)} "
+            f"{matched} "
+            f"WHEN NOT MATCHED BY TARGET THEN INSERT ({', '.join(quote(n) for n in names)}) "
+            f"VALUES ({', '.join(f's.{quote(n)}' for n in names)});"
+        )
+
+    def _source_table(self, conn, table: StagingTable, columns: List[Dict[str, Any]]) -> sa.Table:
+        """The RAW table as seen from a staging connection"""
+        if conn.dialect.name == 'sqlite':
+            attached = {row[1] for row in conn.exec_driver_sql("PRAGMA database_list")}
+            if SQLITE_SOURCE_SCHEMA not in attached:
+                conn.exec_driver_sql(f"ATTACH DATABASE ? AS {SQLITE_SOURCE_SCHEMA}",
+                                     (self.source_engine.url.database,))
+            # ATTACH cannot run inside a transaction; end the one the PRAGMA began
+            conn.commit()
+            schema = SQLITE_SOURCE_SCHEMA
+        else:
+            schema = f"{self.source_database}.dbo"
+        return sa.Table(table.source_table, sa.MetaData(),
+                        *(sa.Column(col['name'], col['type']) for col in columns), schema=schema)
+
+    def _target_table(self, name: str, table: StagingTable, columns: List[Dict[str, Any]]) -> sa.Table:
+        """Typed staging table with the business keys as primary key"""
+        target_columns = []
+        for col in columns:
+            col_type = table.column_types.get(col['name'], col['type'])
+            is_key = col['name'] in table.business_keys
+            if is_key and isinstance(col_type, sa.String) and not col_type.length:
+                col_type = sa.Unicode(KEY_STRING_LENGTH)
+            target_columns.append(sa.Column(col['name'], col_type, primary_key=is_key, autoincrement=False))
+        return sa.Table(name, sa.MetaData(), *target_columns)
+
+    def _deduplicated(self, conn, table: StagingTable, source: sa.Table, columns: List[Dict[str, Any]]):
+        """SELECT of the typed RAW rows, one per business key"""
+        typed = []
+        for col in columns:
+            value = source.c[col['name']]
+            if col['name'] in table.column_types:
+                cast = sa.cast if conn.dialect.name == 'sqlite' else sa.try_cast
+                value = cast(value, table.column_types[col['name']])
+            typed.append(value.label(col['name']))
+
+        if not table.business_keys:
+            return sa.select(*typed).distinct()
+
+        keys = [source.c[key] for key in table.business_keys]
+        if table.order_by in source.c:
+            order_by = [source.c[table.order_by].desc()]
+        else:
+            order_by = keys
+        ranked = sa.select(
+            *typed, sa.func.row_number().over(partition_by=keys, order_by=order_by).label('_row_number')
+        ).where(*(key.isnot(None) for key in keys)).subquery()
+        return sa.select(*(ranked.c[col['name']] for col in columns)).where(ranked.c._row_number == 1)
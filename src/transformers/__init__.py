@@ -2,12 +2,20 @@
 Data transformers package
 """
 from .base import BaseTransformer
+from .cleaning import clean_string_columns
+from .columns import ColumnMapper, normalize_column_name
+from .pipeline import TransformPipeline, TransformStep
 from .container import ContainerTransformer
 from .consignor import ConsignorTransformer
 from .eu_mrv import EUMRVTransformer
 
 __all__ = [
     'BaseTransformer',
+    'clean_string_columns',
+    'ColumnMapper',
+    'normalize_column_name',
+    'TransformPipeline',
+    'TransformStep',
     'ContainerTransformer',
     'ConsignorTransformer',
     'EUMRVTransformer'
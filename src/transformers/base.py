@@ -1,68 +1,61 @@
 """
 Base transformer for data cleaning and transformation
 """
-import re
 import pandas as pd
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
+from .cleaning import clean_string_columns
+from .columns import ColumnMapper, normalize_column_name
+from .pipeline import TransformPipeline, TransformStep, assign_metadata
 
 logger = logging.getLogger(__name__)
 
 class BaseTransformer(ABC):
     """Abstract base class for all data transformers"""
     
+    # Name of the persisted column mapping; None keeps source column names
+    source_name = None
+    
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
         self.logger = logger
+        self.column_mapper = ColumnMapper(self.source_name) if self.source_name else None
+        self.step_stats: List[Dict[str, Any]] = []
     
     @abstractmethod
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Transform the DataFrame"""
         raise NotImplementedError
     
+    def reset(self):
+        """Forget state carried from one chunk of a stream to the next"""
+    
     def clean_column_name(self, col_name: str) -> str:
         """Clean column names for SQL Server compatibility"""
-        # Convert to string and replace problematic characters
-        clean_name = str(col_name)
-        
-        # Replace spaces and special characters with underscores
-        clean_name = re.sub(r'[^\w]', '_', clean_name)
-        
-        # Remove multiple underscores
-        clean_name = re.sub(r'_+', '_', clean_name)
-        
-        # Remove leading/trailing underscores
-        clean_name = clean_name.strip('_')
-        
-        # Ensure it doesn't start with a number
-        if clean_name and clean_name[0].isdigit():
-            clean_name = 'col_' + clean_name
-        
-        # Limit length to 100 characters (SQL Server friendly)
-        clean_name = clean_name[:100]
-        
-        return clean_name if clean_name else 'unnamed_column'
+        return normalize_column_name(str(col_name))
+    
+    def map_columns_step(self) -> TransformStep:
+        """Step that renames columns through this source's persisted column mapping"""
+        return TransformStep('map_columns', self.column_mapper.rename)
     
     def add_metadata_columns(self, df: pd.DataFrame, source_info: Dict[str, Any]) -> pd.DataFrame:
         """Add standard metadata columns"""
-        df_with_metadata = df.copy()
-        
         # Standard metadata
-        df_with_metadata['loaded_at'] = datetime.now()
-        df_with_metadata['source_file'] = source_info.get('source_file', 'unknown')
-        
-        return df_with_metadata
+        return assign_metadata(df.copy(), {
+            'loaded_at': datetime.now(),
+            'source_file': source_info.get('source_file', 'unknown')
+        })
     
     def basic_data_cleaning(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply basic data cleaning rules"""
-        clean_df = df.copy()
-        
-        # Clean object columns
-        for col in clean_df.columns:
-            if clean_df[col].dtype == 'object':
-                clean_df[col] = clean_df[col].astype(str).str.strip()
-                clean_df[col] = clean_df[col].replace('nan', None)
-        
-        return clean_df
+        # Trim text columns; missing values stay null
+        return clean_string_columns(df)
+    
+    def run_steps(self, df: pd.DataFrame, steps: List[TransformStep], copy: bool = True) -> pd.DataFrame:
+        """Run steps on a single copy of df and keep per-step time and memory stats"""
+        pipeline = TransformPipeline(steps, profile=self.config.get('profile_steps', False))
+        result = pipeline.run(df, copy=copy)
+        self.step_stats = pipeline.step_stats
+        return result
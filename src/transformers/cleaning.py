@@ -0,0 +1,53 @@
+"""
+Vectorized string cleaning shared by transformers and extractors
+"""
+import logging
+from functools import lru_cache
+import pandas as pd
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def string_storage() -> str:
+    """Preferred StringDtype storage: Arrow when pyarrow is installed
+
+    pyarrow is a requirement; the 'python' fallback for an install without
+    it is a degraded path that keeps one Python object per cell.
+    """
+    try:
+        import pyarrow  # noqa: F401
+        return 'pyarrow'
+    except ImportError:
+        logger.warning("pyarrow is not installed; string cleaning falls back to Python objects per cell "
+                       "(pip install -r requirements.txt)")
+        return 'python'
+
+
+def string_columns(df: pd.DataFrame) -> List[str]:
+    """Columns holding text, as object or any pandas string dtype"""
+    return [
+        col for col, dtype in df.dtypes.items()
+        if pd.api.types.is_object_dtype(dtype) or isinstance(dtype, pd.StringDtype)
+    ]
+
+
+def clean_string_columns(df: pd.DataFrame, storage: Optional[str] = None, copy: bool = True) -> pd.DataFrame:
+    """Trim whitespace in all text columns and keep missing values as real nulls
+
+    Text columns are cast to a nullable ``string`` dtype in one batch, so
+    ``None``/``NaN`` become ``<NA>`` instead of the literals 'None'/'nan', and
+    trimming runs on the Arrow buffers (``utf8_trim_whitespace``) when pyarrow
+    is available; without it the cast creates a Python str per cell.
+    """
+    clean_df = df.copy() if copy else df
+    columns = string_columns(clean_df)
+    if not columns:
+        return clean_df
+
+    dtype = pd.StringDtype(storage or string_storage())
+    strings = clean_df[columns].astype(dtype)
+    for col in columns:
+        clean_df[col] = strings[col].str.strip()
+    return clean_df
@@ -0,0 +1,128 @@
+"""
+Column name normalization with memoization and persisted per-source mappings
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import pandas as pd
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Runs of non-word characters and underscores collapse to one underscore
+_SEPARATORS = re.compile(r'[\W_]+')
+
+MAX_COLUMN_NAME_LENGTH = 100
+
+
+@lru_cache(maxsize=4096)
+def normalize_column_name(col_name: str) -> str:
+    """Clean a column name for SQL Server compatibility"""
+    clean_name = _SEPARATORS.sub('_', col_name).strip('_')
+
+    # Ensure it doesn't start with a number
+    if clean_name and clean_name[0].isdigit():
+        clean_name = 'col_' + clean_name
+
+    # Limit length to 100 characters (SQL Server friendly)
+    clean_name = clean_name[:MAX_COLUMN_NAME_LENGTH]
+
+    return clean_name if clean_name else 'unnamed_column'
+
+
+def resolve_collisions(mapping: Dict[str, str], columns: Iterable[str]) -> Dict[str, str]:
+    """Give headers that normalize to the same name a numeric suffix, in column order"""
+    resolved, used = {}, set()
+    for col in columns:
+        name = mapping[col]
+        if name in used:
+            suffix = 2
+            while f"{name}_{suffix}" in used:
+                suffix += 1
+            logger.warning(f"Column name collision: {col!r} normalizes to {name!r}, using '{name}_{suffix}'")
+            name = f"{name}_{suffix}"
+        used.add(name)
+        resolved[col] = name
+    return resolved
+
+
+class ColumnMapper:
+    """Source header -> target column mapping for one source, persisted as JSON
+
+    The mapping file is read on first use; headers it already contains are not
+    normalized again, so entries can also be edited by hand to rename columns.
+    """
+
+    def __init__(self, source: str, mapping_dir: str = None):
+        self.source = source
+        self.mapping_dir = Path(mapping_dir or os.getenv('COLUMN_MAPPING_DIR', 'config/column_mappings'))
+        self.mapping_file = self.mapping_dir / f"{source}.json"
+        self._mapping: Dict[str, str] = None
+        self._lock = threading.Lock()
+        self.logger = logger
+
+    def __getstate__(self):
+        # Locks cannot be pickled; mappers travel with transformers to worker processes
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, str]:
+        if self.mapping_file.exists():
+            with open(self.mapping_file, encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _save(self):
+        self.mapping_dir.mkdir(parents=True, exist_ok=True)
+        # Keep headers another process added since this mapper read the file
+        self._mapping = {**self._load(), **self._mapping}
+        # Worker processes save concurrently, so each writes its own temporary file
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.mapping_dir, prefix=f"{self.source}.",
+                                         suffix='.json.tmp', delete=False) as f:
+            tmp_file = f.name
+            json.dump(self._mapping, f, ensure_ascii=False, indent=2)
+        try:
+            # Temporary files are private (0600); keep the permissions of a normal file
+            os.chmod(tmp_file, os.stat(self.mapping_file).st_mode if self.mapping_file.exists() else 0o644)
+            os.replace(tmp_file, self.mapping_file)
+        except OSError:
+            os.remove(tmp_file)
+            raise
+
+    def map_columns(self, columns: Iterable[str]) -> Dict[str, str]:
+        """Get the target name for each column, normalizing and persisting unknown headers"""
+        columns = [str(col) for col in columns]
+        with self._lock:
+            if self._mapping is None:
+                self._mapping = self._load()
+
+            unknown = [col for col in columns if col not in self._mapping]
+            if unknown:
+                mapping = {**self._mapping, **{col: normalize_column_name(col) for col in unknown}}
+                resolved = resolve_collisions(mapping, columns)
+                self._mapping.update({col: resolved[col] for col in unknown})
+                self._save()
+                self.logger.info(f"Added {len(unknown)} columns to mapping file {self.mapping_file}")
+
+            mapping = {col: self._mapping[col] for col in columns}
+
+        if len(set(mapping.values())) != len(mapping):
+            # A hand-edited or shared mapping can still map two headers of this frame to one name
+            mapping = resolve_collisions(mapping, columns)
+        return mapping
+
+    def rename(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rename the columns of df in place"""
+        mapping = self.map_columns(df.columns)
+        df.columns = [mapping[str(col)] for col in df.columns]
+        return df
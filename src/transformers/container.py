@@ -3,24 +3,24 @@ Container data transformer
 """
 import pandas as pd
 from .base import BaseTransformer
+from .pipeline import clean_strings_step, metadata_step
 
 class ContainerTransformer(BaseTransformer):
     """Transformer for container data"""
     
+    source_name = 'container'
+    
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Transform container data"""
         try:
             self.logger.info(f"Transforming {len(df)} container records")
             
-            # Make a copy
-            clean_df = df.copy()
-            
-            # Add metadata
-            source_info = {'source_file': 'Container v3.txt'}
-            clean_df = self.add_metadata_columns(clean_df, source_info)
-            
-            # Apply basic cleaning
-            clean_df = self.basic_data_cleaning(clean_df)
+            # Column mapping, basic cleaning and metadata on a single copy
+            clean_df = self.run_steps(df, [
+                self.map_columns_step(),
+                clean_strings_step(),
+                metadata_step({'source_file': 'Container v3.txt'})
+            ])
             
             # Container-specific transformations here
             # TODO: Add business rules for container data
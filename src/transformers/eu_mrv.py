@@ -2,12 +2,55 @@
 EU MRV data transformer
 """
 import pandas as pd
-from typing import Dict, List
+import sqlalchemy as sa
+from typing import Dict, List, Optional
 from .base import BaseTransformer
+from .pipeline import TransformStep, metadata_step, numeric_types_step
+from .schema import float_dtype, infer_numeric_schema, mask_sentinels, promote_numeric_schema
+from ..extractors.eu_mrv import REPORTING_YEAR_COLUMN
+
+TECHNICAL_EFFICIENCY_COLUMN = 'Technical efficiency'
+
+# e.g. "EIV (7.82 gCO?/t·nm)", "7.82 gCO?/t·nm", "EEDI (1.2E+01 gCO?/t·nm)", "EEDI"
+TECHNICAL_EFFICIENCY_PATTERN = (
+    r'^\s*(?P<type>[A-Z]{2,}\b)?[^0-9(]*\(?\s*(?P<value>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)?'
+)
+
+
+def split_technical_efficiency(df: pd.DataFrame, column: str = TECHNICAL_EFFICIENCY_COLUMN) -> pd.DataFrame:
+    """Add '<column> value' (gCO2/t·nm) and '<column> type' (EIV, EEDI) columns in place"""
+    if column not in df.columns:
+        return df
+    parts = mask_sentinels(df[column]).str.extract(TECHNICAL_EFFICIENCY_PATTERN)
+    values = pd.to_numeric(parts['value'], errors='coerce')
+    df[f"{column} value"] = values.astype(float_dtype(values.to_numpy(dtype='float64', na_value=float('nan'))))
+    df[f"{column} type"] = parts['type'].astype('category')
+    return df
+
 
 class EUMRVTransformer(BaseTransformer):
     """Transformer for EU MRV shipping data"""
     
+    source_name = 'eu_mrv'
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Inferred from the first chunk of a stream and widened by later chunks that do not fit
+        self.schema: Optional[Dict[str, str]] = None
+        self.schema_year: Optional[int] = None
+    
+    def reset(self):
+        """Infer the numeric schema again from the next frame"""
+        self.schema = None
+        self.schema_year = None
+    
+    @staticmethod
+    def _reporting_year(df: pd.DataFrame) -> Optional[int]:
+        if REPORTING_YEAR_COLUMN not in df.columns or df.empty:
+            return None
+        year = df[REPORTING_YEAR_COLUMN].iloc[0]
+        return None if pd.isna(year) else int(year)
+    
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Transform EU MRV data with all columns"""
         try:
@@ -16,22 +59,35 @@ class EUMRVTransformer(BaseTransformer):
             # Keep all columns
             self.logger.info(f"Processing all {len(df.columns)} columns from EU MRV data")
             
-            # Clean column names for SQL Server compatibility
+            # Each publication year starts a new schema; within a year chunks only widen it
+            year = self._reporting_year(df)
+            if self.schema is None or year != self.schema_year or not set(self.schema) <= set(df.columns):
+                self.schema = infer_numeric_schema(df)
+                self.schema_year = year
+                self.logger.info(f"Inferred numeric types for {len(self.schema)} EU MRV columns")
+            else:
+                promote_numeric_schema(df, self.schema)
+            
             original_columns = df.columns.tolist()
-            df.columns = [self.clean_column_name(col) for col in df.columns]
+            df = self.run_steps(df, [
+                # Sentinels such as 'N/A' become nulls, numeric text becomes float32/float64
+                numeric_types_step(self.schema),
+                TransformStep('split_technical_efficiency', split_technical_efficiency),
+                # Clean column names for SQL Server compatibility
+                self.map_columns_step(),
+                # Add EU MRV specific metadata
+                metadata_step({
+                    'source_file': 'eu_mrv_shipping',
+                    'total_columns_in_source': len(original_columns)
+                }, timestamp_column='processed_date')
+            ])
+            type_column = f"{TECHNICAL_EFFICIENCY_COLUMN} type"
+            df.attrs['sql_types'] = {self.column_mapper.map_columns([type_column])[type_column]: sa.Unicode(16)}
             
             # Log column mapping (sample)
             sample_mapping = dict(list(zip(original_columns[:10], df.columns[:10])))
             self.logger.info(f"Sample column mapping: {sample_mapping}...")
             
-            # Basic data cleaning
-            df = df.fillna('')  # Replace NaN with empty strings
-            
-            # Add EU MRV specific metadata
-            df['processed_date'] = pd.Timestamp.now()
-            df['source_file'] = 'eu_mrv_shipping'
-            df['total_columns_in_source'] = len(original_columns)
-            
             self.logger.info(f"EU MRV data transformed: {len(df)} records, {len(df.columns)} columns")
             return df
             
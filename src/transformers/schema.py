@@ -0,0 +1,155 @@
+"""
+Schema inference and typed parsing of numeric text columns
+"""
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Placeholder strings that mean "no value" in source files
+NULL_SENTINELS = frozenset({
+    '', 'N/A', 'n/a', 'NA', 'Not Applicable', 'Missing source values!', 'Division by zero!'
+})
+
+MAX_DECIMALS = 6
+
+INTEGER_DTYPES = ('Int32', 'Int64')
+
+
+def mask_sentinels(series: pd.Series, sentinels: Iterable[str] = NULL_SENTINELS) -> pd.Series:
+    """Replace sentinel strings with nulls"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series
+    stripped = series.astype('string').str.strip()
+    return stripped.mask(stripped.isin(list(sentinels)))
+
+
+def to_number(series: pd.Series) -> pd.Series:
+    """Floats from numbers or text that may use a decimal comma; anything else becomes null"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.astype('float64')
+    text = series.astype('string').str.strip().str.replace(',', '.', regex=False)
+    return pd.to_numeric(text, errors='coerce').astype('float64')
+
+
+def to_boolean(series: pd.Series) -> pd.Series:
+    """Nullable booleans from booleans, 0/1 numbers or Yes/No text; anything else becomes null"""
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series.astype('boolean')
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.ne(0).astype('boolean').mask(series.isna())
+    text = series.astype('string').str.strip().str.lower()
+    return text.map({'yes': True, 'true': True, 'no': False, 'false': False}).astype('boolean')
+
+
+def float_dtype(values: np.ndarray) -> str:
+    """float32 when every value survives a float32 round trip at its printed precision"""
+    finite = values[np.isfinite(values)]
+    as_float32 = finite.astype(np.float32).astype(np.float64)
+    for decimals in range(MAX_DECIMALS + 1):
+        if np.array_equal(np.round(finite, decimals), finite):
+            return 'float32' if np.array_equal(np.round(as_float32, decimals), finite) else 'float64'
+    return 'float64'
+
+
+def integer_dtype(numbers: pd.Series) -> Optional[str]:
+    """Int32 or Int64 for whole numbers by their range, None when some have decimals"""
+    present = numbers.dropna()
+    if not pd.api.types.is_integer_dtype(present.dtype):
+        values = present.to_numpy(dtype=np.float64)
+        if not np.array_equal(values, np.floor(values)):
+            return None
+    info = np.iinfo(np.int32)
+    fits = present.empty or (present.min() >= info.min and present.max() <= info.max)
+    return 'Int32' if fits else 'Int64'
+
+
+def column_numbers(series: pd.Series, sentinels: Iterable[str] = NULL_SENTINELS) -> Optional[pd.Series]:
+    """The numbers of a column without its sentinels, None when it holds real text"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series
+    values = mask_sentinels(series, sentinels)
+    numbers = pd.to_numeric(values, errors='coerce')
+    if numbers.notna().sum() != values.notna().sum():
+        return None
+    return numbers
+
+
+def infer_numeric_schema(df: pd.DataFrame, sentinels: Iterable[str] = NULL_SENTINELS) -> Dict[str, str]:
+    """Map each column whose non-sentinel values are all numeric to a narrow pandas dtype
+
+    Integer columns (as read) become Int32/Int64; all other numeric columns
+    become float32 or float64, so later chunks with decimals still fit.
+    """
+    sentinels = list(sentinels)
+    schema = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series.dtype):
+            continue
+        if pd.api.types.is_integer_dtype(series.dtype):
+            schema[col] = integer_dtype(series)
+            continue
+
+        numbers = column_numbers(series, sentinels)
+        if numbers is None:
+            continue  # contains real text
+        schema[col] = float_dtype(numbers.to_numpy(dtype=np.float64, na_value=np.nan))
+    return schema
+
+
+def _promoted_dtype(dtype: str, numbers: pd.Series) -> str:
+    """The dtype of a schema column widened just enough to hold numbers"""
+    if dtype in INTEGER_DTYPES:
+        needed = integer_dtype(numbers)
+        if needed is None:
+            return 'float64'
+        return 'Int64' if 'Int64' in (dtype, needed) else 'Int32'
+    if dtype == 'float32' and float_dtype(numbers.to_numpy(dtype=np.float64, na_value=np.nan)) == 'float64':
+        return 'float64'
+    return dtype
+
+
+def promote_numeric_schema(df: pd.DataFrame, schema: Dict[str, str],
+                           sentinels: Iterable[str] = NULL_SENTINELS) -> Dict[str, str]:
+    """Widen a schema inferred from earlier chunks so a further chunk fits without loss
+
+    Int32 becomes Int64 or float64, float32 becomes float64, and a column with
+    text is dropped from the schema so it stays text. The schema is updated in
+    place; the promoted columns and their new dtypes (None for text) are returned.
+    """
+    sentinels = list(sentinels)
+    promoted = {}
+    for col, dtype in list(schema.items()):
+        if col not in df.columns or pd.api.types.is_bool_dtype(df[col].dtype):
+            continue
+        numbers = column_numbers(df[col], sentinels)
+        if numbers is None:
+            del schema[col]
+            promoted[col] = None
+            continue
+        needed = _promoted_dtype(dtype, numbers)
+        if needed != dtype:
+            schema[col] = promoted[col] = needed
+    if promoted:
+        types = {col: dtype or 'text' for col, dtype in promoted.items()}
+        logger.warning(f"Promoted numeric columns for a further chunk: {types}")
+    return promoted
+
+
+def apply_numeric_schema(df: pd.DataFrame, schema: Dict[str, str],
+                         sentinels: Iterable[str] = NULL_SENTINELS) -> pd.DataFrame:
+    """Parse the schema's columns of df in place into their numeric dtypes"""
+    sentinels = list(sentinels)
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        values = mask_sentinels(df[col], sentinels)
+        numbers = pd.to_numeric(values, errors='coerce')
+        unparsed = int(numbers.isna().sum() - values.isna().sum())
+        if unparsed:
+            logger.warning(f"Column {col}: {unparsed} non-numeric values set to null")
+        df[col] = numbers.astype(dtype)
+    return df